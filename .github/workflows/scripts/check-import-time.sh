@@ -0,0 +1,53 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# check-import-time.sh
+# Measure how long `import specify_cli` takes (python -X importtime) and fail
+# when it exceeds a budget or pulls in modules that should be loaded lazily.
+# Usage: check-import-time.sh [budget-ms] [runs]
+#   IMPORT_TIME_BUDGET_MS / IMPORT_TIME_RUNS can be used instead of arguments.
+
+BUDGET_MS="${1:-${IMPORT_TIME_BUDGET_MS:-150}}"
+RUNS="${2:-${IMPORT_TIME_RUNS:-5}}"
+PYTHON="${PYTHON:-python3}"
+
+# Modules only needed once a command actually runs
+DEFERRED=(specify_cli.http_client httpx httpcore truststore readchar yaml rich.live rich.progress rich.tree concurrent.futures)
+
+best_us=""
+for _ in $(seq "$RUNS"); do
+  # Cumulative time (µs) is the second column of the top-level specify_cli line
+  us=$("$PYTHON" -X importtime -c "import specify_cli" 2>&1 >/dev/null \
+    | awk -F'|' '$3 ~ /^ specify_cli$/ { gsub(/ /, "", $2); print $2 }')
+  if [[ -z "$us" ]]; then
+    echo "Could not measure import time of specify_cli" >&2
+    exit 1
+  fi
+  if [[ -z "$best_us" || "$us" -lt "$best_us" ]]; then
+    best_us="$us"
+  fi
+done
+
+best_ms=$(( best_us / 1000 ))
+echo "import specify_cli: ${best_ms} ms (best of ${RUNS}, budget ${BUDGET_MS} ms)"
+
+loaded=$("$PYTHON" -c "
+import sys
+import specify_cli
+print(' '.join(m for m in sys.argv[1:] if m in sys.modules))
+" "${DEFERRED[@]}")
+
+status=0
+if [[ -n "$loaded" ]]; then
+  echo "Imported eagerly (should be lazy): $loaded" >&2
+  status=1
+fi
+if (( best_ms > BUDGET_MS )); then
+  echo "Import time ${best_ms} ms exceeds budget of ${BUDGET_MS} ms" >&2
+  status=1
+fi
+
+if [[ -n "${GITHUB_STEP_SUMMARY:-}" ]]; then
+  echo "import specify_cli: **${best_ms} ms** (budget ${BUDGET_MS} ms)" >> "$GITHUB_STEP_SUMMARY"
+fi
+exit $status
@@ -1,8 +1,16 @@
 #!/bin/bash
 
 # Create release packages for all AI agents and script types
-# Usage: ./create-release-packages.sh <version>
+# Usage: ./create-release-packages.sh [-j N] <version>
 # Example: ./create-release-packages.sh v1.0.1
+#          ./create-release-packages.sh -j 8 v1.0.1
+#
+# -j N (or JOBS=N) builds up to N packages at once (default: number of CPUs).
+# Every variant is staged in its own directory and zipped by
+# src/specify_cli/packaging.py: sorted entries, every timestamp set to
+# SOURCE_DATE_EPOCH (default: last commit time), normalized permissions and an
+# embedded .specify/manifest.json. Identical inputs give byte-identical archives
+# whatever the job count.
 
 set -e
 
@@ -13,11 +21,32 @@ YELLOW='\033[1;33m'
 CYAN='\033[0;36m'
 NC='\033[0m' # No Color
 
+JOBS="${JOBS:-}"
+while getopts ":j:" opt; do
+    case $opt in
+        j) JOBS="$OPTARG" ;;
+        *) echo "Usage: $0 [-j N] <version>" >&2; exit 1 ;;
+    esac
+done
+shift $((OPTIND - 1))
+
 VERSION="${1:-v1.0.1}"
 
+if [ -z "$JOBS" ]; then
+    JOBS=$(nproc 2>/dev/null || sysctl -n hw.ncpu 2>/dev/null || echo 1)
+fi
+if ! [[ "$JOBS" =~ ^[1-9][0-9]*$ ]]; then
+    echo "Invalid job count: $JOBS" >&2
+    exit 1
+fi
+
+# Timestamp written for every archive entry
+SOURCE_DATE_EPOCH="${SOURCE_DATE_EPOCH:-$(git log -1 --format=%ct 2>/dev/null || echo 315532800)}"
+
 echo -e "${CYAN}======================================${NC}"
 echo -e "${CYAN}  Creating Spec-Kit Release Packages${NC}"
 echo -e "${CYAN}  Version: $VERSION${NC}"
+echo -e "${CYAN}  Jobs: $JOBS${NC}"
 echo -e "${CYAN}======================================${NC}"
 echo ""
 
@@ -45,73 +74,11 @@ SCRIPT_TYPES=(sh ps)
 OUTPUT_DIR=".genreleases"
 rm -rf "$OUTPUT_DIR"
 mkdir -p "$OUTPUT_DIR"
+OUTPUT_PATH="$(pwd)/$OUTPUT_DIR"
 
 echo -e "${CYAN}Output directory: $OUTPUT_DIR${NC}"
 echo ""
 
-# Function to get script name for a command
-get_script_name() {
-    local cmd_name="$1"
-    case "$cmd_name" in
-        specify) echo "create-new-feature" ;;
-        plan) echo "setup-plan" ;;
-        specify-unit) echo "create-unit-test" ;;
-        plan-unit) echo "setup-unit-plan" ;;
-        *) echo "NA" ;;
-    esac
-}
-
-# Function to generate command files for an agent
-generate_commands() {
-    local agent="$1"
-    local format="$2"
-    local arg_placeholder="$3"
-    local output_dir="$4"
-    local script_type="$5"
-    
-    local script_ext
-    local script_dir
-    if [ "$script_type" = "sh" ]; then
-        script_ext="sh"
-        script_dir="bash"
-    else
-        script_ext="ps1"
-        script_dir="powershell"
-    fi
-    
-    # Copy command files from templates
-    for cmd_file in templates/commands/*.md; do
-        local cmd_name=$(basename "$cmd_file" .md)
-        local script_name=$(get_script_name "$cmd_name")
-        local dest_file="$output_dir/$cmd_name.$format"
-        
-        # Read the template
-        local content=$(cat "$cmd_file")
-        
-        # Replace placeholders based on format
-        if [ "$format" = "md" ]; then
-            # Markdown format (Claude, Cursor, opencode, Windsurf, Codex, Kilocode, Auggie, Roo)
-            if [ "$script_name" != "NA" ]; then
-                # Has a script
-                content="${content//\{SCRIPT\}/scripts/$script_dir/$script_name.$script_ext}"
-            fi
-            content="${content//\{ARGS\}/$arg_placeholder}"
-            content="${content//__AGENT__/$agent}"
-            echo "$content" > "$dest_file"
-        elif [ "$format" = "toml" ]; then
-            # TOML format (Gemini, Qwen)
-            local toml_content="description = \"$(head -n 1 "$cmd_file" | sed 's/^---$//' | sed 's/description: //' | tr -d '\"')\"\n\nprompt = \"\"\"\n$content\n\"\"\""
-            if [ "$script_name" != "NA" ]; then
-                toml_content="${toml_content//\{SCRIPT\}/scripts/$script_dir/$script_name.$script_ext}"
-            fi
-            toml_content="${toml_content//\{ARGS\}/{{args\}}}"
-            toml_content="${toml_content//\$ARGUMENTS/{{args\}}}"
-            toml_content="${toml_content//__AGENT__/$agent}"
-            echo -e "$toml_content" > "$dest_file"
-        fi
-    done
-}
-
 # Function to copy template files
 copy_templates() {
     local base_dir="$1"
@@ -233,115 +200,150 @@ Use the `/specify-unit`, `/plan-unit`, `/tasks-unit`, and `/implement-unit` comm
 EOF
 }
 
+# Build one agent/script variant in its own staging directory
+build_package() {
+    local agent="$1"
+    local script_type="$2"
+    local TEMP_DIR BASE_DIR PACKAGE_NAME
+
+    echo -e "${YELLOW}Creating package: $agent-$script_type${NC}"
+    
+    # Create temporary directory for this package
+    TEMP_DIR=$(mktemp -d)
+    BASE_DIR="$TEMP_DIR/spec-kit-$agent-$script_type"
+    mkdir -p "$BASE_DIR"
+    
+    # Command files were rendered for every variant up front
+    cp -R "$RENDER_DIR/spec-kit-$agent-$script_type/." "$BASE_DIR/"
+
+    # Agent-specific context file
+    case $agent in
+        claude)
+            create_agent_context "$BASE_DIR" "Claude Code" ".claude/rules"
+            ;;
+        gemini)
+            create_agent_context "$BASE_DIR" "Gemini CLI" ".gemini/rules"
+            ;;
+        copilot)
+            mkdir -p "$BASE_DIR/.github/copilot"
+            create_agent_context "$BASE_DIR" "GitHub Copilot" ".github/copilot"
+            ;;
+        cursor)
+            create_agent_context "$BASE_DIR" "Cursor" ".cursor/rules"
+            ;;
+        qwen)
+            create_agent_context "$BASE_DIR" "Qwen Code" ".qwen/rules"
+            ;;
+        opencode)
+            create_agent_context "$BASE_DIR" "opencode" ".opencode/rules"
+            ;;
+        codex)
+            create_agent_context "$BASE_DIR" "Codex CLI" ".codex/rules"
+            ;;
+        windsurf)
+            create_agent_context "$BASE_DIR" "Windsurf" ".windsurf/rules"
+            ;;
+        kilocode)
+            create_agent_context "$BASE_DIR" "Kilo Code" ".kilocode/rules"
+            ;;
+        auggie)
+            create_agent_context "$BASE_DIR" "Auggie CLI" ".auggie/rules"
+            ;;
+        roo)
+            create_agent_context "$BASE_DIR" "Roo Code" ".roo/rules"
+            ;;
+    esac
+    
+    # Copy templates (all agents need these)
+    copy_templates "$BASE_DIR"
+    
+    # Copy scripts based on script type
+    if [ "$script_type" = "sh" ]; then
+        copy_scripts "$BASE_DIR" "bash"
+    else
+        copy_scripts "$BASE_DIR" "powershell"
+    fi
+    
+    # Create .specify directory structure
+    create_specify_structure "$BASE_DIR"
+    
+    # Copy documentation
+    cp README.md "$BASE_DIR/" 2>/dev/null || true
+    cp UNIT-TESTING.md "$BASE_DIR/" 2>/dev/null || true
+    cp spec-driven.md "$BASE_DIR/" 2>/dev/null || true
+    cp GO-TESTING-GUIDE.md "$BASE_DIR/" 2>/dev/null || true
+    
+    # Create memory directory
+    mkdir -p "$BASE_DIR/memory"
+    cp memory/constitution.md "$BASE_DIR/memory/" 2>/dev/null || true
+    
+    # Create package (deterministic zip with embedded manifest)
+    PACKAGE_NAME="spec-kit-template-${agent}-${script_type}-${VERSION}.zip"
+    python3 src/specify_cli/packaging.py "$BASE_DIR" "$OUTPUT_PATH/$PACKAGE_NAME" \
+        --epoch "$SOURCE_DATE_EPOCH" --meta "agent=$agent" --meta "script=$script_type" --meta "release=$VERSION"
+    
+    # Cleanup
+    rm -rf "$TEMP_DIR"
+    
+    echo -e "${GREEN}✓ Created: $PACKAGE_NAME${NC}"
+}
+
 # Create packages for each agent and script type
 echo -e "${CYAN}Creating packages for all agents...${NC}"
 echo ""
 
+# Render the command files for all agents and script types in one pass
+# (each template is parsed once)
+RENDER_DIR=$(mktemp -d)
+LOG_DIR=$(mktemp -d)
+trap 'rm -rf "$RENDER_DIR" "$LOG_DIR"' EXIT
+python3 src/specify_cli/render.py --templates templates/commands --out "$RENDER_DIR" \
+    --agents "$(IFS=,; echo "${ALL_AGENTS[*]}")" --scripts "$(IFS=,; echo "${SCRIPT_TYPES[*]}")"
+
+# Each build runs in a background subshell; its output is kept in a log and
+# printed in a fixed order once all builds are done. At most $JOBS run at once:
+# bash >= 4.3 waits for whichever build finishes first (wait -n); older bash
+# (3.2 on macOS) waits for the oldest one, which still keeps the limit.
+VARIANTS=()
+PIDS=()
+WAIT_ANY=0
+if (( BASH_VERSINFO[0] > 4 || (BASH_VERSINFO[0] == 4 && BASH_VERSINFO[1] >= 3) )); then
+    WAIT_ANY=1
+fi
 for agent in "${ALL_AGENTS[@]}"; do
     for script_type in "${SCRIPT_TYPES[@]}"; do
-        echo -e "${YELLOW}Creating package: $agent-$script_type${NC}"
-        
-        # Create temporary directory for this package
-        TEMP_DIR=$(mktemp -d)
-        BASE_DIR="$TEMP_DIR/spec-kit-$agent-$script_type"
-        mkdir -p "$BASE_DIR"
-        
-        # Determine directory structure based on agent
-  case $agent in
-    claude)
-                mkdir -p "$BASE_DIR/.claude/commands"
-                generate_commands "$agent" "md" "\$ARGUMENTS" "$BASE_DIR/.claude/commands" "$script_type"
-                create_agent_context "$BASE_DIR" "Claude Code" ".claude/rules"
-                ;;
-    gemini)
-                mkdir -p "$BASE_DIR/.gemini/commands"
-                generate_commands "$agent" "toml" "{{args}}" "$BASE_DIR/.gemini/commands" "$script_type"
-                create_agent_context "$BASE_DIR" "Gemini CLI" ".gemini/rules"
-                ;;
-    copilot)
-                mkdir -p "$BASE_DIR/.github/prompts"
-                generate_commands "$agent" "md" "\$ARGUMENTS" "$BASE_DIR/.github/prompts" "$script_type"
-                mkdir -p "$BASE_DIR/.github/copilot"
-                create_agent_context "$BASE_DIR" "GitHub Copilot" ".github/copilot"
-                ;;
-    cursor)
-                mkdir -p "$BASE_DIR/.cursor/commands"
-                generate_commands "$agent" "md" "\$ARGUMENTS" "$BASE_DIR/.cursor/commands" "$script_type"
-                create_agent_context "$BASE_DIR" "Cursor" ".cursor/rules"
-                ;;
-    qwen)
-                mkdir -p "$BASE_DIR/.qwen/commands"
-                generate_commands "$agent" "toml" "{{args}}" "$BASE_DIR/.qwen/commands" "$script_type"
-                create_agent_context "$BASE_DIR" "Qwen Code" ".qwen/rules"
-                ;;
-    opencode)
-                mkdir -p "$BASE_DIR/.opencode/command"
-                generate_commands "$agent" "md" "\$ARGUMENTS" "$BASE_DIR/.opencode/command" "$script_type"
-                create_agent_context "$BASE_DIR" "opencode" ".opencode/rules"
-                ;;
-            codex)
-                mkdir -p "$BASE_DIR/.codex/commands"
-                generate_commands "$agent" "md" "\$ARGUMENTS" "$BASE_DIR/.codex/commands" "$script_type"
-                create_agent_context "$BASE_DIR" "Codex CLI" ".codex/rules"
-                ;;
-    windsurf)
-                mkdir -p "$BASE_DIR/.windsurf/workflows"
-                generate_commands "$agent" "md" "\$ARGUMENTS" "$BASE_DIR/.windsurf/workflows" "$script_type"
-                create_agent_context "$BASE_DIR" "Windsurf" ".windsurf/rules"
-                ;;
-    kilocode)
-                mkdir -p "$BASE_DIR/.kilocode/commands"
-                generate_commands "$agent" "md" "\$ARGUMENTS" "$BASE_DIR/.kilocode/commands" "$script_type"
-                create_agent_context "$BASE_DIR" "Kilo Code" ".kilocode/rules"
-                ;;
-    auggie)
-                mkdir -p "$BASE_DIR/.auggie/commands"
-                generate_commands "$agent" "md" "\$ARGUMENTS" "$BASE_DIR/.auggie/commands" "$script_type"
-                create_agent_context "$BASE_DIR" "Auggie CLI" ".auggie/rules"
-                ;;
-            roo)
-                mkdir -p "$BASE_DIR/.roo/commands"
-                generate_commands "$agent" "md" "\$ARGUMENTS" "$BASE_DIR/.roo/commands" "$script_type"
-                create_agent_context "$BASE_DIR" "Roo Code" ".roo/rules"
-                ;;
-        esac
-        
-        # Copy templates (all agents need these)
-        copy_templates "$BASE_DIR"
-        
-        # Copy scripts based on script type
-        if [ "$script_type" = "sh" ]; then
-            copy_scripts "$BASE_DIR" "bash"
-        else
-            copy_scripts "$BASE_DIR" "powershell"
+        variant="$agent-$script_type"
+        VARIANTS+=("$variant")
+        (
+            set -e
+            build_package "$agent" "$script_type"
+            touch "$LOG_DIR/$variant.ok"
+        ) > "$LOG_DIR/$variant.log" 2>&1 &
+        PIDS+=("$!")
+        if [ "${#PIDS[@]}" -ge "$JOBS" ]; then
+            if [ "$WAIT_ANY" = 1 ]; then
+                wait -n || true  # reports each finished build once
+            else
+                wait "${PIDS[0]}" || true
+            fi
+            PIDS=("${PIDS[@]:1}")
         fi
-        
-        # Create .specify directory structure
-        create_specify_structure "$BASE_DIR"
-        
-        # Copy documentation
-        cp README.md "$BASE_DIR/" 2>/dev/null || true
-        cp UNIT-TESTING.md "$BASE_DIR/" 2>/dev/null || true
-        cp spec-driven.md "$BASE_DIR/" 2>/dev/null || true
-        cp GO-TESTING-GUIDE.md "$BASE_DIR/" 2>/dev/null || true
-        
-        # Create memory directory
-        mkdir -p "$BASE_DIR/memory"
-        cp memory/constitution.md "$BASE_DIR/memory/" 2>/dev/null || true
-        
-        # Create package
-        PACKAGE_NAME="spec-kit-template-${agent}-${script_type}-${VERSION}.zip"
-        cd "$TEMP_DIR"
-        zip -r "$PACKAGE_NAME" "spec-kit-$agent-$script_type" > /dev/null
-        mv "$PACKAGE_NAME" "$OLDPWD/$OUTPUT_DIR/"
-        cd "$OLDPWD"
-        
-        # Cleanup
-        rm -rf "$TEMP_DIR"
-        
-        echo -e "${GREEN}✓ Created: $PACKAGE_NAME${NC}"
-  done
+    done
 done
+wait || true
+
+FAILED=()
+for variant in "${VARIANTS[@]}"; do
+    cat "$LOG_DIR/$variant.log"
+    if [ ! -f "$LOG_DIR/$variant.ok" ]; then
+        echo -e "${RED}✗ Failed: $variant${NC}"
+        FAILED+=("$variant")
+    fi
+done
+if [ "${#FAILED[@]}" -gt 0 ]; then
+    echo -e "${RED}Error: ${#FAILED[@]} package(s) failed: ${FAILED[*]}${NC}"
+    exit 1
+fi
 
 echo ""
 echo -e "${GREEN}======================================${NC}"
@@ -0,0 +1,123 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# stress-create.sh
+# Start N feature and unit-test creators at the same moment against one
+# checkout and fail if any two of them got the same number, directory or branch.
+# Creators are a mix of `specify feature new`, `specify unit init` and the bash
+# scripts, all of which share the .specify/index.lock lock.
+# Usage: stress-create.sh [creators]
+#   STRESS_CREATORS can be used instead of the argument.
+#   STRESS_HIDE="flock ..." takes those commands off PATH for the run, e.g. to
+#   exercise the lock fallback used where flock(1) is missing (stock macOS).
+
+CREATORS="${1:-${STRESS_CREATORS:-24}}"
+PYTHON="${PYTHON:-python3}"
+REPO_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)"
+
+export GIT_AUTHOR_NAME="${GIT_AUTHOR_NAME:-stress}" GIT_AUTHOR_EMAIL="${GIT_AUTHOR_EMAIL:-stress@example.com}"
+export GIT_COMMITTER_NAME="$GIT_AUTHOR_NAME" GIT_COMMITTER_EMAIL="$GIT_AUTHOR_EMAIL"
+
+WORK="$(mktemp -d)"
+trap 'rm -rf "$WORK"' EXIT
+
+if [[ -n "${STRESS_HIDE:-}" ]]; then
+  # PATH becomes one directory of links to every command except the hidden ones
+  shadow="$WORK/bin"
+  mkdir -p "$shadow"
+  IFS=: read -ra path_dirs <<< "$PATH"
+  for dir in "${path_dirs[@]}"; do
+    for cmd in "$dir"/*; do
+      name="${cmd##*/}"
+      [[ -x "$cmd" && ! -e "$shadow/$name" && " $STRESS_HIDE " != *" $name "* ]] || continue
+      ln -s "$cmd" "$shadow/$name"
+    done
+  done
+  export PATH="$shadow"
+  for name in $STRESS_HIDE; do
+    if command -v "$name" >/dev/null 2>&1; then
+      echo "Could not hide $name" >&2
+      exit 1
+    fi
+  done
+  echo "Hidden from PATH: $STRESS_HIDE"
+fi
+
+run_round() {
+  local mode="$1" project="$WORK/$1"
+  mkdir -p "$project/.specify/templates" "$project/.specify/scripts" "$project/out"
+  # The scripts find the project from their own location when git is absent
+  cp -R "$REPO_DIR/scripts/bash" "$project/.specify/scripts/bash"
+  echo "# spec" > "$project/.specify/templates/spec-template.md"
+  echo "# test spec" > "$project/.specify/templates/unit-test-template.md"
+  if [[ "$mode" == git ]]; then
+    git -C "$project" init -q
+    git -C "$project" commit -q --allow-empty -m "init"
+  fi
+
+  local pids=() i
+  for i in $(seq "$CREATORS"); do
+    case $(( i % 4 )) in
+      0) (cd "$project" && "$PYTHON" -m specify_cli feature new --json "stress feature $i") ;;
+      1) (cd "$project" && bash .specify/scripts/bash/create-new-feature.sh --json "stress feature $i") ;;
+      2) (cd "$project" && "$PYTHON" -m specify_cli unit init --json "stress test $i") ;;
+      3) (cd "$project" && bash .specify/scripts/bash/create-unit-test.sh --json "stress test $i") ;;
+    esac >"$project/out/$i.json" 2>"$project/out/$i.err" &
+    pids+=($!)
+  done
+
+  local failed=0 pid
+  for pid in "${pids[@]}"; do
+    wait "$pid" || failed=$((failed + 1))
+  done
+  if (( failed )); then
+    echo "[$mode] $failed creator(s) failed:" >&2
+    cat "$project"/out/*.err >&2
+    return 1
+  fi
+
+  "$PYTHON" - "$project" "$mode" "$CREATORS" <<'EOF'
+import json, os, re, subprocess, sys
+from pathlib import Path
+
+project, mode, creators = Path(sys.argv[1]), sys.argv[2], int(sys.argv[3])
+specs, tests = [], []
+for out in sorted((project / "out").glob("*.json")):
+    lines = [l for l in out.read_text().splitlines() if l.startswith("{")]
+    data = json.loads(lines[-1])
+    (specs if "FEATURE_NUM" in data else tests).append(data)
+
+errors = []
+for label, results, key, directory in (("feature", specs, "FEATURE_NUM", "specs"), ("unit test", tests, "TEST_NUM", "tests")):
+    numbers = [r[key] for r in results]
+    if len(set(numbers)) != len(numbers):
+        dupes = sorted({n for n in numbers if numbers.count(n) > 1})
+        errors.append(f"duplicate {label} numbers: {', '.join(dupes)}")
+    dirs = [d for d in os.listdir(project / directory) if re.match(r"^\d{3}-", d)]
+    prefixes = [d[:3] for d in dirs]
+    if len(dirs) != len(results) or len(set(prefixes)) != len(prefixes):
+        errors.append(f"{directory}/ has {len(dirs)} numbered directories for {len(results)} creators: {sorted(dirs)}")
+    if mode == "git":
+        branches = subprocess.run(["git", "-C", str(project), "branch", "--format=%(refname:short)"], capture_output=True, text=True).stdout.split()
+        missing = [r["BRANCH_NAME"] for r in results if r["BRANCH_NAME"] not in branches]
+        if missing:
+            errors.append(f"missing {label} branches: {missing}")
+
+if len(specs) + len(tests) != creators:
+    errors.append(f"expected {creators} results, got {len(specs) + len(tests)}")
+for error in errors:
+    print(f"[{mode}] {error}", file=sys.stderr)
+if errors:
+    sys.exit(1)
+print(f"[{mode}] {len(specs)} features and {len(tests)} unit tests created concurrently, all numbers unique")
+EOF
+}
+
+status=0
+run_round git || status=1
+run_round no-git || status=1
+
+if [[ -n "${GITHUB_STEP_SUMMARY:-}" ]]; then
+  echo "Concurrent creation stress test (${CREATORS} creators${STRESS_HIDE:+, without $STRESS_HIDE}): $([[ $status -eq 0 ]] && echo passed || echo **failed**)" >> "$GITHUB_STEP_SUMMARY"
+fi
+exit $status
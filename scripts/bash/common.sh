@@ -33,20 +33,18 @@ get_current_branch() {
     if [[ -d "$specs_dir" ]]; then
         local latest_feature=""
         local highest=0
+        local dirname
         
-        for dir in "$specs_dir"/*; do
-            if [[ -d "$dir" ]]; then
-                local dirname=$(basename "$dir")
-                if [[ "$dirname" =~ ^([0-9]{3})- ]]; then
-                    local number=${BASH_REMATCH[1]}
-                    number=$((10#$number))
-                    if [[ "$number" -gt "$highest" ]]; then
-                        highest=$number
-                        latest_feature=$dirname
-                    fi
+        while IFS= read -r dirname; do
+            if [[ "$dirname" =~ ^([0-9]{3})- ]]; then
+                local number=${BASH_REMATCH[1]}
+                number=$((10#$number))
+                if [[ "$number" -gt "$highest" ]]; then
+                    highest=$number
+                    latest_feature=$dirname
                 fi
             fi
-        done
+        done < <(numbered_dirs "$repo_root" specs)
         
         if [[ -n "$latest_feature" ]]; then
             echo "$latest_feature"
@@ -57,6 +55,42 @@ get_current_branch() {
     echo "main"  # Final fallback
 }
 
+# Names of the numbered directories under <repo>/<kind> (specs or tests), one
+# per line. They come from the number index (.specify/index.json) when it has
+# the kind and the directory has not changed since the index was written
+# (specify only writes kinds that are accurate); otherwise from one listing.
+numbered_dirs() {
+    local root="$1" kind="$2"
+    local index="$root/.specify/index.json" dir name
+    if [[ -f "$index" && -d "$root/$kind" && ! "$root/$kind" -nt "$index" ]] && grep -q "\"$kind\": {" "$index"; then
+        grep -o "\"$kind/[0-9][^\"]*\"" "$index" | while IFS= read -r name; do
+            name="${name#\"$kind/}"
+            echo "${name%\"}"
+        done
+        return
+    fi
+    for dir in "$root/$kind"/*; do
+        name="${dir##*/}"
+        if [[ -d "$dir" && "$name" =~ ^[0-9] ]]; then
+            echo "$name"
+        fi
+    done
+}
+
+# Highest leading number among the numbered directories under <repo>/<kind>
+highest_number() {
+    local highest=0 name number
+    while IFS= read -r name; do
+        if [[ "$name" =~ ^([0-9]+) ]]; then
+            number=$((10#${BASH_REMATCH[1]}))
+            if [[ "$number" -gt "$highest" ]]; then
+                highest=$number
+            fi
+        fi
+    done < <(numbered_dirs "$1" "$2")
+    echo "$highest"
+}
+
 # Check if we have git available
 has_git() {
     git rev-parse --show-toplevel >/dev/null 2>&1
@@ -111,3 +145,38 @@ EOF
 
 check_file() { [[ -f "$1" ]] && echo "  ✓ $2" || echo "  ✗ $2"; }
 check_dir() { [[ -d "$1" && -n $(ls -A "$1" 2>/dev/null) ]] && echo "  ✓ $2" || echo "  ✗ $2"; }
+
+# Take the exclusive lock on <repo>/.specify/index.lock and keep it, on fd 9,
+# until the script exits. It is the same flock(2) lock `specify feature new`
+# and `specify unit init` take. flock(1) is used when it is installed (it is
+# not on stock macOS); otherwise perl or python3 lock the inherited fd, and
+# the lock stays held after they exit because the shell still has it open.
+lock_index() {
+    local lock="$1/.specify/index.lock" timeout=10
+    exec 9>>"$lock"
+    if command -v flock >/dev/null 2>&1; then
+        flock -w "$timeout" 9 && return 0
+    elif command -v perl >/dev/null 2>&1; then
+        perl -MFcntl=:flock -e '
+            open(my $fh, ">&=", 9) or exit 2;
+            for (1 .. $ARGV[0] * 100) { exit 0 if flock($fh, LOCK_EX | LOCK_NB); select(undef, undef, undef, 0.01) }
+            exit 1' "$timeout" && return 0
+    elif command -v python3 >/dev/null 2>&1; then
+        python3 -c '
+import fcntl, sys, time
+deadline = time.monotonic() + float(sys.argv[1])
+while True:
+    try:
+        fcntl.flock(9, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        sys.exit(0)
+    except BlockingIOError:
+        if time.monotonic() >= deadline:
+            sys.exit(1)
+        time.sleep(0.01)' "$timeout" && return 0
+    else
+        echo "Error: flock, perl or python3 is required to lock $lock" >&2
+        return 1
+    fi
+    echo "Error: Timed out waiting for $lock" >&2
+    return 1
+}
@@ -35,6 +35,7 @@ find_repo_root() {
 # to searching for repository markers so the workflow still functions in repositories that
 # were initialised with --no-git.
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "$SCRIPT_DIR/common.sh"
 
 if git rev-parse --show-toplevel >/dev/null 2>&1; then
     REPO_ROOT=$(git rev-parse --show-toplevel)
@@ -50,36 +51,65 @@ fi
 
 cd "$REPO_ROOT"
 
+# `specify unit init` does the same work and keeps the number index up to date;
+# use it when it is installed. Exit status 2 means this version of specify has
+# no such command, so fall through to the shell implementation.
+if command -v specify >/dev/null 2>&1; then
+    SPECIFY_ERR="$(mktemp)"
+    status=0
+    if $JSON_MODE; then
+        specify unit init --dir "$REPO_ROOT" --json "$TEST_DESCRIPTION" 2>"$SPECIFY_ERR" || status=$?
+    else
+        specify unit init --dir "$REPO_ROOT" "$TEST_DESCRIPTION" 2>"$SPECIFY_ERR" || status=$?
+    fi
+    if [ "$status" -ne 2 ]; then
+        cat "$SPECIFY_ERR" >&2
+        rm -f "$SPECIFY_ERR"
+        exit "$status"
+    fi
+    rm -f "$SPECIFY_ERR"
+fi
+
 TESTS_DIR="$REPO_ROOT/tests"
 mkdir -p "$TESTS_DIR"
 
-HIGHEST=0
-if [ -d "$TESTS_DIR" ]; then
-    for dir in "$TESTS_DIR"/*; do
-        [ -d "$dir" ] || continue
-        dirname=$(basename "$dir")
-        number=$(echo "$dirname" | grep -o '^[0-9]\+' || echo "0")
-        number=$((10#$number))
-        if [ "$number" -gt "$HIGHEST" ]; then HIGHEST=$number; fi
-    done
-fi
+# Serialize numbering with other creators in this checkout (parallel agents,
+# `specify feature new` / `specify unit init` take the same lock)
+mkdir -p "$REPO_ROOT/.specify"
+[ -f "$REPO_ROOT/.specify/.gitignore" ] || printf 'index.json\nindex.lock\n' > "$REPO_ROOT/.specify/.gitignore"
+lock_index "$REPO_ROOT" || exit 1
 
-NEXT=$((HIGHEST + 1))
-TEST_NUM=$(printf "%03d" "$NEXT")
+HIGHEST=$(highest_number "$REPO_ROOT" tests)
 
 BRANCH_NAME=$(echo "$TEST_DESCRIPTION" | tr '[:upper:]' '[:lower:]' | sed 's/[^a-z0-9]/-/g' | sed 's/-\+/-/g' | sed 's/^-//' | sed 's/-$//')
 WORDS=$(echo "$BRANCH_NAME" | tr '-' '\n' | grep -v '^$' | head -3 | tr '\n' '-' | sed 's/-$//')
-BRANCH_NAME="${TEST_NUM}-unit-${WORDS}"
+
+# Reserve the directory with an exclusive mkdir; move on to the next number if it is taken
+NEXT=$((HIGHEST + 1))
+while :; do
+    TEST_NUM=$(printf "%03d" "$NEXT")
+    BRANCH_NAME="${TEST_NUM}-unit-${WORDS}"
+    TEST_DIR="$TESTS_DIR/$BRANCH_NAME"
+    mkdir "$TEST_DIR" 2>/dev/null && break
+    if [ ! -e "$TEST_DIR" ]; then
+        echo "Error: Could not create $TEST_DIR" >&2
+        exit 1
+    fi
+    NEXT=$((NEXT + 1))
+done
+# This script cannot write the number index (.specify/index.json); drop it so
+# the next allocation rescans instead of trusting mtimes that may be too coarse
+rm -f "$REPO_ROOT/.specify/index.json"
 
 if [ "$HAS_GIT" = true ]; then
-    git checkout -b "$BRANCH_NAME"
+    if ! git checkout -b "$BRANCH_NAME"; then
+        rmdir "$TEST_DIR"
+        exit 1
+    fi
 else
     >&2 echo "[specify-unit] Warning: Git repository not detected; skipped branch creation for $BRANCH_NAME"
 fi
 
-TEST_DIR="$TESTS_DIR/$BRANCH_NAME"
-mkdir -p "$TEST_DIR"
-
 TEMPLATE="$REPO_ROOT/.specify/templates/unit-test-template.md"
 TEST_SPEC_FILE="$TEST_DIR/test-spec.md"
 if [ -f "$TEMPLATE" ]; then cp "$TEMPLATE" "$TEST_SPEC_FILE"; else touch "$TEST_SPEC_FILE"; fi
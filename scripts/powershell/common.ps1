@@ -39,12 +39,12 @@ function Get-CurrentBranch {
         $latestFeature = ""
         $highest = 0
         
-        Get-ChildItem -Path $specsDir -Directory | ForEach-Object {
-            if ($_.Name -match '^(\d{3})-') {
+        foreach ($name in Get-NumberedDirs -RepoRoot $repoRoot -Kind 'specs') {
+            if ($name -match '^(\d{3})-') {
                 $num = [int]$matches[1]
                 if ($num -gt $highest) {
                     $highest = $num
-                    $latestFeature = $_.Name
+                    $latestFeature = $name
                 }
             }
         }
@@ -58,6 +58,62 @@ function Get-CurrentBranch {
     return "main"
 }
 
+# Names of the numbered directories under <repo>/<kind> (specs or tests). They
+# come from the number index (.specify/index.json) when it has the kind and the
+# directory has not changed since the index was written (specify only writes
+# kinds that are accurate); otherwise from one listing.
+function Get-NumberedDirs {
+    param(
+        [string]$RepoRoot,
+        [string]$Kind
+    )
+    $dir = Join-Path $RepoRoot $Kind
+    $index = Join-Path $RepoRoot '.specify/index.json'
+    if ((Test-Path $index -PathType Leaf) -and (Test-Path $dir -PathType Container) -and
+        ((Get-Item $dir).LastWriteTimeUtc -le (Get-Item $index).LastWriteTimeUtc)) {
+        try {
+            $entries = (Get-Content $index -Raw | ConvertFrom-Json).kinds.$Kind.entries
+            if ($null -ne $entries) {
+                return @($entries.PSObject.Properties | ForEach-Object { $_.Name })
+            }
+        } catch {
+            # Unreadable index: list the directory instead
+        }
+    }
+    if (-not (Test-Path $dir -PathType Container)) { return @() }
+    return @(Get-ChildItem -Path $dir -Directory | Where-Object { $_.Name -match '^\d' } | ForEach-Object { $_.Name })
+}
+
+# Highest leading number among the numbered directories under <repo>/<kind>
+function Get-HighestNumber {
+    param(
+        [string]$RepoRoot,
+        [string]$Kind
+    )
+    $highest = 0
+    foreach ($name in Get-NumberedDirs -RepoRoot $RepoRoot -Kind $Kind) {
+        if ($name -match '^(\d+)') {
+            $num = [int]$matches[1]
+            if ($num -gt $highest) { $highest = $num }
+        }
+    }
+    return $highest
+}
+
+# Run `specify <Arguments>` (a create command with --json) and return its parsed
+# output, or $null when specify is not installed or has no such command (exit
+# code 2). Any other failure ends the calling script with the same exit code.
+function Invoke-SpecifyCreate {
+    param([string[]]$Arguments)
+    if (-not (Get-Command specify -CommandType Application -ErrorAction SilentlyContinue)) {
+        return $null
+    }
+    $output = & specify @Arguments
+    if ($LASTEXITCODE -eq 2) { return $null }
+    if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
+    return (@($output)[-1] | ConvertFrom-Json)
+}
+
 function Test-HasGit {
     try {
         git rev-parse --show-toplevel 2>$null | Out-Null
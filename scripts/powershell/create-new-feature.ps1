@@ -7,6 +7,7 @@ param(
     [string[]]$FeatureDescription
 )
 $ErrorActionPreference = 'Stop'
+. "$PSScriptRoot/common.ps1"
 
 if (-not $FeatureDescription -or $FeatureDescription.Count -eq 0) {
     Write-Error "Usage: ./create-new-feature.ps1 [-Json] <feature description>"
@@ -57,44 +58,84 @@ try {
 
 Set-Location $repoRoot
 
-$specsDir = Join-Path $repoRoot 'specs'
-New-Item -ItemType Directory -Path $specsDir -Force | Out-Null
+# `specify feature new` does the same work and keeps the number index up to date;
+# use it when it is installed
+$created = Invoke-SpecifyCreate -Arguments @('feature', 'new', '--dir', $repoRoot, '--json', $featureDesc)
+if ($created) {
+    $branchName = $created.BRANCH_NAME
+    $specFile = $created.SPEC_FILE
+    $featureNum = $created.FEATURE_NUM
+} else {
+    $specsDir = Join-Path $repoRoot 'specs'
+    New-Item -ItemType Directory -Path $specsDir -Force | Out-Null
 
-$highest = 0
-if (Test-Path $specsDir) {
-    Get-ChildItem -Path $specsDir -Directory | ForEach-Object {
-        if ($_.Name -match '^(\d{3})') {
-            $num = [int]$matches[1]
-            if ($num -gt $highest) { $highest = $num }
+    # Serialize numbering with other creators in this checkout (parallel agents,
+    # `specify feature new` / `specify unit init` lock the same file)
+    $specifyDir = Join-Path $repoRoot '.specify'
+    New-Item -ItemType Directory -Path $specifyDir -Force | Out-Null
+    $ignoreFile = Join-Path $specifyDir '.gitignore'
+    if (-not (Test-Path $ignoreFile)) { Set-Content -Path $ignoreFile -Value @('index.json', 'index.lock') }
+    $lockPath = Join-Path $specifyDir 'index.lock'
+    $lock = $null
+    $deadline = (Get-Date).AddSeconds(10)
+    while (-not $lock) {
+        try {
+            $lock = [System.IO.File]::Open($lockPath, 'OpenOrCreate', 'ReadWrite', 'None')
+        } catch [System.IO.IOException] {
+            if ((Get-Date) -ge $deadline) {
+                Write-Error "Error: Timed out waiting for $lockPath"
+                exit 1
+            }
+            Start-Sleep -Milliseconds 20
         }
     }
-}
-$next = $highest + 1
-$featureNum = ('{0:000}' -f $next)
-
-$branchName = $featureDesc.ToLower() -replace '[^a-z0-9]', '-' -replace '-{2,}', '-' -replace '^-', '' -replace '-$', ''
-$words = ($branchName -split '-') | Where-Object { $_ } | Select-Object -First 3
-$branchName = "$featureNum-$([string]::Join('-', $words))"
 
-if ($hasGit) {
     try {
-        git checkout -b $branchName | Out-Null
-    } catch {
-        Write-Warning "Failed to create git branch: $branchName"
-    }
-} else {
-    Write-Warning "[specify] Warning: Git repository not detected; skipped branch creation for $branchName"
-}
+        $highest = Get-HighestNumber -RepoRoot $repoRoot -Kind 'specs'
 
-$featureDir = Join-Path $specsDir $branchName
-New-Item -ItemType Directory -Path $featureDir -Force | Out-Null
+        $branchName = $featureDesc.ToLower() -replace '[^a-z0-9]', '-' -replace '-{2,}', '-' -replace '^-', '' -replace '-$', ''
+        $words = ($branchName -split '-') | Where-Object { $_ } | Select-Object -First 3
 
-$template = Join-Path $repoRoot '.specify/templates/spec-template.md'
-$specFile = Join-Path $featureDir 'spec.md'
-if (Test-Path $template) { 
-    Copy-Item $template $specFile -Force 
-} else { 
-    New-Item -ItemType File -Path $specFile | Out-Null 
+        # Reserve the directory (New-Item fails if it exists); move on to the next number if it is taken
+        $next = $highest + 1
+        while ($true) {
+            $featureNum = ('{0:000}' -f $next)
+            $branchName = "$featureNum-$([string]::Join('-', $words))"
+            $featureDir = Join-Path $specsDir $branchName
+            if (-not (Test-Path $featureDir)) {
+                try {
+                    New-Item -ItemType Directory -Path $featureDir -ErrorAction Stop | Out-Null
+                    break
+                } catch {
+                    if (-not (Test-Path $featureDir)) { throw }
+                }
+            }
+            $next++
+        }
+        # This script does not write the number index (.specify/index.json); drop it so
+        # the next allocation rescans instead of trusting mtimes that may be too coarse
+        Remove-Item -Path (Join-Path $specifyDir 'index.json') -Force -ErrorAction SilentlyContinue
+
+        if ($hasGit) {
+            try {
+                git checkout -b $branchName | Out-Null
+            } catch {
+                Write-Warning "Failed to create git branch: $branchName"
+            }
+        } else {
+            Write-Warning "[specify] Warning: Git repository not detected; skipped branch creation for $branchName"
+        }
+    } finally {
+        $lock.Dispose()
+    }
+
+    $template = Join-Path $repoRoot '.specify/templates/spec-template.md'
+    $specFile = Join-Path $featureDir 'spec.md'
+    if (Test-Path $template) { 
+        Copy-Item $template $specFile -Force 
+    } else { 
+        New-Item -ItemType File -Path $specFile | Out-Null 
+    }
 }
 
 # Set the SPECIFY_FEATURE environment variable for the current session
@@ -7,6 +7,7 @@ param(
     [string[]]$TestDescription
 )
 $ErrorActionPreference = 'Stop'
+. "$PSScriptRoot/common.ps1"
 
 if (-not $TestDescription -or $TestDescription.Count -eq 0) {
     Write-Error "Usage: ./create-unit-test.ps1 [-Json] <test description>"
@@ -57,44 +58,84 @@ try {
 
 Set-Location $repoRoot
 
-$testsDir = Join-Path $repoRoot 'tests'
-New-Item -ItemType Directory -Path $testsDir -Force | Out-Null
+# `specify unit init` does the same work and keeps the number index up to date;
+# use it when it is installed
+$created = Invoke-SpecifyCreate -Arguments @('unit', 'init', '--dir', $repoRoot, '--json', $testDesc)
+if ($created) {
+    $branchName = $created.BRANCH_NAME
+    $testSpecFile = $created.TEST_SPEC_FILE
+    $testNum = $created.TEST_NUM
+} else {
+    $testsDir = Join-Path $repoRoot 'tests'
+    New-Item -ItemType Directory -Path $testsDir -Force | Out-Null
 
-$highest = 0
-if (Test-Path $testsDir) {
-    Get-ChildItem -Path $testsDir -Directory | ForEach-Object {
-        if ($_.Name -match '^(\d{3})') {
-            $num = [int]$matches[1]
-            if ($num -gt $highest) { $highest = $num }
+    # Serialize numbering with other creators in this checkout (parallel agents,
+    # `specify feature new` / `specify unit init` lock the same file)
+    $specifyDir = Join-Path $repoRoot '.specify'
+    New-Item -ItemType Directory -Path $specifyDir -Force | Out-Null
+    $ignoreFile = Join-Path $specifyDir '.gitignore'
+    if (-not (Test-Path $ignoreFile)) { Set-Content -Path $ignoreFile -Value @('index.json', 'index.lock') }
+    $lockPath = Join-Path $specifyDir 'index.lock'
+    $lock = $null
+    $deadline = (Get-Date).AddSeconds(10)
+    while (-not $lock) {
+        try {
+            $lock = [System.IO.File]::Open($lockPath, 'OpenOrCreate', 'ReadWrite', 'None')
+        } catch [System.IO.IOException] {
+            if ((Get-Date) -ge $deadline) {
+                Write-Error "Error: Timed out waiting for $lockPath"
+                exit 1
+            }
+            Start-Sleep -Milliseconds 20
         }
     }
-}
-$next = $highest + 1
-$testNum = ('{0:000}' -f $next)
-
-$branchName = $testDesc.ToLower() -replace '[^a-z0-9]', '-' -replace '-{2,}', '-' -replace '^-', '' -replace '-$', ''
-$words = ($branchName -split '-') | Where-Object { $_ } | Select-Object -First 3
-$branchName = "$testNum-unit-$([string]::Join('-', $words))"
 
-if ($hasGit) {
     try {
-        git checkout -b $branchName | Out-Null
-    } catch {
-        Write-Warning "Failed to create git branch: $branchName"
-    }
-} else {
-    Write-Warning "[specify-unit] Warning: Git repository not detected; skipped branch creation for $branchName"
-}
+        $highest = Get-HighestNumber -RepoRoot $repoRoot -Kind 'tests'
 
-$testDir = Join-Path $testsDir $branchName
-New-Item -ItemType Directory -Path $testDir -Force | Out-Null
+        $branchName = $testDesc.ToLower() -replace '[^a-z0-9]', '-' -replace '-{2,}', '-' -replace '^-', '' -replace '-$', ''
+        $words = ($branchName -split '-') | Where-Object { $_ } | Select-Object -First 3
 
-$template = Join-Path $repoRoot '.specify/templates/unit-test-template.md'
-$testSpecFile = Join-Path $testDir 'test-spec.md'
-if (Test-Path $template) { 
-    Copy-Item $template $testSpecFile -Force 
-} else { 
-    New-Item -ItemType File -Path $testSpecFile | Out-Null 
+        # Reserve the directory (New-Item fails if it exists); move on to the next number if it is taken
+        $next = $highest + 1
+        while ($true) {
+            $testNum = ('{0:000}' -f $next)
+            $branchName = "$testNum-unit-$([string]::Join('-', $words))"
+            $testDir = Join-Path $testsDir $branchName
+            if (-not (Test-Path $testDir)) {
+                try {
+                    New-Item -ItemType Directory -Path $testDir -ErrorAction Stop | Out-Null
+                    break
+                } catch {
+                    if (-not (Test-Path $testDir)) { throw }
+                }
+            }
+            $next++
+        }
+        # This script does not write the number index (.specify/index.json); drop it so
+        # the next allocation rescans instead of trusting mtimes that may be too coarse
+        Remove-Item -Path (Join-Path $specifyDir 'index.json') -Force -ErrorAction SilentlyContinue
+
+        if ($hasGit) {
+            try {
+                git checkout -b $branchName | Out-Null
+            } catch {
+                Write-Warning "Failed to create git branch: $branchName"
+            }
+        } else {
+            Write-Warning "[specify-unit] Warning: Git repository not detected; skipped branch creation for $branchName"
+        }
+    } finally {
+        $lock.Dispose()
+    }
+
+    $template = Join-Path $repoRoot '.specify/templates/unit-test-template.md'
+    $testSpecFile = Join-Path $testDir 'test-spec.md'
+    if (Test-Path $template) { 
+        Copy-Item $template $testSpecFile -Force 
+    } else { 
+        New-Item -ItemType File -Path $testSpecFile | Out-Null 
+    }
 }
 
 # Set the SPECIFY_UNIT_TEST environment variable for the current session
@@ -7,6 +7,7 @@
 #     "platformdirs",
 #     "readchar",
 #     "httpx",
+#     "pyyaml",
 # ]
 # ///
 """
@@ -24,36 +25,59 @@ Or install globally:
     specify init --here
 """
 
+from __future__ import annotations
+
 import os
 import subprocess
 import sys
 import zipfile
 import tempfile
 import shutil
+import stat
+import io
 import shlex
 import json
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, BinaryIO, Optional, Tuple
 
 import typer
-import httpx
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.text import Text
-from rich.live import Live
 from rich.align import Align
-from rich.table import Table
-from rich.tree import Tree
 from typer.core import TyperGroup
 
-# For cross-platform keyboard input
-import readchar
-import ssl
-import truststore
-
-ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-client = httpx.Client(verify=ssl_context)
+from .cache import TemplateCache, asset_sha256, env_number
+from .extract import ExtractResult, extract_template, read_template
+from .git import GitError, init_repo as git_init_repo, probe as git_probe
+from .tools import CLAUDE_LOCAL_PATH, discover_tools, find_tool
+
+# Heavier dependencies (httpx and truststore via .http_client, readchar, yaml,
+# rich.live/progress/table/tree) are imported where they are used so that `specify --help`,
+# `specify check` and friends don't pay for them at startup.
+if TYPE_CHECKING:
+    import httpx
+
+def get_http_client(skip_tls: bool = False) -> httpx.Client:
+    """Return the shared pooled HTTP client (see specify_cli.http_client)."""
+    from .http_client import get_http_client as shared_client
+    return shared_client(skip_tls)
+
+
+def __getattr__(name: str):
+    # `ssl_context` and `client` used to be built at import time; keep them
+    # available as module attributes, created on first access.
+    if name == "ssl_context":
+        from .http_client import get_ssl_context
+        return get_ssl_context()
+    if name == "client":
+        return get_http_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def _github_token(cli_token: str | None = None) -> str | None:
     """Return sanitized GitHub token (cli arg takes precedence) or None."""
@@ -79,11 +103,58 @@ AI_CHOICES = {
     "auggie": "Auggie CLI",
     "roo": "Roo Code",
 }
+# CLI-based agents whose tool must be installed (GitHub Copilot and Cursor live in IDEs)
+AGENT_TOOL_INSTALL_URLS = {
+    "claude": "https://docs.anthropic.com/en/docs/claude-code/setup",
+    "gemini": "https://github.com/google-gemini/gemini-cli",
+    "qwen": "https://github.com/QwenLM/qwen-code",
+    "opencode": "https://opencode.ai",
+    "codex": "https://github.com/openai/codex",
+    "auggie": "https://docs.augmentcode.com/cli/setup-auggie/install-auggie-cli",
+}
+# Agent folders inside a project (shown in the security notice and used to merge extra agents)
+AGENT_FOLDER_MAP = {
+    "claude": ".claude/",
+    "gemini": ".gemini/",
+    "cursor": ".cursor/",
+    "qwen": ".qwen/",
+    "opencode": ".opencode/",
+    "codex": ".codex/",
+    "windsurf": ".windsurf/",
+    "kilocode": ".kilocode/",
+    "auggie": ".augment/",
+    "copilot": ".github/",
+    "roo": ".roo/"
+}
+# Additional folders some template packages use for the same agent
+AGENT_FOLDER_ALIASES = {
+    "auggie": (".auggie/",),
+}
 # Add script type choices
 SCRIPT_TYPE_CHOICES = {"sh": "POSIX Shell (bash/zsh)", "ps": "PowerShell"}
 
-# Claude CLI local installation path after migrate-installer
-CLAUDE_LOCAL_PATH = Path.home() / ".claude" / "local" / "claude"
+# Default worker count for `specify init --batch`
+BATCH_DEFAULT_JOBS = 4
+
+# Download buffering (SPECIFY_DOWNLOAD_CHUNK_KB / SPECIFY_DOWNLOAD_SPOOL_MB)
+DEFAULT_DOWNLOAD_CHUNK_KB = 64
+DEFAULT_DOWNLOAD_SPOOL_MB = 64
+
+# Tools reported by `specify check`: (executable, label, is an AI agent)
+CHECK_TOOLS = [
+    ("git", "Git version control", False),
+    ("claude", "Claude Code CLI", True),
+    ("gemini", "Gemini CLI", True),
+    ("qwen", "Qwen Code CLI", True),
+    ("code", "Visual Studio Code", False),
+    ("code-insiders", "Visual Studio Code Insiders", False),
+    ("cursor-agent", "Cursor IDE agent", True),
+    ("windsurf", "Windsurf IDE", True),
+    ("kilocode", "Kilo Code IDE", True),
+    ("opencode", "opencode", True),
+    ("codex", "Codex CLI", True),
+    ("auggie", "Auggie CLI", True),
+]
 
 # ASCII Art Banner
 BANNER = """
@@ -96,23 +167,106 @@ BANNER = """
 """
 
 TAGLINE = "GitHub Spec Kit - Spec-Driven Development Toolkit"
+class _Step:
+    """One tracker step; ``line`` caches its rendered markup until the step changes."""
+    __slots__ = ("key", "label", "status", "detail", "tracker", "line")
+
+    def __init__(self, key: str, label: str, status: str = "pending", detail: str = ""):
+        self.key = key
+        self.label = label
+        self.status = status
+        self.detail = detail
+        self.tracker = None  # nested StepTracker, see StepTracker.child
+        self.line = None
+
+    def __getitem__(self, name: str):
+        # Dict-style access (step["status"]) as in the previous list-of-dicts layout
+        return getattr(self, name)
+
+
+_STEP_SYMBOLS = {
+    "done": "[green]●[/green]",
+    "pending": "[green dim]○[/green dim]",
+    "running": "[cyan]○[/cyan]",
+    "error": "[red]●[/red]",
+    "skipped": "[yellow]○[/yellow]",
+}
+
+
+def _step_line(step: _Step) -> str:
+    label = step.label
+    detail_text = step.detail.strip() if step.detail else ""
+    # Circles (unchanged styling)
+    symbol = _STEP_SYMBOLS.get(step.status, " ")
+    if step.status == "pending":
+        # Entire line light gray (pending)
+        if detail_text:
+            return f"{symbol} [bright_black]{label} ({detail_text})[/bright_black]"
+        return f"{symbol} [bright_black]{label}[/bright_black]"
+    # Label white, detail (if any) light gray in parentheses
+    if detail_text:
+        return f"{symbol} [white]{label}[/white] [bright_black]({detail_text})[/bright_black]"
+    return f"{symbol} [white]{label}[/white]"
+
+
 class StepTracker:
     """Track and render hierarchical steps without emojis, similar to Claude Code tree output.
-    Supports live auto-refresh via an attached refresh callback.
+
+    Steps are kept in an insertion-ordered dict keyed by step key, so adding and
+    updating a step is O(1) however many there are. The tracker is a Rich
+    renderable: hand it to ``Live`` and it is redrawn at the Live frame rate
+    rather than on every change, rebuilding only the lines of steps that changed
+    since the last frame. ``child()`` nests a sub-tracker under a step.
     """
-    def __init__(self, title: str):
+    status_order = {"pending": 0, "running": 1, "done": 2, "error": 3, "skipped": 4}
+
+    def __init__(self, title: str, *, parent: "StepTracker | None" = None):
         self.title = title
-        self.steps = []  # list of dicts: {key, label, status, detail}
-        self.status_order = {"pending": 0, "running": 1, "done": 2, "error": 3, "skipped": 4}
+        self._steps: dict[str, _Step] = {}
+        self._parent = parent
+        # One lock per tree: worker threads update steps while Live renders
+        self._lock = parent._lock if parent is not None else threading.RLock()
+        self._version = 0
+        self._rendered = None  # (version, Tree) of the last render
         self._refresh_cb = None  # callable to trigger UI refresh
+        self._refresh_interval = 0.0
+        self._last_refresh = 0.0
+        self._listener = None  # callable(step) on every status change
 
-    def attach_refresh(self, cb):
+    @property
+    def steps(self) -> list[_Step]:
+        with self._lock:
+            return list(self._steps.values())
+
+    def attach_refresh(self, cb, min_interval: float = 0.0):
+        """Call ``cb`` after changes, at most once per ``min_interval`` seconds.
+
+        Not needed with ``Live(tracker)``, which redraws the tracker by itself.
+        """
         self._refresh_cb = cb
+        self._refresh_interval = min_interval
+
+    def attach_listener(self, cb):
+        self._listener = cb
 
     def add(self, key: str, label: str):
-        if key not in [s["key"] for s in self.steps]:
-            self.steps.append({"key": key, "label": label, "status": "pending", "detail": ""})
-            self._maybe_refresh()
+        with self._lock:
+            if key in self._steps:
+                return
+            self._steps[key] = _Step(key, label)
+            self._touch()
+        self._maybe_refresh()
+
+    def child(self, key: str, title: str) -> "StepTracker":
+        """Return the sub-tracker shown under step ``key`` (created on first use)."""
+        with self._lock:
+            step = self._steps.get(key)
+            if step is None:
+                step = self._steps[key] = _Step(key, title)
+            if step.tracker is None:
+                step.tracker = StepTracker(title, parent=self)
+                self._touch()
+            return step.tracker
 
     def start(self, key: str, detail: str = ""):
         self._update(key, status="running", detail=detail)
@@ -127,61 +281,87 @@ class StepTracker:
         self._update(key, status="skipped", detail=detail)
 
     def _update(self, key: str, status: str, detail: str):
-        for s in self.steps:
-            if s["key"] == key:
-                s["status"] = status
+        with self._lock:
+            step = self._steps.get(key)
+            if step is None:
+                # If not present, add it
+                step = self._steps[key] = _Step(key, key, status, detail)
+                changed = True
+            else:
+                changed = step.status != status
+                step.status = status
                 if detail:
-                    s["detail"] = detail
-                self._maybe_refresh()
-                return
-        # If not present, add it
-        self.steps.append({"key": key, "label": key, "status": status, "detail": detail})
+                    step.detail = detail
+                step.line = None
+            self._touch()
+        if changed and self._listener:
+            self._listener(step)
         self._maybe_refresh()
 
+    def _touch(self):
+        tracker = self
+        while tracker is not None:
+            tracker._version += 1
+            tracker = tracker._parent
+
     def _maybe_refresh(self):
-        if self._refresh_cb:
-            try:
-                self._refresh_cb()
-            except Exception:
-                pass
+        if self._refresh_cb is None:
+            return
+        now = time.monotonic()
+        if now - self._last_refresh < self._refresh_interval:
+            return
+        self._last_refresh = now
+        try:
+            self._refresh_cb()
+        except Exception:
+            pass
 
     def render(self):
-        tree = Tree(f"[cyan]{self.title}[/cyan]", guide_style="grey50")
-        for step in self.steps:
-            label = step["label"]
-            detail_text = step["detail"].strip() if step["detail"] else ""
-
-            # Circles (unchanged styling)
-            status = step["status"]
-            if status == "done":
-                symbol = "[green]●[/green]"
-            elif status == "pending":
-                symbol = "[green dim]○[/green dim]"
-            elif status == "running":
-                symbol = "[cyan]○[/cyan]"
-            elif status == "error":
-                symbol = "[red]●[/red]"
-            elif status == "skipped":
-                symbol = "[yellow]○[/yellow]"
-            else:
-                symbol = " "
+        from rich.tree import Tree
+        with self._lock:
+            if self._rendered is not None and self._rendered[0] == self._version:
+                return self._rendered[1]
+            tree = Tree(f"[cyan]{self.title}[/cyan]", guide_style="grey50")
+            for step in self._steps.values():
+                if step.tracker is not None:
+                    # Sub-trackers render as a nested tree titled with the step label
+                    tree.add(step.tracker.render())
+                    continue
+                if step.line is None:
+                    step.line = _step_line(step)
+                tree.add(step.line)
+            self._rendered = (self._version, tree)
+            return tree
 
-            if status == "pending":
-                # Entire line light gray (pending)
-                if detail_text:
-                    line = f"{symbol} [bright_black]{label} ({detail_text})[/bright_black]"
-                else:
-                    line = f"{symbol} [bright_black]{label}[/bright_black]"
-            else:
-                # Label white, detail (if any) light gray in parentheses
-                if detail_text:
-                    line = f"{symbol} [white]{label}[/white] [bright_black]({detail_text})[/bright_black]"
-                else:
-                    line = f"{symbol} [white]{label}[/white]"
+    def __rich__(self):
+        return self.render()
+
+
+class JsonEvents:
+    """NDJSON progress for headless runs: one JSON object per line on stdout.
+
+    Every event has ``event`` and ``t`` (seconds since start); ``step`` events
+    carry the tracker step (key, label, status, detail) after each status change.
+    """
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.started = time.monotonic()
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields):
+        record = {"event": event, "t": round(time.monotonic() - self.started, 3), **fields}
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
 
-            tree.add(line)
-        return tree
+    def step(self, step: _Step):
+        self.emit("step", key=step.key, label=step.label, status=step.status, detail=step.detail or None)
 
+    def done(self, ok: bool, **fields):
+        self.finished = True
+        self.emit("done", ok=ok, **fields)
 
 
 MINI_BANNER = """
@@ -192,6 +372,7 @@ MINI_BANNER = """
 
 def get_key():
     """Get a single keypress in a cross-platform way using readchar."""
+    import readchar
     key = readchar.readkey()
     
     # Arrow keys
@@ -228,6 +409,9 @@ def select_with_arrows(options: dict, prompt_text: str = "Select an option", def
     Returns:
         Selected option key
     """
+    from rich.live import Live
+    from rich.table import Table
+
     option_keys = list(options.keys())
     if default_key and default_key in option_keys:
         selected_index = option_keys.index(default_key)
@@ -295,6 +479,29 @@ def select_with_arrows(options: dict, prompt_text: str = "Select an option", def
 
 
 console = Console()
+# Diagnostics for commands whose stdout is parsed by scripts and agents
+err_console = Console(stderr=True, soft_wrap=True)
+# Set by ``init --json``: failure details are printed as plain text, not panels
+_plain_details = False
+
+
+class TemplateError(typer.Exit):
+    """typer.Exit(1) that keeps the reason, for callers that report it elsewhere (init --json, batch)."""
+
+    def __init__(self, message: str):
+        super().__init__(1)
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def _print_detail(body: str, title: str, border_style: str = "red") -> None:
+    """Show supporting detail for an error: a panel, or plain lines in headless mode."""
+    if _plain_details:
+        console.print(f"{title}:\n{body}", markup=False, highlight=False)
+    else:
+        console.print(Panel(body, title=title, border_style=border_style))
 
 
 class BannerGroup(TyperGroup):
@@ -314,6 +521,24 @@ app = typer.Typer(
     cls=BannerGroup,
 )
 
+# Create a sub-app for template cache maintenance
+cache_app = typer.Typer(
+    name="cache",
+    help="Inspect and maintain the local template cache",
+)
+
+# Create a sub-app for the spec workflow scripts
+feature_app = typer.Typer(
+    name="feature",
+    help="Spec workflow commands (in-process versions of the scripts the slash commands run)",
+)
+
+# Create a sub-app for the feature/test number index
+index_app = typer.Typer(
+    name="index",
+    help="Maintain the .specify/index.json number allocator",
+)
+
 # Create a sub-app for unit testing commands
 unit_app = typer.Typer(
     name="unit",
@@ -369,7 +594,7 @@ def run_command(cmd: list[str], check_return: bool = True, capture: bool = False
 
 def check_tool_for_tracker(tool: str, tracker: StepTracker) -> bool:
     """Check if a tool is installed and update tracker."""
-    if shutil.which(tool):
+    if find_tool(tool):
         tracker.complete(tool, "available")
         return True
     else:
@@ -378,100 +603,152 @@ def check_tool_for_tracker(tool: str, tracker: StepTracker) -> bool:
 
 
 def check_tool(tool: str, install_hint: str) -> bool:
-    """Check if a tool is installed."""
-    
-    # Special handling for Claude CLI after `claude migrate-installer`
-    # See: https://github.com/github/spec-kit/issues/123
-    # The migrate-installer command REMOVES the original executable from PATH
-    # and creates an alias at ~/.claude/local/claude instead
-    # This path should be prioritized over other claude executables in PATH
-    if tool == "claude":
-        if CLAUDE_LOCAL_PATH.exists() and CLAUDE_LOCAL_PATH.is_file():
-            return True
-    
-    if shutil.which(tool):
-        return True
-    else:
-        return False
+    """Check if a tool is installed (PATH plus known install locations, see tools.py)."""
+    return find_tool(tool) is not None
 
 
 def is_git_repo(path: Path = None) -> bool:
     """Check if the specified path is inside a git repository."""
-    if path is None:
-        path = Path.cwd()
-    
-    if not path.is_dir():
-        return False
-
-    try:
-        # Use git command to check if inside a work tree
-        subprocess.run(
-            ["git", "rev-parse", "--is-inside-work-tree"],
-            check=True,
-            capture_output=True,
-            cwd=path,
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    return git_probe(path if path is not None else Path.cwd()).inside_work_tree
 
 
-def init_git_repo(project_path: Path, quiet: bool = False) -> bool:
-    """Initialize a git repository in the specified path.
+def init_git_repo(project_path: Path, quiet: bool = False, *, paths: list[str] | None = None) -> bool:
+    """Initialize a git repository in the specified path and commit its files.
     quiet: if True suppress console output (tracker handles status)
+    paths: stage only these paths (relative to project_path) instead of the whole tree
     """
+    if not quiet:
+        console.print("[cyan]Initializing git repository...[/cyan]")
     try:
-        original_cwd = Path.cwd()
-        os.chdir(project_path)
-        if not quiet:
-            console.print("[cyan]Initializing git repository...[/cyan]")
-        subprocess.run(["git", "init"], check=True, capture_output=True)
-        subprocess.run(["git", "add", "."], check=True, capture_output=True)
-        subprocess.run(["git", "commit", "-m", "Initial commit from Specify template"], check=True, capture_output=True)
-        if not quiet:
-            console.print("[green]✓[/green] Git repository initialized")
-        return True
-        
-    except subprocess.CalledProcessError as e:
+        git_init_repo(project_path, paths=paths)
+    except (GitError, OSError) as e:
         if not quiet:
             console.print(f"[red]Error initializing git repository:[/red] {e}")
         return False
-    finally:
-        os.chdir(original_cwd)
+    if not quiet:
+        console.print("[green]✓[/green] Git repository initialized")
+    return True
+
+
+def template_paths(project_path: Path) -> list[str] | None:
+    """Files written from the template (per .specify/install-state.json), or None if unknown."""
+    from .upgrade import STATE_PATH, load_install_state
+
+    state = load_install_state(project_path)
+    if state is None:
+        return None
+    return sorted(p for p in state.files if (project_path / p).exists()) + [STATE_PATH]
+
+
+def _git_step(project_path: Path, tracker: StepTracker, *, no_git: bool, git_available: bool, template_only: bool = False) -> None:
+    """Run the tracker's "git" step: detect an existing repo or create one."""
+    if no_git:
+        tracker.skip("git", "--no-git flag")
+        return
+    tracker.start("git")
+    found = git_probe(project_path)
+    if found.inside_work_tree:
+        tracker.complete("git", "existing repo detected")
+    elif not (git_available and found.available):
+        tracker.skip("git", "git not available")
+    else:
+        paths = template_paths(project_path) if template_only else None
+        if init_git_repo(project_path, quiet=True, paths=paths):
+            tracker.complete("git", "initialized" + (f", {len(paths)} template files committed" if paths is not None else ""))
+        else:
+            tracker.error("git", "init failed")
 
 
-def download_template_from_github(ai_assistant: str, download_dir: Path, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: httpx.Client = None, debug: bool = False, github_token: str = None, repo_owner: str = None, repo_name: str = None) -> Tuple[Path, dict]:
+def _repo_or_default(repo_owner: str | None, repo_name: str | None) -> Tuple[str, str]:
+    """Fill in the default repository (SPECIFY_REPO_OWNER/NAME or github/spec-kit)."""
+    return (
+        repo_owner or os.getenv("SPECIFY_REPO_OWNER") or "github",
+        repo_name or os.getenv("SPECIFY_REPO_NAME") or "spec-kit",
+    )
+
+
+def fetch_release_data(client: httpx.Client, api_url: str, *, debug: bool = False, github_token: str = None, cache: TemplateCache | None = None) -> Tuple[dict, str]:
+    """Fetch release JSON from the GitHub API, conditionally when a stored copy exists.
+
+    Returns (release_data, source) where source is "network", "not modified"
+    (answered by a 304) or "cached" (stored copy within SPECIFY_RELEASE_TTL).
+    """
+    stored = cache.get_release(api_url) if cache is not None else None
+    if stored is not None and cache.release_is_fresh(stored):
+        return stored.data, "cached"
+
+    headers = _github_auth_headers(github_token)
+    if stored is not None:
+        if stored.etag:
+            headers["If-None-Match"] = stored.etag
+        if stored.last_modified:
+            headers["If-Modified-Since"] = stored.last_modified
+
+    response = client.get(
+        api_url,
+        follow_redirects=True,
+        headers=headers,
+    )
+    status = response.status_code
+    if status == 304 and stored is not None:
+        # Refresh fetched_at so the TTL window restarts
+        try:
+            cache.put_release(api_url, stored.data, stored.etag, stored.last_modified)
+        except OSError:
+            pass
+        return stored.data, "not modified"
+    if status != 200:
+        msg = f"GitHub API returned {status} for {api_url}"
+        if debug:
+            msg += f"\nResponse headers: {response.headers}\nBody (truncated 500): {response.text[:500]}"
+        raise RuntimeError(msg)
+    try:
+        release_data = response.json()
+    except ValueError as je:
+        raise RuntimeError(f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}")
+
+    if cache is not None:
+        try:
+            cache.put_release(api_url, release_data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        except OSError:
+            pass
+    return release_data, "network"
+
+
+def download_template_from_github(ai_assistant: str, download_dir: Path | None, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: httpx.Client = None, debug: bool = False, github_token: str = None, repo_owner: str = None, repo_name: str = None, cache: TemplateCache | None = None, in_memory: bool = False, spool_max_size: int | None = None, chunk_size: int | None = None, release_data: dict | None = None) -> Tuple[Path | BinaryIO, dict]:
+    """Resolve the latest release asset and return (zip_path, metadata).
+
+    With a ``cache`` the archive is served from / stored into the template cache;
+    ``metadata["cached"]`` is then True and the caller must not delete zip_path.
+    With ``in_memory`` nothing is written to download_dir: the archive is buffered
+    in a spooled temp file (spilling to disk above ``spool_max_size`` bytes) and,
+    unless it went into the cache, that open buffer is returned instead of a path
+    (``metadata["in_memory"]``); the caller closes it.
+    Downloads into the cache or download_dir go through a ``.part`` file that is
+    resumed with a Range request if a previous run was interrupted; the result
+    is checked against the asset's size and published SHA-256.
+    A ``release_data`` already fetched by the caller skips the release lookup.
+    """
     # Allow custom repository, default to official spec-kit
-    repo_owner = repo_owner or os.getenv("SPECIFY_REPO_OWNER") or "github"
-    repo_name = repo_name or os.getenv("SPECIFY_REPO_NAME") or "spec-kit"
+    repo_owner, repo_name = _repo_or_default(repo_owner, repo_name)
     if client is None:
-        client = httpx.Client(verify=ssl_context)
-    
-    if verbose:
-        console.print("[cyan]Fetching latest release information...[/cyan]")
-    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+        client = get_http_client()
     
-    try:
-        response = client.get(
-            api_url,
-            timeout=30,
-            follow_redirects=True,
-            headers=_github_auth_headers(github_token),
-        )
-        status = response.status_code
-        if status != 200:
-            msg = f"GitHub API returned {status} for {api_url}"
-            if debug:
-                msg += f"\nResponse headers: {response.headers}\nBody (truncated 500): {response.text[:500]}"
-            raise RuntimeError(msg)
+    if release_data is not None:
+        release_source = "shared"
+    else:
+        if verbose:
+            console.print("[cyan]Fetching latest release information...[/cyan]")
+        api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+        
         try:
-            release_data = response.json()
-        except ValueError as je:
-            raise RuntimeError(f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}")
-    except Exception as e:
-        console.print(f"[red]Error fetching release information[/red]")
-        console.print(Panel(str(e), title="Fetch Error", border_style="red"))
-        raise typer.Exit(1)
+            release_data, release_source = fetch_release_data(client, api_url, debug=debug, github_token=github_token, cache=cache)
+        except Exception as e:
+            console.print(f"[red]Error fetching release information[/red]")
+            _print_detail(str(e), "Fetch Error")
+            raise TemplateError(f"Error fetching release information: {e}")
+        if verbose and release_source != "network":
+            console.print(f"[cyan]Release information:[/cyan] {release_source}")
     
     # Find the template asset for the specified AI assistant
     assets = release_data.get("assets", [])
@@ -486,107 +763,207 @@ def download_template_from_github(ai_assistant: str, download_dir: Path, *, scri
     if asset is None:
         console.print(f"[red]No matching release asset found[/red] for [bold]{ai_assistant}[/bold] (expected pattern: [bold]{pattern}[/bold])")
         asset_names = [a.get('name', '?') for a in assets]
-        console.print(Panel("\n".join(asset_names) or "(no assets)", title="Available Assets", border_style="yellow"))
-        raise typer.Exit(1)
+        _print_detail("\n".join(asset_names) or "(no assets)", "Available Assets", "yellow")
+        raise TemplateError(f"No matching release asset found for {ai_assistant} (expected pattern: {pattern})")
 
     download_url = asset["browser_download_url"]
     filename = asset["name"]
     file_size = asset["size"]
+    release_tag = release_data["tag_name"]
+    repo_slug = f"{repo_owner}/{repo_name}"
+    expected_sha256 = asset_sha256(asset)
     
     if verbose:
         console.print(f"[cyan]Found template:[/cyan] {filename}")
         console.print(f"[cyan]Size:[/cyan] {file_size:,} bytes")
-        console.print(f"[cyan]Release:[/cyan] {release_data['tag_name']}")
+        console.print(f"[cyan]Release:[/cyan] {release_tag}")
+
+    metadata = {
+        "filename": filename,
+        "size": file_size,
+        "release": release_tag,
+        "asset_url": download_url,
+        "sha256": expected_sha256,
+        "cached": False,
+        "cache_hit": False,
+        "release_source": release_source,
+    }
+
+    if cache is not None:
+        try:
+            cached_path = cache.lookup(repo_slug, release_tag, filename, expected_sha256)
+        except OSError:
+            cached_path = None
+        if cached_path is not None:
+            if verbose:
+                console.print(f"[cyan]Using cached template:[/cyan] {cached_path}")
+            metadata.update(sha256=cached_path.stem, cached=True, cache_hit=True)
+            return cached_path, metadata
+
+    from .download import DEFAULT_RESUME_ATTEMPTS, IntegrityError, check_integrity, fetch_resumable
+
+    if chunk_size is None:
+        chunk_size = int(env_number("SPECIFY_DOWNLOAD_CHUNK_KB", DEFAULT_DOWNLOAD_CHUNK_KB) * 1024)
+    attempts = int(env_number("SPECIFY_DOWNLOAD_RESUME_ATTEMPTS", DEFAULT_RESUME_ATTEMPTS))
+    zip_path = None if in_memory else download_dir / filename
+
+    # Downloads go to a .part file (in the cache, else next to zip_path) that a
+    # later run can resume; without either, a spooled buffer resumes within this run.
+    part_path = None
+    if cache is not None:
+        part_path = cache.partial_path(repo_slug, release_tag, filename)
+    elif zip_path is not None:
+        part_path = zip_path.with_name(f"{filename}.part")
+    sink = None
+    if part_path is not None:
+        try:
+            part_path.parent.mkdir(parents=True, exist_ok=True)
+            sink = open(part_path, "ab+")
+        except OSError as e:
+            if debug:
+                console.print(f"[yellow]Cannot write {part_path}:[/yellow] {e}")
+            if zip_path is not None:
+                raise
+            part_path = None
+    if sink is None:
+        # Small archives stay in memory; larger ones spill to an anonymous temp file
+        if spool_max_size is None:
+            spool_max_size = int(env_number("SPECIFY_DOWNLOAD_SPOOL_MB", DEFAULT_DOWNLOAD_SPOOL_MB) * 1024 * 1024)
+        sink = tempfile.SpooledTemporaryFile(max_size=spool_max_size)
 
-    zip_path = download_dir / filename
     if verbose:
-        console.print(f"[cyan]Downloading template...[/cyan]")
-    
-    try:
-        with client.stream(
-            "GET",
+        resume_at = sink.seek(0, os.SEEK_END)
+        if resume_at:
+            console.print(f"[cyan]Resuming download at {resume_at:,} bytes...[/cyan]")
+        else:
+            console.print(f"[cyan]Downloading template...[/cyan]")
+
+    def download(on_progress=None) -> tuple[str, int, int]:
+        return fetch_resumable(
+            client,
             download_url,
-            timeout=60,
-            follow_redirects=True,
+            sink,
             headers=_github_auth_headers(github_token),
-        ) as response:
-            if response.status_code != 200:
-                body_sample = response.text[:400]
-                raise RuntimeError(f"Download failed with {response.status_code}\nHeaders: {response.headers}\nBody (truncated): {body_sample}")
-            total_size = int(response.headers.get('content-length', 0))
-            with open(zip_path, 'wb') as f:
-                if total_size == 0:
-                    for chunk in response.iter_bytes(chunk_size=8192):
-                        f.write(chunk)
-                else:
-                    if show_progress:
-                        with Progress(
-                            SpinnerColumn(),
-                            TextColumn("[progress.description]{task.description}"),
-                            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                            console=console,
-                        ) as progress:
-                            task = progress.add_task("Downloading...", total=total_size)
-                            downloaded = 0
-                            for chunk in response.iter_bytes(chunk_size=8192):
-                                f.write(chunk)
-                                downloaded += len(chunk)
-                                progress.update(task, completed=downloaded)
-                    else:
-                        for chunk in response.iter_bytes(chunk_size=8192):
-                            f.write(chunk)
+            expected_size=file_size or None,
+            chunk_size=chunk_size,
+            attempts=attempts,
+            on_progress=on_progress,
+        )
+
+    try:
+        if show_progress:
+            from rich.progress import Progress, SpinnerColumn, TextColumn
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                console=console,
+            ) as progress:
+                task = progress.add_task("Downloading...", total=file_size or None)
+                actual_sha256, actual_size, resumed_from = download(lambda done, total: progress.update(task, completed=done, total=total))
+        else:
+            actual_sha256, actual_size, resumed_from = download()
+        check_integrity(filename, actual_size, actual_sha256, expected_size=file_size or None, expected_sha256=expected_sha256)
     except Exception as e:
         console.print(f"[red]Error downloading template[/red]")
         detail = str(e)
-        if zip_path.exists():
-            zip_path.unlink()
-        console.print(Panel(detail, title="Download Error", border_style="red"))
-        raise typer.Exit(1)
+        sink.close()
+        if part_path is not None:
+            if isinstance(e, IntegrityError):
+                # Corrupt, not merely incomplete: start over next time
+                part_path.unlink(missing_ok=True)
+            elif part_path.exists() and part_path.stat().st_size:
+                detail += f"\n\nPartial download kept at {part_path}; run the command again to resume."
+        _print_detail(detail, "Download Error")
+        raise TemplateError(f"Error downloading template: {detail}")
+    if verbose:
+        console.print(f"Downloaded: {filename}" + (f" (resumed at {resumed_from:,} bytes)" if resumed_from else ""))
+    metadata["sha256"] = actual_sha256
+    metadata["resumed_from"] = resumed_from
+
+    if part_path is None:
+        sink.seek(0)
+        metadata["in_memory"] = True
+        return sink, metadata
+    sink.close()
+
+    if cache is not None:
+        try:
+            entry = cache.store(part_path, repo_slug, release_tag, filename, actual_sha256)
+        except (OSError, ValueError) as e:
+            # Cache not writable: fall back to the downloaded archive
+            if debug:
+                console.print(f"[yellow]Template cache unavailable:[/yellow] {e}")
+        else:
+            metadata["cached"] = True
+            return cache.blob_path(entry.sha256), metadata
+
+    if zip_path is None:
+        # Only reachable when the cache could not index the archive; the caller deletes it
+        return part_path, metadata
+    os.replace(part_path, zip_path)
+    return zip_path, metadata
+
+
+def _version_key(name: str) -> tuple:
+    """Sort key for release-style file names (v1.0.10 sorts after v1.0.9)."""
+    match = re.search(r"v?(\d+(?:\.\d+)*)\.zip$", name)
+    return tuple(int(p) for p in match.group(1).split(".")) if match else ()
+
+
+def resolve_local_template(source: Path, ai_assistant: str, *, script_type: str = "sh", verbose: bool = True) -> Tuple[Path, dict]:
+    """Resolve a template archive from a local zip or a mirror directory.
+
+    A mirror directory uses the ``.genreleases`` layout written by
+    create-release-packages.sh; the newest ``spec-kit-template-{ai}-{script}*.zip``
+    is used. The returned archive belongs to the caller's source and is never deleted.
+    """
+    source = source.expanduser()
+    pattern = f"spec-kit-template-{ai_assistant}-{script_type}"
+    if source.is_file():
+        zip_path = source
+    elif source.is_dir():
+        matching = sorted(
+            (p for p in source.iterdir() if p.name.startswith(pattern) and p.name.endswith(".zip") and p.is_file()),
+            key=lambda p: (_version_key(p.name), p.name),
+        )
+        if not matching:
+            console.print(f"[red]No matching template found[/red] in [bold]{source}[/bold] (expected pattern: [bold]{pattern}*.zip[/bold])")
+            available = sorted(p.name for p in source.glob("*.zip"))
+            _print_detail("\n".join(available) or "(no archives)", "Available Archives", "yellow")
+            raise TemplateError(f"No matching template found in {source} (expected pattern: {pattern}*.zip)")
+        zip_path = matching[-1]
+    else:
+        console.print(f"[red]Template source not found:[/red] {source}")
+        raise TemplateError(f"Template source not found: {source}")
+
+    if not zipfile.is_zipfile(zip_path):
+        console.print(f"[red]Not a zip archive:[/red] {zip_path}")
+        raise TemplateError(f"Not a zip archive: {zip_path}")
+
+    version = _version_key(zip_path.name)
+    release = "v" + ".".join(str(p) for p in version) if version else "local"
     if verbose:
-        console.print(f"Downloaded: {filename}")
+        console.print(f"[cyan]Using local template:[/cyan] {zip_path}")
     metadata = {
-        "filename": filename,
-        "size": file_size,
-        "release": release_data["tag_name"],
-        "asset_url": download_url
+        "filename": zip_path.name,
+        "size": zip_path.stat().st_size,
+        "release": release,
+        "asset_url": zip_path.resolve().as_uri(),
+        "sha256": None,
+        "cached": False,
+        "cache_hit": False,
+        "release_source": "local",
+        "local": True,
     }
     return zip_path, metadata
 
 
-def download_and_extract_template(project_path: Path, ai_assistant: str, script_type: str, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, github_token: str = None, repo_owner: str = None, repo_name: str = None) -> Path:
-    """Download the latest release and extract it to create a new project.
-    Returns project_path. Uses tracker if provided (with keys: fetch, download, extract, cleanup)
+def extract_archive(archive: Path | BinaryIO, project_path: Path, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, debug: bool = False) -> ExtractResult:
+    """Extract a template archive (path or open binary file) into project_path.
+    Uses tracker if provided (with keys: extract, zip-list, extracted-summary, flatten).
+    On failure a newly created project directory is removed and typer.Exit is raised.
     """
-    current_dir = Path.cwd()
-    
-    # Step: fetch + download combined
-    if tracker:
-        tracker.start("fetch", "contacting GitHub API")
-    try:
-        zip_path, meta = download_template_from_github(
-            ai_assistant,
-            current_dir,
-            script_type=script_type,
-            verbose=verbose and tracker is None,
-            show_progress=(tracker is None),
-            client=client,
-            debug=debug,
-            github_token=github_token,
-            repo_owner=repo_owner,
-            repo_name=repo_name
-        )
-        if tracker:
-            tracker.complete("fetch", f"release {meta['release']} ({meta['size']:,} bytes)")
-            tracker.add("download", "Download template")
-            tracker.complete("download", meta['filename'])
-    except Exception as e:
-        if tracker:
-            tracker.error("fetch", str(e))
-        else:
-            if verbose:
-                console.print(f"[red]Error downloading template:[/red] {e}")
-        raise
-    
     if tracker:
         tracker.add("extract", "Extract template")
         tracker.start("extract")
@@ -598,7 +975,7 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
         if not is_current_dir:
             project_path.mkdir(parents=True)
         
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        with zipfile.ZipFile(archive, 'r') as zip_ref:
             # List all files in the ZIP for debugging
             zip_contents = zip_ref.namelist()
             if tracker:
@@ -607,82 +984,34 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
             elif verbose:
                 console.print(f"[cyan]ZIP contains {len(zip_contents)} items[/cyan]")
             
-            # For current directory, extract to a temp location first
-            if is_current_dir:
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    temp_path = Path(temp_dir)
-                    zip_ref.extractall(temp_path)
-                    
-                    # Check what was extracted
-                    extracted_items = list(temp_path.iterdir())
-                    if tracker:
-                        tracker.start("extracted-summary")
-                        tracker.complete("extracted-summary", f"temp {len(extracted_items)} items")
-                    elif verbose:
-                        console.print(f"[cyan]Extracted {len(extracted_items)} items to temp location[/cyan]")
-                    
-                    # Handle GitHub-style ZIP with a single root directory
-                    source_dir = temp_path
-                    if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                        source_dir = extracted_items[0]
-                        if tracker:
-                            tracker.add("flatten", "Flatten nested directory")
-                            tracker.complete("flatten")
-                        elif verbose:
-                            console.print(f"[cyan]Found nested directory structure[/cyan]")
-                    
-                    # Copy contents to current directory
-                    for item in source_dir.iterdir():
-                        dest_path = project_path / item.name
-                        if item.is_dir():
-                            if dest_path.exists():
-                                if verbose and not tracker:
-                                    console.print(f"[yellow]Merging directory:[/yellow] {item.name}")
-                                # Recursively copy directory contents
-                                for sub_item in item.rglob('*'):
-                                    if sub_item.is_file():
-                                        rel_path = sub_item.relative_to(item)
-                                        dest_file = dest_path / rel_path
-                                        dest_file.parent.mkdir(parents=True, exist_ok=True)
-                                        shutil.copy2(sub_item, dest_file)
-                            else:
-                                shutil.copytree(item, dest_path)
-                        else:
-                            if dest_path.exists() and verbose and not tracker:
-                                console.print(f"[yellow]Overwriting file:[/yellow] {item.name}")
-                            shutil.copy2(item, dest_path)
-                    if verbose and not tracker:
-                        console.print(f"[cyan]Template files merged into current directory[/cyan]")
+            # Stream members straight to their final path; a GitHub-style
+            # single root directory is stripped on the fly
+            result = extract_template(zip_ref, project_path)
+
+        if tracker:
+            tracker.start("extracted-summary")
+            if result.existing:
+                summary = f"{result.created} new, {result.updated} updated, {result.unchanged} unchanged"
             else:
-                # Extract directly to project directory (original behavior)
-                zip_ref.extractall(project_path)
-                
-                # Check what was extracted
-                extracted_items = list(project_path.iterdir())
-                if tracker:
-                    tracker.start("extracted-summary")
-                    tracker.complete("extracted-summary", f"{len(extracted_items)} top-level items")
-                elif verbose:
-                    console.print(f"[cyan]Extracted {len(extracted_items)} items to {project_path}:[/cyan]")
-                    for item in extracted_items:
-                        console.print(f"  - {item.name} ({'dir' if item.is_dir() else 'file'})")
-                
-                # Handle GitHub-style ZIP with a single root directory
-                if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                    # Move contents up one level
-                    nested_dir = extracted_items[0]
-                    temp_move_dir = project_path.parent / f"{project_path.name}_temp"
-                    # Move the nested directory contents to temp location
-                    shutil.move(str(nested_dir), str(temp_move_dir))
-                    # Remove the now-empty project directory
-                    project_path.rmdir()
-                    # Rename temp directory to project directory
-                    shutil.move(str(temp_move_dir), str(project_path))
-                    if tracker:
-                        tracker.add("flatten", "Flatten nested directory")
-                        tracker.complete("flatten")
-                    elif verbose:
-                        console.print(f"[cyan]Flattened nested directory structure[/cyan]")
+                summary = f"{len(result.top_level)} top-level items, {result.files} files"
+            tracker.complete("extracted-summary", summary)
+            if result.flattened:
+                tracker.add("flatten", "Flatten nested directory")
+                tracker.complete("flatten")
+        elif verbose:
+            console.print(f"[cyan]Extracted {len(result.top_level)} items to {project_path}:[/cyan]")
+            for name in result.top_level:
+                kind = 'dir' if (project_path / name).is_dir() else 'file'
+                if name in result.existing:
+                    console.print(f"  - {name} ({kind}, {'merged' if kind == 'dir' else 'overwritten'})")
+                else:
+                    console.print(f"  - {name} ({kind})")
+            if result.existing:
+                console.print(f"[cyan]Files: {result.created} new, {result.updated} updated, {result.unchanged} unchanged[/cyan]")
+            if result.flattened:
+                console.print(f"[cyan]Flattened nested directory structure[/cyan]")
+            if is_current_dir:
+                console.print(f"[cyan]Template files merged into current directory[/cyan]")
                     
     except Exception as e:
         if tracker:
@@ -691,19 +1020,122 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
             if verbose:
                 console.print(f"[red]Error extracting template:[/red] {e}")
                 if debug:
-                    console.print(Panel(str(e), title="Extraction Error", border_style="red"))
+                    _print_detail(str(e), "Extraction Error")
         # Clean up project directory if created and not current directory
         if not is_current_dir and project_path.exists():
             shutil.rmtree(project_path)
-        raise typer.Exit(1)
+        raise TemplateError(f"Error extracting template: {e}")
     else:
         if tracker:
             tracker.complete("extract")
+    return result
+
+
+def prune_cache(cache: TemplateCache | None) -> None:
+    """Apply the cache size and age limits once a command is done with its archives."""
+    if cache is None:
+        return
+    try:
+        cache.prune()
+    except Exception:
+        pass  # a locked or unwritable cache must not fail the command
+
+
+def record_install_state(project_path: Path, ai_assistants: list[str], script_type: str, meta: dict, hashes: dict[str, str], *, repo_owner: str = None, repo_name: str = None) -> None:
+    """Write .specify/install-state.json, the baseline ``specify upgrade`` merges against.
+
+    A failed write is not fatal to init; the project just cannot be upgraded in place.
+    """
+    from .upgrade import InstallState, save_install_state
+
+    local = bool(meta.get("local"))
+    state = InstallState(
+        release=meta["release"],
+        ai=list(ai_assistants),
+        script=script_type,
+        files=hashes,
+        repo=None if local else "/".join(_repo_or_default(repo_owner, repo_name)),
+        source="local" if local else "github",
+        installed_at=datetime.now().astimezone().isoformat(timespec="seconds"),
+    )
+    try:
+        save_install_state(project_path, state)
+    except OSError:
+        pass
+
+
+def download_and_extract_template(project_path: Path, ai_assistant: str, script_type: str, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, github_token: str = None, repo_owner: str = None, repo_name: str = None, cache: TemplateCache | None = None, template_source: Path | None = None) -> Path:
+    """Download the latest release and extract it to create a new project.
+    Returns project_path. Uses tracker if provided (with keys: fetch, download, extract, cleanup)
+    With template_source (zip or mirror directory) no network access is made.
+    Downloads are buffered in memory (see download_template_from_github), so no
+    archive is left in the working directory if the run is interrupted.
+    """
+    # Step: fetch + download combined
+    if tracker:
+        tracker.start("fetch", "reading local template" if template_source else "contacting GitHub API")
+    try:
+        if template_source is not None:
+            zip_path, meta = resolve_local_template(
+                template_source,
+                ai_assistant,
+                script_type=script_type,
+                verbose=verbose and tracker is None,
+            )
+        else:
+            zip_path, meta = download_template_from_github(
+                ai_assistant,
+                None,
+                script_type=script_type,
+                verbose=verbose and tracker is None,
+                show_progress=(tracker is None),
+                client=client,
+                debug=debug,
+                github_token=github_token,
+                repo_owner=repo_owner,
+                repo_name=repo_name,
+                cache=cache,
+                in_memory=True,
+            )
+        if tracker:
+            fetch_detail = f"release {meta['release']} ({meta['size']:,} bytes)"
+            if meta["release_source"] != "network":
+                fetch_detail += f", {meta['release_source']}"
+            tracker.complete("fetch", fetch_detail)
+            tracker.add("download", "Download template")
+            if meta.get("local"):
+                tracker.skip("download", f"{meta['filename']} (local)")
+            else:
+                if meta["cache_hit"]:
+                    download_detail = f"{meta['filename']} (cached)"
+                elif meta.get("resumed_from"):
+                    download_detail = f"{meta['filename']} (resumed at {meta['resumed_from']:,} bytes)"
+                else:
+                    download_detail = meta['filename']
+                tracker.complete("download", download_detail)
+    except Exception as e:
+        if tracker:
+            tracker.error("fetch", str(e))
+        else:
+            if verbose:
+                console.print(f"[red]Error downloading template:[/red] {e}")
+        raise
+    
+    try:
+        result = extract_archive(zip_path, project_path, is_current_dir, verbose=verbose, tracker=tracker, debug=debug)
+        record_install_state(project_path, [ai_assistant], script_type, meta, result.hashes, repo_owner=repo_owner, repo_name=repo_name)
     finally:
         if tracker:
             tracker.add("cleanup", "Remove temporary archive")
-        # Clean up downloaded ZIP file
-        if zip_path.exists():
+        # Clean up downloaded ZIP file (cached and local archives are kept)
+        if meta.get("in_memory"):
+            zip_path.close()
+            if tracker:
+                tracker.complete("cleanup", "in-memory archive released")
+        elif meta["cached"] or meta.get("local"):
+            if tracker:
+                tracker.skip("cleanup", "archive kept in cache" if meta["cached"] else "local archive kept")
+        elif zip_path.exists():
             zip_path.unlink()
             if tracker:
                 tracker.complete("cleanup")
@@ -713,52 +1145,183 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
     return project_path
 
 
+def agent_folders(ai_assistant: str) -> tuple[str, ...]:
+    """Top-level folder names that belong to one agent in a template archive."""
+    folders = (AGENT_FOLDER_MAP.get(ai_assistant, ""),) + AGENT_FOLDER_ALIASES.get(ai_assistant, ())
+    return tuple(f.rstrip("/") for f in folders if f)
+
+
+def download_and_extract_templates(project_path: Path, ai_assistants: list[str], script_type: str, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, github_token: str = None, repo_owner: str = None, repo_name: str = None, cache: TemplateCache | None = None, template_source: Path | None = None) -> Path:
+    """Set up a project for several agents in one pass.
+
+    The release is looked up once and every agent's archive is fetched
+    concurrently over ``client``; writes to the shared ``cache`` are serialized
+    by its lock. The first agent's archive is extracted in full;
+    the others only contribute their agent folders (see agent_folders), so the
+    shared ``.specify/`` and ``scripts/`` trees are written once.
+    """
+    if len(ai_assistants) == 1:
+        return download_and_extract_template(project_path, ai_assistants[0], script_type, is_current_dir, verbose=verbose, tracker=tracker, client=client, debug=debug, github_token=github_token, repo_owner=repo_owner, repo_name=repo_name, cache=cache, template_source=template_source)
+
+    if client is None and template_source is None:
+        client = get_http_client()
+    if tracker:
+        tracker.start("fetch", "reading local templates" if template_source else "contacting GitHub API")
+
+    release_data = None
+    release_source = "local"
+    resolved: list[Tuple[Path | BinaryIO, dict]] = []
+    try:
+        if template_source is None:
+            repo_owner, repo_name = _repo_or_default(repo_owner, repo_name)
+            api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+            try:
+                release_data, release_source = fetch_release_data(client, api_url, debug=debug, github_token=github_token, cache=cache)
+            except Exception as e:
+                if not tracker:
+                    _print_detail(str(e), "Fetch Error")
+                raise
+
+        def fetch(ai: str) -> Tuple[Path | BinaryIO, dict]:
+            if template_source is not None:
+                return resolve_local_template(template_source, ai, script_type=script_type, verbose=False)
+            return download_template_from_github(
+                ai, None, script_type=script_type, verbose=False, show_progress=False,
+                client=client, debug=debug, github_token=github_token, repo_owner=repo_owner,
+                repo_name=repo_name, cache=cache, in_memory=True, release_data=release_data,
+            )
+
+        if verbose and not tracker:
+            console.print(f"[cyan]Fetching {len(ai_assistants)} templates...[/cyan]")
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=len(ai_assistants)) as pool:
+            futures = [pool.submit(fetch, ai) for ai in ai_assistants]
+            failure = None
+            for future in futures:
+                try:
+                    resolved.append(future.result())
+                except Exception as e:
+                    failure = failure or e
+        if failure is not None:
+            raise failure
+    except Exception as e:
+        for archive, meta in resolved:
+            if meta.get("in_memory"):
+                archive.close()
+        if tracker:
+            tracker.error("fetch", str(e) or "failed")
+        elif verbose:
+            console.print(f"[red]Error downloading templates:[/red] {e}")
+        raise
+
+    primary_meta = resolved[0][1]
+    if tracker:
+        fetch_detail = f"release {primary_meta['release']}"
+        if release_source != "network":
+            fetch_detail += f", {release_source}"
+        tracker.complete("fetch", fetch_detail)
+        tracker.add("download", "Download template")
+        hits = sum(1 for _, meta in resolved if meta["cache_hit"] or meta.get("local"))
+        tracker.complete("download", f"{len(resolved)} templates" + (f", {hits} local/cached" if hits else ""))
+
+    try:
+        result = extract_archive(resolved[0][0], project_path, is_current_dir, verbose=verbose, tracker=tracker, debug=debug)
+        installed = dict(result.hashes)
+        for ai, (archive, meta) in zip(ai_assistants[1:], resolved[1:]):
+            key = f"merge-{ai}"
+            if tracker:
+                tracker.add(key, f"Merge {AI_CHOICES[ai]} files")
+                tracker.start(key)
+            try:
+                with zipfile.ZipFile(archive, 'r') as zip_ref:
+                    result = extract_template(zip_ref, project_path, only=agent_folders(ai))
+            except Exception as e:
+                if tracker:
+                    tracker.error(key, str(e))
+                elif verbose:
+                    console.print(f"[red]Error merging {ai} template:[/red] {e}")
+                if not is_current_dir and project_path.exists():
+                    shutil.rmtree(project_path)
+                raise typer.Exit(1)
+            installed.update(result.hashes)
+            if tracker:
+                if result.existing:
+                    tracker.complete(key, f"{result.created} new, {result.updated} updated, {result.unchanged} unchanged")
+                else:
+                    tracker.complete(key, f"{result.files} files")
+            elif verbose:
+                console.print(f"[cyan]Merged {result.files} {ai} files[/cyan]")
+        record_install_state(project_path, ai_assistants, script_type, primary_meta, installed, repo_owner=repo_owner, repo_name=repo_name)
+    finally:
+        for archive, meta in resolved:
+            if meta.get("in_memory"):
+                archive.close()
+        if tracker:
+            tracker.add("cleanup", "Remove temporary archive")
+            tracker.complete("cleanup", "archives released")
+
+    return project_path
+
+
 def ensure_executable_scripts(project_path: Path, tracker: StepTracker | None = None) -> None:
-    """Ensure POSIX .sh scripts under scripts/ directories have execute bits (no-op on Windows)."""
+    """Ensure POSIX .sh scripts under scripts/ directories have execute bits (no-op on Windows).
+
+    Extraction already applies the modes stored in the archive, so this is
+    normally a check: one scandir walk whose cached entries are enough to skip
+    scripts that are already executable; only the rest are opened (to look for
+    a ``#!`` line) and chmod-ed.
+    """
     if os.name == "nt":
         return  # Windows: skip silently
     
     # Check both .specify/scripts and scripts/ directories
-    script_dirs = [
-        project_path / ".specify" / "scripts",
-        project_path / "scripts"
+    pending = [
+        str(project_path / ".specify" / "scripts"),
+        str(project_path / "scripts"),
     ]
     
     failures: list[str] = []
     updated = 0
     total_checked = 0
     
-    for scripts_root in script_dirs:
-        if not scripts_root.is_dir():
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                entries = list(it)
+        except OSError:
             continue
-            
-        for script in scripts_root.rglob("*.sh"):
-            total_checked += 1
+        for entry in entries:
             try:
-                if script.is_symlink() or not script.is_file():
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                    continue
+                if not entry.name.endswith(".sh"):
                     continue
+                total_checked += 1
+                if not entry.is_file(follow_symlinks=False):
+                    continue  # symlinks and special files are left alone
+                mode = entry.stat(follow_symlinks=False).st_mode
+                if mode & 0o111:
+                    continue  # Already executable
                 try:
-                    with script.open("rb") as f:
+                    with open(entry.path, "rb") as f:
                         if f.read(2) != b"#!":
                             continue
-                except Exception:
+                except OSError:
                     continue
-                st = script.stat(); mode = st.st_mode
-                if mode & 0o111:
-                    continue  # Already executable
                 new_mode = mode
                 if mode & 0o400: new_mode |= 0o100
                 if mode & 0o040: new_mode |= 0o010
                 if mode & 0o004: new_mode |= 0o001
                 if not (new_mode & 0o100):
                     new_mode |= 0o100
-                os.chmod(script, new_mode)
+                os.chmod(entry.path, stat.S_IMODE(new_mode))
                 updated += 1
-            except Exception as e:
+            except OSError as e:
                 try:
-                    rel_path = script.relative_to(project_path)
+                    rel_path = Path(entry.path).relative_to(project_path)
                 except ValueError:
-                    rel_path = script.name
+                    rel_path = entry.name
                 failures.append(f"{rel_path}: {e}")
     
     if tracker:
@@ -776,19 +1339,57 @@ def ensure_executable_scripts(project_path: Path, tracker: StepTracker | None =
             for f in failures:
                 console.print(f"  - {f}")
 
-@app.command()
-def init(
-    project_name: str = typer.Argument(None, help="Name for your new project directory (optional if using --here, or use '.' for current directory)"),
-    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant to use: claude, gemini, copilot, cursor, qwen, opencode, codex, windsurf, kilocode, or auggie"),
-    script_type: str = typer.Option(None, "--script", help="Script type to use: sh or ps"),
-    ignore_agent_tools: bool = typer.Option(False, "--ignore-agent-tools", help="Skip checks for AI agent tools like Claude Code"),
-    no_git: bool = typer.Option(False, "--no-git", help="Skip git repository initialization"),
-    here: bool = typer.Option(False, "--here", help="Initialize project in the current directory instead of creating a new one"),
-    force: bool = typer.Option(False, "--force", help="Force merge/overwrite when using --here (skip confirmation)"),
-    skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
+def _resolve_repo(repo: str | None) -> Tuple[str | None, str | None]:
+    """Return (owner, name) from --repo or SPECIFY_REPO; (None, None) means the default repo."""
+    if repo:
+        repo_parts = repo.split('/')
+        if len(repo_parts) != 2:
+            console.print(f"[red]Error:[/red] Repository must be in format 'owner/repo', got: {repo}")
+            raise typer.Exit(1)
+        console.print(f"[cyan]Using custom repository:[/cyan] {repo}")
+        return repo_parts[0], repo_parts[1]
+    elif os.getenv("SPECIFY_REPO"):
+        repo_env = os.getenv("SPECIFY_REPO")
+        repo_parts = repo_env.split('/')
+        if len(repo_parts) == 2:
+            console.print(f"[cyan]Using repository from SPECIFY_REPO:[/cyan] {repo_env}")
+            return repo_parts[0], repo_parts[1]
+    return None, None
+
+
+def _resolve_template_source(template_from: str | None) -> Path | None:
+    """Return the local template source from --from or SPECIFY_TEMPLATE_MIRROR, if any."""
+    mirror_env = (os.getenv("SPECIFY_TEMPLATE_MIRROR") or "").strip()
+    if not (template_from or mirror_env):
+        return None
+    template_source = Path(template_from or mirror_env).expanduser()
+    if not template_source.exists():
+        console.print(f"[red]Error:[/red] Template source not found: {template_source}")
+        raise typer.Exit(1)
+    console.print(f"[cyan]Using local templates from {'--from' if template_from else 'SPECIFY_TEMPLATE_MIRROR'}:[/cyan] {template_source}")
+    return template_source
+
+
+@app.command()
+def init(
+    ctx: typer.Context,
+    project_name: str = typer.Argument(None, help="Name for your new project directory (optional if using --here, or use '.' for current directory)"),
+    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant to use: claude, gemini, copilot, cursor, qwen, opencode, codex, windsurf, kilocode, or auggie (comma-separate several, e.g. claude,gemini)"),
+    script_type: str = typer.Option(None, "--script", help="Script type to use: sh or ps"),
+    ignore_agent_tools: bool = typer.Option(False, "--ignore-agent-tools", help="Skip checks for AI agent tools like Claude Code"),
+    no_git: bool = typer.Option(False, "--no-git", help="Skip git repository initialization"),
+    here: bool = typer.Option(False, "--here", help="Initialize project in the current directory instead of creating a new one"),
+    force: bool = typer.Option(False, "--force", help="Force merge/overwrite when using --here (skip confirmation)"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
     debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network and extraction failures"),
     github_token: str = typer.Option(None, "--github-token", help="GitHub token to use for API requests (or set GH_TOKEN or GITHUB_TOKEN environment variable)"),
     repo: str = typer.Option(None, "--repo", help="Custom GitHub repository in format 'owner/repo' (default: github/spec-kit, or set SPECIFY_REPO env var)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always download the template instead of using the local template cache"),
+    template_from: str = typer.Option(None, "--from", help="Use a local template zip or mirror directory instead of GitHub (or set SPECIFY_TEMPLATE_MIRROR)"),
+    batch: Path = typer.Option(None, "--batch", help="Initialize every project listed in a YAML/JSON manifest (--ai/--script/--repo act as defaults)"),
+    jobs: int = typer.Option(BATCH_DEFAULT_JOBS, "--jobs", "-j", help="Worker threads used by --batch"),
+    commit_template_only: bool = typer.Option(False, "--commit-template-only", help="Stage only the files written from the template in the initial git commit instead of the whole directory (faster for large --here directories)"),
+    as_json: bool = typer.Option(False, "--json", help="Headless mode: no prompts or rich output; print one NDJSON event per step to stdout (requires --ai)"),
 ):
     """
     Initialize a new Specify project from the latest template.
@@ -819,13 +1420,61 @@ def init(
         specify init --here --ai codex
         specify init --here
         specify init --here --force  # Skip confirmation when current directory not empty
+        specify init my-project --ai claude --no-cache  # Bypass the template cache
+        specify init my-project --ai claude --from ./.genreleases  # Offline, from a mirror directory
+        specify init --batch services.yaml --jobs 8  # Many projects, one download per template
+        specify init --here --ai claude,gemini,copilot  # Several agents in one pass
+        specify init my-project --ai claude --json  # NDJSON progress for automation
     """
-    # Show banner first
-    show_banner()
-    
-    # Show version info
-    console.print(f"[dim]Specify CLI version {VERSION}[/dim]")
-    console.print()
+    events = None
+    if as_json:
+        # stdout carries only NDJSON; messages go to stderr as plain text and
+        # are repeated in the final "done" event if the run fails
+        global _plain_details
+        _plain_details = True
+        events = JsonEvents()
+        console.file = sys.stderr
+        console.no_color = True
+        console.soft_wrap = True
+        console.record = True
+
+        def report_failure():
+            if not events.finished:
+                events.done(False, error=console.export_text(clear=False).strip() or "initialization failed")
+
+        ctx.call_on_close(report_failure)
+    else:
+        # Show banner first
+        show_banner()
+
+        # Show version info
+        console.print(f"[dim]Specify CLI version {VERSION}[/dim]")
+        console.print()
+
+    if batch is not None:
+        if as_json:
+            console.print("Error: --json cannot be combined with --batch")
+            raise typer.Exit(1)
+        if project_name or here:
+            console.print("[red]Error:[/red] --batch cannot be combined with a project name or --here (set 'here' per manifest entry)")
+            raise typer.Exit(1)
+        _init_batch(
+            batch,
+            jobs=jobs,
+            default_ai=ai_assistant,
+            default_script=script_type,
+            default_repo=_resolve_repo(repo),
+            ignore_agent_tools=ignore_agent_tools,
+            no_git=no_git,
+            commit_template_only=commit_template_only,
+            force=force,
+            skip_tls=skip_tls,
+            debug=debug,
+            github_token=github_token,
+            cache=None if no_cache else TemplateCache(),
+            template_source=_resolve_template_source(template_from),
+        )
+        return
     
     # Handle '.' as shorthand for current directory (equivalent to --here)
     if project_name == ".":
@@ -853,6 +1502,9 @@ def init(
             console.print("[yellow]Template files will be merged with existing content and may overwrite existing files[/yellow]")
             if force:
                 console.print("[cyan]--force supplied: skipping confirmation and proceeding with merge[/cyan]")
+            elif as_json:
+                console.print("[red]Error:[/red] Current directory is not empty; pass --force to merge in --json mode")
+                raise typer.Exit(1)
             else:
                 # Ask for confirmation
                 response = typer.confirm("Do you want to continue?")
@@ -863,6 +1515,9 @@ def init(
         project_path = Path(project_name).resolve()
         # Check if project directory already exists
         if project_path.exists():
+            if as_json:
+                console.print(f"Error: Directory '{project_name}' already exists")
+                raise typer.Exit(1)
             error_panel = Panel(
                 f"Directory '[cyan]{project_name}[/cyan]' already exists\n"
                 "Please choose a different project name or remove the existing directory.",
@@ -888,7 +1543,8 @@ def init(
     if not here:
         setup_lines.append(f"{'Target Path':<15} [dim]{project_path}[/dim]")
     
-    console.print(Panel("\n".join(setup_lines), border_style="cyan", padding=(1, 2)))
+    if not as_json:
+        console.print(Panel("\n".join(setup_lines), border_style="cyan", padding=(1, 2)))
     
     # Check git only if we might need it (not --no-git)
     # Only set to True if the user wants it and the tool is available
@@ -898,63 +1554,46 @@ def init(
         if not should_init_git:
             console.print("[yellow]Git not found - will skip repository initialization[/yellow]")
 
-    # AI assistant selection
+    # AI assistant selection (a comma-separated list sets up several agents)
     if ai_assistant:
-        if ai_assistant not in AI_CHOICES:
-            console.print(f"[red]Error:[/red] Invalid AI assistant '{ai_assistant}'. Choose from: {', '.join(AI_CHOICES.keys())}")
+        selected_ais = list(dict.fromkeys(a.strip() for a in ai_assistant.split(",") if a.strip()))
+        invalid = [a for a in selected_ais if a not in AI_CHOICES]
+        if invalid or not selected_ais:
+            console.print(f"[red]Error:[/red] Invalid AI assistant '{', '.join(invalid) or ai_assistant}'. Choose from: {', '.join(AI_CHOICES.keys())}")
             raise typer.Exit(1)
-        selected_ai = ai_assistant
+    elif as_json:
+        console.print(f"[red]Error:[/red] --ai is required with --json. Choose from: {', '.join(AI_CHOICES.keys())}")
+        raise typer.Exit(1)
     else:
         # Use arrow-key selection interface
-        selected_ai = select_with_arrows(
+        selected_ais = [select_with_arrows(
             AI_CHOICES, 
             "Choose your AI assistant:", 
             "copilot"
-        )
+        )]
+    selected_ai = selected_ais[0]
     
     # Check agent tools unless ignored
     if not ignore_agent_tools:
-        agent_tool_missing = False
-        install_url = ""
-        if selected_ai == "claude":
-            if not check_tool("claude", "https://docs.anthropic.com/en/docs/claude-code/setup"):
-                install_url = "https://docs.anthropic.com/en/docs/claude-code/setup"
-                agent_tool_missing = True
-        elif selected_ai == "gemini":
-            if not check_tool("gemini", "https://github.com/google-gemini/gemini-cli"):
-                install_url = "https://github.com/google-gemini/gemini-cli"
-                agent_tool_missing = True
-        elif selected_ai == "qwen":
-            if not check_tool("qwen", "https://github.com/QwenLM/qwen-code"):
-                install_url = "https://github.com/QwenLM/qwen-code"
-                agent_tool_missing = True
-        elif selected_ai == "opencode":
-            if not check_tool("opencode", "https://opencode.ai"):
-                install_url = "https://opencode.ai"
-                agent_tool_missing = True
-        elif selected_ai == "codex":
-            if not check_tool("codex", "https://github.com/openai/codex"):
-                install_url = "https://github.com/openai/codex"
-                agent_tool_missing = True
-        elif selected_ai == "auggie":
-            if not check_tool("auggie", "https://docs.augmentcode.com/cli/setup-auggie/install-auggie-cli"):
-                install_url = "https://docs.augmentcode.com/cli/setup-auggie/install-auggie-cli"
-                agent_tool_missing = True
-        # GitHub Copilot and Cursor checks are not needed as they're typically available in supported IDEs
-
-        if agent_tool_missing:
-            error_panel = Panel(
-                f"[cyan]{selected_ai}[/cyan] not found\n"
-                f"Install with: [cyan]{install_url}[/cyan]\n"
-                f"{AI_CHOICES[selected_ai]} is required to continue with this project type.\n\n"
-                "Tip: Use [cyan]--ignore-agent-tools[/cyan] to skip this check",
-                title="[red]Agent Detection Error[/red]",
-                border_style="red",
-                padding=(1, 2)
-            )
-            console.print()
-            console.print(error_panel)
-            raise typer.Exit(1)
+        for agent in selected_ais:
+            install_url = AGENT_TOOL_INSTALL_URLS.get(agent, "")
+            # GitHub Copilot and Cursor checks are not needed as they're typically available in supported IDEs
+            if install_url and not check_tool(agent, install_url):
+                if as_json:
+                    console.print(f"Error: {agent} not found (install with {install_url}, or pass --ignore-agent-tools)")
+                    raise typer.Exit(1)
+                error_panel = Panel(
+                    f"[cyan]{agent}[/cyan] not found\n"
+                    f"Install with: [cyan]{install_url}[/cyan]\n"
+                    f"{AI_CHOICES[agent]} is required to continue with this project type.\n\n"
+                    "Tip: Use [cyan]--ignore-agent-tools[/cyan] to skip this check",
+                    title="[red]Agent Detection Error[/red]",
+                    border_style="red",
+                    padding=(1, 2)
+                )
+                console.print()
+                console.print(error_panel)
+                raise typer.Exit(1)
     
     # Determine script type (explicit, interactive, or OS default)
     if script_type:
@@ -966,41 +1605,34 @@ def init(
         # Auto-detect default
         default_script = "ps" if os.name == "nt" else "sh"
         # Provide interactive selection similar to AI if stdin is a TTY
-        if sys.stdin.isatty():
+        if sys.stdin.isatty() and not as_json:
             selected_script = select_with_arrows(SCRIPT_TYPE_CHOICES, "Choose script type (or press Enter)", default_script)
         else:
             selected_script = default_script
     
-    console.print(f"[cyan]Selected AI assistant:[/cyan] {selected_ai}")
-    console.print(f"[cyan]Selected script type:[/cyan] {selected_script}")
+    if not as_json:
+        console.print(f"[cyan]Selected AI assistant:[/cyan] {', '.join(selected_ais)}")
+        console.print(f"[cyan]Selected script type:[/cyan] {selected_script}")
     
     # Parse custom repository if provided
-    custom_repo_owner = None
-    custom_repo_name = None
-    if repo:
-        repo_parts = repo.split('/')
-        if len(repo_parts) != 2:
-            console.print(f"[red]Error:[/red] Repository must be in format 'owner/repo', got: {repo}")
-            raise typer.Exit(1)
-        custom_repo_owner, custom_repo_name = repo_parts
-        console.print(f"[cyan]Using custom repository:[/cyan] {repo}")
-    elif os.getenv("SPECIFY_REPO"):
-        repo_env = os.getenv("SPECIFY_REPO")
-        repo_parts = repo_env.split('/')
-        if len(repo_parts) == 2:
-            custom_repo_owner, custom_repo_name = repo_parts
-            console.print(f"[cyan]Using repository from SPECIFY_REPO:[/cyan] {repo_env}")
+    custom_repo_owner, custom_repo_name = _resolve_repo(repo)
     
+    # Local template source (offline / air-gapped hosts)
+    template_source = _resolve_template_source(template_from)
+
     # Download and set up project
     # New tree-based progress (no emojis); include earlier substeps
     tracker = StepTracker("Initialize Specify Project")
+    if events:
+        events.emit("start", project=project_path.name, path=str(project_path), here=here, ai=selected_ais, script=selected_script, version=VERSION)
+        tracker.attach_listener(events.step)
     # Flag to allow suppressing legacy headings
     sys._specify_tracker_active = True
     # Pre steps recorded as completed before live rendering
     tracker.add("precheck", "Check required tools")
     tracker.complete("precheck", "ok")
     tracker.add("ai-select", "Select AI assistant")
-    tracker.complete("ai-select", f"{selected_ai}")
+    tracker.complete("ai-select", ", ".join(selected_ais))
     tracker.add("script-select", "Select script type")
     tracker.complete("script-select", selected_script)
     for key, label in [
@@ -1016,76 +1648,72 @@ def init(
     ]:
         tracker.add(key, label)
 
-    # Use transient so live tree is replaced by the final static render (avoids duplicate output)
-    with Live(tracker.render(), console=console, refresh_per_second=8, transient=True) as live:
-        tracker.attach_refresh(lambda: live.update(tracker.render()))
+    def run_steps():
         try:
-            # Create a httpx client with verify based on skip_tls
-            verify = not skip_tls
-            local_ssl_context = ssl_context if verify else False
-            local_client = httpx.Client(verify=local_ssl_context)
+            # Shared pooled client, with verify based on skip_tls (not needed for local templates)
+            local_client = get_http_client(skip_tls) if template_source is None else None
 
-            download_and_extract_template(project_path, selected_ai, selected_script, here, verbose=False, tracker=tracker, client=local_client, debug=debug, github_token=github_token, repo_owner=custom_repo_owner, repo_name=custom_repo_name)
+            template_cache = None if no_cache else TemplateCache()
+            download_and_extract_templates(project_path, selected_ais, selected_script, here, verbose=False, tracker=tracker, client=local_client, debug=debug, github_token=github_token, repo_owner=custom_repo_owner, repo_name=custom_repo_name, cache=template_cache, template_source=template_source)
+            prune_cache(template_cache)
 
             # Ensure scripts are executable (POSIX)
             ensure_executable_scripts(project_path, tracker=tracker)
 
             # Git step
-            if not no_git:
-                tracker.start("git")
-                if is_git_repo(project_path):
-                    tracker.complete("git", "existing repo detected")
-                elif should_init_git:
-                    if init_git_repo(project_path, quiet=True):
-                        tracker.complete("git", "initialized")
-                    else:
-                        tracker.error("git", "init failed")
-                else:
-                    tracker.skip("git", "git not available")
-            else:
-                tracker.skip("git", "--no-git flag")
+            _git_step(project_path, tracker, no_git=no_git, git_available=should_init_git, template_only=commit_template_only)
 
             tracker.complete("final", "project ready")
+        except typer.Exit as e:
+            # Helpers exit after printing why; TemplateError carries the reason itself
+            reason = getattr(e, "message", None)
+            if not reason and events:
+                reason = console.export_text(clear=False).strip()
+            fail(reason or "initialization failed")
         except Exception as e:
-            tracker.error("final", str(e))
-            console.print(Panel(f"Initialization failed: {e}", title="Failure", border_style="red"))
-            if debug:
-                _env_pairs = [
-                    ("Python", sys.version.split()[0]),
-                    ("Platform", sys.platform),
-                    ("CWD", str(Path.cwd())),
-                ]
-                _label_width = max(len(k) for k, _ in _env_pairs)
-                env_lines = [f"{k.ljust(_label_width)} → [bright_black]{v}[/bright_black]" for k, v in _env_pairs]
-                console.print(Panel("\n".join(env_lines), title="Debug Environment", border_style="magenta"))
-            if not here and project_path.exists():
-                shutil.rmtree(project_path)
-            raise typer.Exit(1)
-        finally:
-            # Force final render
-            pass
+            fail(str(e) or type(e).__name__)
+
+    def fail(reason: str):
+        tracker.error("final", reason)
+        if events:
+            events.done(False, error=reason)
+        else:
+            console.print(Panel(f"Initialization failed: {reason}", title="Failure", border_style="red"))
+        if debug and not events:
+            _env_pairs = [
+                ("Python", sys.version.split()[0]),
+                ("Platform", sys.platform),
+                ("CWD", str(Path.cwd())),
+            ]
+            _label_width = max(len(k) for k, _ in _env_pairs)
+            env_lines = [f"{k.ljust(_label_width)} → [bright_black]{v}[/bright_black]" for k, v in _env_pairs]
+            console.print(Panel("\n".join(env_lines), title="Debug Environment", border_style="magenta"))
+        if not here and project_path.exists():
+            shutil.rmtree(project_path)
+        raise typer.Exit(1)
+
+    if events:
+        # Headless: no Live display, progress goes out as step events
+        run_steps()
+        from .upgrade import load_install_state
+        state = load_install_state(project_path)
+        events.done(True, project=project_path.name, path=str(project_path), ai=selected_ais, script=selected_script, release=state.release if state else None, files=len(state.files) if state else None)
+        return
+
+    # Use transient so live tree is replaced by the final static render (avoids duplicate output)
+    from rich.live import Live
+    # Live redraws the tracker at its frame rate; step updates only mark it dirty
+    with Live(tracker, console=console, refresh_per_second=8, transient=True):
+        run_steps()
 
     # Final static tree (ensures finished state visible after Live context ends)
     console.print(tracker.render())
     console.print("\n[bold green]Project ready.[/bold green]")
     
     # Agent folder security notice
-    agent_folder_map = {
-        "claude": ".claude/",
-        "gemini": ".gemini/",
-        "cursor": ".cursor/",
-        "qwen": ".qwen/",
-        "opencode": ".opencode/",
-        "codex": ".codex/",
-        "windsurf": ".windsurf/",
-        "kilocode": ".kilocode/",
-        "auggie": ".augment/",
-        "copilot": ".github/",
-        "roo": ".roo/"
-    }
-    
-    if selected_ai in agent_folder_map:
-        agent_folder = agent_folder_map[selected_ai]
+    agent_folders_used = [AGENT_FOLDER_MAP[a] for a in selected_ais if a in AGENT_FOLDER_MAP]
+    if agent_folders_used:
+        agent_folder = ", ".join(agent_folders_used)
         security_notice = Panel(
             f"Some agents may store credentials, auth tokens, or other identifying and private artifacts in the agent folder within your project.\n"
             f"Consider adding [cyan]{agent_folder}[/cyan] (or parts of it) to [cyan].gitignore[/cyan] to prevent accidental credential leakage.",
@@ -1106,7 +1734,7 @@ def init(
         step_num = 2
 
     # Add Codex-specific setup step if needed
-    if selected_ai == "codex":
+    if "codex" in selected_ais:
         codex_path = project_path / ".codex"
         quoted_path = shlex.quote(str(codex_path))
         if os.name == "nt":  # Windows
@@ -1139,7 +1767,7 @@ def init(
     console.print()
     console.print(enhancements_panel)
 
-    if selected_ai == "codex":
+    if "codex" in selected_ais:
         warning_text = """[bold yellow]Important Note:[/bold yellow]
 
 Custom prompts do not yet support arguments in Codex. You may need to manually specify additional project instructions directly in prompt files located in [cyan].codex/prompts/[/cyan].
@@ -1150,248 +1778,799 @@ For more information, see: [cyan]https://github.com/openai/codex/issues/2890[/cy
         console.print()
         console.print(warning_panel)
 
+@dataclass
+class BatchProject:
+    """One entry of a `specify init --batch` manifest."""
+    name: str
+    path: Path
+    ai: str
+    script: str
+    here: bool
+    repo_owner: str | None
+    repo_name: str | None
+    tracker: StepTracker = None
+
+    @property
+    def asset_key(self) -> tuple:
+        return (self.repo_owner, self.repo_name, self.ai, self.script)
+
+
+def load_batch_manifest(manifest_path: Path, *, default_ai: str | None = None, default_script: str | None = None, default_repo: Tuple[str | None, str | None] = (None, None)) -> list[BatchProject]:
+    """Parse a YAML/JSON batch manifest into BatchProject entries.
+
+    The manifest is either a list of projects or a mapping with optional
+    ``defaults`` and a ``projects`` list. Each project takes ``name`` (required),
+    ``path``, ``ai``, ``script``, ``here`` and ``repo`` keys. Raises ValueError
+    describing every invalid entry.
+    """
+    import yaml
+
+    text = manifest_path.read_text(encoding="utf-8")
+    try:
+        data = json.loads(text) if manifest_path.suffix.lower() == ".json" else yaml.safe_load(text)
+    except (ValueError, yaml.YAMLError) as e:
+        raise ValueError(f"Could not parse {manifest_path}: {e}")
+
+    defaults = {}
+    if isinstance(data, dict):
+        defaults = data.get("defaults") or {}
+        data = data.get("projects")
+    if not isinstance(data, list) or not data:
+        raise ValueError("Manifest must contain a non-empty list of projects")
+
+    projects: list[BatchProject] = []
+    errors: list[str] = []
+    seen: dict[Path, str] = {}
+    for index, raw in enumerate(data, start=1):
+        if isinstance(raw, str):
+            raw = {"name": raw}
+        if not isinstance(raw, dict) or not raw.get("name"):
+            errors.append(f"#{index}: each project needs a 'name'")
+            continue
+        entry = {**defaults, **raw}
+        name = str(entry["name"])
+        ai = entry.get("ai") or default_ai
+        script = entry.get("script") or default_script or ("ps" if os.name == "nt" else "sh")
+        if ai not in AI_CHOICES:
+            errors.append(f"{name}: invalid or missing ai '{ai}' (choose from: {', '.join(AI_CHOICES)})")
+            continue
+        if script not in SCRIPT_TYPE_CHOICES:
+            errors.append(f"{name}: invalid script type '{script}' (choose from: {', '.join(SCRIPT_TYPE_CHOICES)})")
+            continue
+        repo_owner, repo_name = default_repo
+        if entry.get("repo"):
+            repo_parts = str(entry["repo"]).split("/")
+            if len(repo_parts) != 2:
+                errors.append(f"{name}: repository must be in format 'owner/repo', got: {entry['repo']}")
+                continue
+            repo_owner, repo_name = repo_parts
+        path = Path(str(entry.get("path") or name)).expanduser().resolve()
+        if path in seen:
+            errors.append(f"{name}: target {path} is also used by {seen[path]}")
+            continue
+        seen[path] = name
+        projects.append(BatchProject(name=name, path=path, ai=ai, script=script, here=bool(entry.get("here", False)), repo_owner=repo_owner, repo_name=repo_name))
+
+    if errors:
+        raise ValueError("\n".join(errors))
+    return projects
+
+
+def _init_batch(manifest_path: Path, *, jobs: int, default_ai: str | None, default_script: str | None, default_repo: Tuple[str | None, str | None], ignore_agent_tools: bool, no_git: bool, commit_template_only: bool, force: bool, skip_tls: bool, debug: bool, github_token: str | None, cache: TemplateCache | None, template_source: Path | None) -> None:
+    """Initialize every project of a batch manifest.
+
+    Each distinct release and (repo, ai, script) asset is resolved once, then the
+    projects are extracted concurrently by a bounded thread pool.
+    """
+    try:
+        projects = load_batch_manifest(manifest_path, default_ai=default_ai, default_script=default_script, default_repo=default_repo)
+    except (OSError, ValueError) as e:
+        console.print(Panel(str(e), title="[red]Invalid Batch Manifest[/red]", border_style="red", padding=(1, 2)))
+        raise typer.Exit(1)
+
+    # Validate every target up front; no interactive confirmation in batch mode
+    conflicts = []
+    for project in projects:
+        if project.here:
+            if not project.path.is_dir():
+                conflicts.append(f"{project.name}: directory {project.path} does not exist")
+            elif not force and any(project.path.iterdir()):
+                conflicts.append(f"{project.name}: directory {project.path} is not empty (use --force to merge)")
+        elif project.path.exists():
+            conflicts.append(f"{project.name}: directory {project.path} already exists")
+    if conflicts:
+        console.print(Panel("\n".join(conflicts), title="[red]Directory Conflict[/red]", border_style="red", padding=(1, 2)))
+        raise typer.Exit(1)
+
+    # Tool checks once for the whole batch
+    should_init_git = False
+    if not no_git:
+        should_init_git = check_tool("git", "https://git-scm.com/downloads")
+        if not should_init_git:
+            console.print("[yellow]Git not found - will skip repository initialization[/yellow]")
+    if not ignore_agent_tools:
+        missing = sorted(
+            ai for ai in {p.ai for p in projects}
+            if ai in AGENT_TOOL_INSTALL_URLS and not check_tool(ai, AGENT_TOOL_INSTALL_URLS[ai])
+        )
+        if missing:
+            lines = [f"[cyan]{ai}[/cyan] not found - install with: [cyan]{AGENT_TOOL_INSTALL_URLS[ai]}[/cyan]" for ai in missing]
+            lines.append("\nTip: Use [cyan]--ignore-agent-tools[/cyan] to skip this check")
+            console.print(Panel("\n".join(lines), title="[red]Agent Detection Error[/red]", border_style="red", padding=(1, 2)))
+            raise typer.Exit(1)
+
+    jobs = max(1, jobs)
+    console.print(Panel(
+        "\n".join([
+            "[cyan]Specify Batch Setup[/cyan]",
+            "",
+            f"{'Manifest':<15} [dim]{manifest_path}[/dim]",
+            f"{'Projects':<15} [green]{len(projects)}[/green]",
+            f"{'Templates':<15} [green]{len({p.asset_key for p in projects})}[/green]",
+            f"{'Workers':<15} [green]{jobs}[/green]",
+        ]),
+        border_style="cyan",
+        padding=(1, 2),
+    ))
+
+    view = StepTracker(f"Initialize {len(projects)} Specify projects")
+    resolve_tracker = view.child("resolve", "Resolve templates")
+    for project in projects:
+        project.tracker = view.child(f"project:{project.name}", project.name)
+        for key, label in [
+            ("fetch", "Resolve template"),
+            ("extract", "Extract template"),
+            ("zip-list", "Archive contents"),
+            ("extracted-summary", "Extraction summary"),
+            ("chmod", "Ensure scripts executable"),
+            ("git", "Initialize git repository"),
+            ("final", "Finalize"),
+        ]:
+            project.tracker.add(key, label)
+
+    asset_keys = sorted({p.asset_key for p in projects}, key=lambda k: tuple(str(part) for part in k))
+    repos = sorted({(owner, name) for owner, name, _, _ in asset_keys}, key=str)
+    releases: dict[tuple, dict | Exception] = {}
+    archives: dict[tuple, Tuple[bytes | Path, dict] | Exception] = {}
+
+    def repo_label(owner, name) -> str:
+        return "/".join(_repo_or_default(owner, name))
+
+    def fetch_release(owner, name):
+        key = f"release:{repo_label(owner, name)}"
+        resolve_tracker.start(key)
+        api_url = f"https://api.github.com/repos/{repo_label(owner, name)}/releases/latest"
+        try:
+            data, source = fetch_release_data(local_client, api_url, debug=debug, github_token=github_token, cache=cache)
+        except Exception as e:
+            resolve_tracker.error(key, str(e))
+            return e
+        resolve_tracker.complete(key, f"{data.get('tag_name', '?')}" + (f", {source}" if source != "network" else ""))
+        return data
+
+    def fetch_asset(asset_key):
+        owner, name, ai, script = asset_key
+        key = f"asset:{repo_label(owner, name)}:{ai}-{script}"
+        resolve_tracker.start(key)
+        try:
+            if template_source is not None:
+                archive, meta = resolve_local_template(template_source, ai, script_type=script, verbose=False)
+            else:
+                release = releases[(owner, name)]
+                if isinstance(release, Exception):
+                    raise RuntimeError(f"release lookup failed: {release}")
+                archive, meta = download_template_from_github(
+                    ai, None, script_type=script, verbose=False, show_progress=False,
+                    client=local_client, debug=debug, github_token=github_token,
+                    repo_owner=owner, repo_name=name, cache=cache, in_memory=True, release_data=release,
+                )
+                if meta.get("in_memory"):
+                    # Shared by several workers, so keep the bytes rather than one file object
+                    with archive:
+                        archive = archive.read()
+        except Exception as e:
+            resolve_tracker.error(key, str(e) or "failed")
+            return e
+        detail = meta["filename"]
+        if meta["cache_hit"]:
+            detail += " (cached)"
+        elif meta.get("local"):
+            detail += " (local)"
+        resolve_tracker.complete(key, detail)
+        return archive, meta
+
+    def build_project(project: BatchProject) -> bool:
+        tracker = project.tracker
+        resolved = archives[project.asset_key]
+        if isinstance(resolved, Exception):
+            tracker.error("fetch", "template unavailable")
+            tracker.skip("git", "initialization failed")
+            tracker.error("final", "skipped")
+            return False
+        archive, meta = resolved
+        tracker.complete("fetch", f"{meta['filename']} ({meta['release']})")
+        try:
+            result = extract_archive(io.BytesIO(archive) if isinstance(archive, bytes) else archive, project.path, project.here, verbose=False, tracker=tracker, debug=debug)
+            owner, name, ai, script = project.asset_key
+            record_install_state(project.path, [ai], script, meta, result.hashes, repo_owner=owner, repo_name=name)
+            ensure_executable_scripts(project.path, tracker=tracker)
+        except Exception as e:
+            tracker.skip("git", "initialization failed")
+            tracker.error("final", str(e) or "extraction failed")
+            return False
+        # Git runs with git -C, so projects can be committed concurrently
+        _git_step(project.path, tracker, no_git=no_git, git_available=should_init_git, template_only=commit_template_only)
+        tracker.complete("final", "project ready")
+        return True
+
+    if template_source is None:
+        for owner, name in repos:
+            resolve_tracker.add(f"release:{repo_label(owner, name)}", f"Release {repo_label(owner, name)}")
+    for owner, name, ai, script in asset_keys:
+        resolve_tracker.add(f"asset:{repo_label(owner, name)}:{ai}-{script}", f"Template {ai}-{script}")
+
+    from concurrent.futures import ThreadPoolExecutor
+    from rich.live import Live
+
+    # Local templates (--from) never touch the network
+    local_client = get_http_client(skip_tls) if template_source is None else None
+    results: dict[str, bool] = {}
+    with Live(view, console=console, refresh_per_second=8, transient=True):
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            if template_source is None:
+                releases.update(zip(repos, pool.map(lambda r: fetch_release(*r), repos)))
+            archives.update(zip(asset_keys, pool.map(fetch_asset, asset_keys)))
+            for project, ok in zip(projects, pool.map(build_project, projects)):
+                results[project.name] = ok
+    prune_cache(cache)
+
+    console.print(view)
+    failed = [name for name, ok in results.items() if not ok]
+    ready = len(projects) - len(failed)
+    console.print(f"\n[bold green]{ready} of {len(projects)} projects ready.[/bold green]")
+    if failed:
+        console.print(f"[red]Failed:[/red] {', '.join(failed)}")
+        raise typer.Exit(1)
+
+
+@app.command()
+def upgrade(
+    template_from: str = typer.Option(None, "--from", help="Upgrade from a local template zip or mirror directory instead of GitHub (or set SPECIFY_TEMPLATE_MIRROR)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show what would change without writing any files"),
+    force: bool = typer.Option(False, "--force", help="Re-apply the release even if it is already installed"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
+    debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network failures"),
+    github_token: str = typer.Option(None, "--github-token", help="GitHub token to use for API requests (or set GH_TOKEN or GITHUB_TOKEN environment variable)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always download templates instead of using the local template cache"),
+):
+    """
+    Upgrade the Specify templates of the project in the current directory.
+
+    Uses .specify/install-state.json (written by init) to tell template files
+    from your edits: unedited files are replaced, edited files the release did
+    not change are kept, and files changed on both sides are merged three-way.
+    Overlapping edits get conflict markers; binary files or files without a
+    recoverable base are kept and the new version is written as <file>.specify-new.
+
+    Examples:
+        specify upgrade --dry-run
+        specify upgrade
+        specify upgrade --from ./mirror
+    """
+    from .upgrade import InstallState, NEW_SUFFIX, apply_upgrade, load_install_state, plan_upgrade, save_install_state
+
+    show_banner()
+    project_path = Path.cwd()
+    state = load_install_state(project_path)
+    if state is None:
+        console.print("[red]Error:[/red] No .specify/install-state.json in the current directory.")
+        console.print("Run [cyan]specify init --here[/cyan] once with this version of specify to record the installed templates.")
+        raise typer.Exit(1)
+
+    template_source = _resolve_template_source(template_from)
+    repo_owner, repo_name = state.repo.split("/", 1) if state.repo else _repo_or_default(None, None)
+    client = get_http_client(skip_tls)
+    cache = None if no_cache else TemplateCache()
+
+    def read_release(release_data: dict | None, local_release: str | None = None) -> Tuple[dict[str, bytes], str]:
+        """Template files for the recorded agents, combined the way init combines them."""
+        files: dict[str, bytes] = {}
+        release = None
+        for i, ai in enumerate(state.ai):
+            if local_release is not None:
+                archive = template_source / f"spec-kit-template-{ai}-{state.script}-{local_release}.zip"
+                meta = {"release": local_release}
+            elif template_source is not None:
+                archive, meta = resolve_local_template(template_source, ai, script_type=state.script, verbose=False)
+            else:
+                archive, meta = download_template_from_github(
+                    ai, None, script_type=state.script, verbose=False, show_progress=False,
+                    client=client, debug=debug, github_token=github_token, repo_owner=repo_owner,
+                    repo_name=repo_name, cache=cache, in_memory=True, release_data=release_data,
+                )
+            try:
+                with zipfile.ZipFile(archive) as zf:
+                    files.update(read_template(zf, only=None if i == 0 else agent_folders(ai)))
+            finally:
+                if meta.get("in_memory"):
+                    archive.close()
+            release = release or meta["release"]
+        return files, release
+
+    release_data = None
+    if template_source is None:
+        api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+        try:
+            release_data, _ = fetch_release_data(client, api_url, debug=debug, github_token=github_token, cache=cache)
+        except Exception as e:
+            console.print("[red]Error fetching release information[/red]")
+            console.print(Panel(str(e), title="Fetch Error", border_style="red"))
+            raise typer.Exit(1)
+        if release_data.get("tag_name") == state.release and not force:
+            console.print(f"[green]Already up to date[/green] (release {state.release})")
+            return
+
+    console.print(f"[cyan]Installed release:[/cyan] {state.release}  [cyan]Agents:[/cyan] {', '.join(state.ai)}  [cyan]Script:[/cyan] {state.script}")
+    try:
+        new_files, new_release = read_release(release_data)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error reading new templates:[/red] {e}")
+        raise typer.Exit(1)
+    prune_cache(cache)
+    if new_release == state.release and not force:
+        console.print(f"[green]Already up to date[/green] (release {state.release})")
+        return
+    console.print(f"[cyan]Upgrading to:[/cyan] {new_release}")
+
+    def load_base() -> dict[str, bytes] | None:
+        # The installed release, needed only for three-way merges
+        try:
+            if template_source is not None and template_source.is_dir():
+                return read_release(None, local_release=state.release)[0]
+            if state.source == "github":
+                tag_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/tags/{state.release}"
+                base_release, _ = fetch_release_data(client, tag_url, debug=debug, github_token=github_token, cache=cache)
+                return read_release(base_release)[0]
+        except Exception as e:
+            if debug:
+                console.print(f"[yellow]Installed release {state.release} unavailable for merging:[/yellow] {e}")
+        return None
+
+    plan = plan_upgrade(project_path, state, new_files, load_base, new_label=new_release)
+
+    labels = {
+        "add": "[green]added[/green]",
+        "update": "[green]updated[/green]",
+        "merge": "[cyan]merged[/cyan]",
+        "conflict": "[red]conflict[/red]",
+        "keep": "[dim]kept (local edits)[/dim]",
+        "skip-deleted": "[dim]skipped (deleted locally)[/dim]",
+        "remove": "[yellow]removed[/yellow]",
+        "keep-removed": "[yellow]kept (removed upstream, edited locally)[/yellow]",
+    }
+    if plan.changes:
+        from rich.table import Table
+        table = Table(title="Dry run" if dry_run else None, header_style="bold")
+        table.add_column("File")
+        table.add_column("Action")
+        for change in plan.changes:
+            detail = labels[change.action]
+            if change.target:
+                detail += f" [dim]new version in {Path(change.target).name}[/dim]"
+            elif change.conflicts:
+                detail += f" [dim]{change.conflicts} region(s)[/dim]"
+            table.add_row(change.path, detail)
+        console.print(table)
+    words = {"add": "added", "update": "updated", "merge": "merged", "conflict": "conflicts", "keep": "kept", "skip-deleted": "skipped", "remove": "removed", "keep-removed": "kept"}
+    summary = ", ".join(f"{n} {words[action]}" for action in labels if (n := plan.count(action)))
+    console.print(f"[cyan]Files:[/cyan] {summary + ', ' if summary else ''}{plan.unchanged} unchanged")
+
+    if dry_run:
+        return
+
+    apply_upgrade(project_path, plan)
+    save_install_state(project_path, InstallState(
+        release=new_release,
+        ai=state.ai,
+        script=state.script,
+        files=plan.files,
+        repo=f"{repo_owner}/{repo_name}" if template_source is None else None,
+        source="github" if template_source is None else "local",
+        installed_at=datetime.now().astimezone().isoformat(timespec="seconds"),
+    ))
+    ensure_executable_scripts(project_path)
+
+    conflicts = [c for c in plan.changes if c.action == "conflict"]
+    if conflicts:
+        console.print(f"\n[yellow]Upgraded to {new_release} with {len(conflicts)} conflict(s).[/yellow] Resolve the <<<<<<< markers or compare with the {NEW_SUFFIX} files.")
+        raise typer.Exit(1)
+    console.print(f"\n[bold green]Upgraded to {new_release}.[/bold green]")
+
+
 @app.command()
-def check():
+def check(
+    as_json: bool = typer.Option(False, "--json", help="Print the results as JSON (no banner or tree)"),
+    versions: bool = typer.Option(False, "--versions", help="Also run each found tool with --version (in parallel)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore results cached for the current PATH"),
+):
     """Check that all required tools are installed."""
+    names = [name for name, _, _ in CHECK_TOOLS]
+    if as_json:
+        found, cached = discover_tools(names, versions=versions, use_cache=not no_cache)
+        payload = {
+            "cached": cached,
+            "tools": {name: {"found": info.found, "path": info.path, "version": info.version} for name, info in found.items()},
+        }
+        typer.echo(json.dumps(payload, indent=2))
+        return
+
     show_banner()
     console.print("[bold]Checking for installed tools...[/bold]\n")
 
     tracker = StepTracker("Check Available Tools")
-    
-    tracker.add("git", "Git version control")
-    tracker.add("claude", "Claude Code CLI")
-    tracker.add("gemini", "Gemini CLI")
-    tracker.add("qwen", "Qwen Code CLI")
-    tracker.add("code", "Visual Studio Code")
-    tracker.add("code-insiders", "Visual Studio Code Insiders")
-    tracker.add("cursor-agent", "Cursor IDE agent")
-    tracker.add("windsurf", "Windsurf IDE")
-    tracker.add("kilocode", "Kilo Code IDE")
-    tracker.add("opencode", "opencode")
-    tracker.add("codex", "Codex CLI")
-    tracker.add("auggie", "Auggie CLI")
-    
-    git_ok = check_tool_for_tracker("git", tracker)
-    claude_ok = check_tool_for_tracker("claude", tracker)  
-    gemini_ok = check_tool_for_tracker("gemini", tracker)
-    qwen_ok = check_tool_for_tracker("qwen", tracker)
-    code_ok = check_tool_for_tracker("code", tracker)
-    code_insiders_ok = check_tool_for_tracker("code-insiders", tracker)
-    cursor_ok = check_tool_for_tracker("cursor-agent", tracker)
-    windsurf_ok = check_tool_for_tracker("windsurf", tracker)
-    kilocode_ok = check_tool_for_tracker("kilocode", tracker)
-    opencode_ok = check_tool_for_tracker("opencode", tracker)
-    codex_ok = check_tool_for_tracker("codex", tracker)
-    auggie_ok = check_tool_for_tracker("auggie", tracker)
+    for name, label, _ in CHECK_TOOLS:
+        tracker.add(name, label)
+
+    found, _ = discover_tools(names, versions=versions, use_cache=not no_cache)
+    for name, info in found.items():
+        if info.found:
+            tracker.complete(name, info.version or "available")
+        else:
+            tracker.error(name, "not found")
 
     console.print(tracker.render())
 
     console.print("\n[bold green]Specify CLI is ready to use![/bold green]")
 
-    if not git_ok:
+    if not found["git"].found:
         console.print("[dim]Tip: Install git for repository management[/dim]")
-    if not (claude_ok or gemini_ok or cursor_ok or qwen_ok or windsurf_ok or kilocode_ok or opencode_ok or codex_ok or auggie_ok):
+    if not any(found[name].found for name, _, is_agent in CHECK_TOOLS if is_agent):
         console.print("[dim]Tip: Install an AI assistant for the best experience[/dim]")
 
 
-# Add the unit sub-app to main app
+# Add the cache sub-app to main app
+app.add_typer(cache_app, name="cache")
+
+@cache_app.command("list")
+def cache_list():
+    """List cached template archives."""
+    cache = TemplateCache()
+    entries = cache.entries()
+    if not entries:
+        console.print(f"[dim]Template cache is empty ({cache.root})[/dim]")
+        return
+
+    from rich.table import Table
+    table = Table(title=f"Template cache ({cache.root})", title_style="cyan", header_style="bold")
+    table.add_column("Repository")
+    table.add_column("Release")
+    table.add_column("Asset")
+    table.add_column("Size", justify="right")
+    table.add_column("SHA-256", style="bright_black")
+    table.add_column("Last used", style="bright_black")
+    for entry in entries:
+        table.add_row(
+            entry.repo,
+            entry.tag,
+            entry.asset,
+            f"{entry.size:,}",
+            entry.sha256[:12],
+            datetime.fromtimestamp(entry.last_used).strftime("%Y-%m-%d %H:%M"),
+        )
+    console.print(table)
+    total = sum({e.sha256: e.size for e in entries}.values())
+    console.print(f"[dim]{len(entries)} entries, {total:,} bytes[/dim]")
+
+@cache_app.command("prune")
+def cache_prune(
+    max_age_days: float = typer.Option(None, "--max-age-days", help="Evict entries not used for this many days (default: SPECIFY_CACHE_MAX_AGE_DAYS or 30)"),
+    max_size_mb: float = typer.Option(None, "--max-size-mb", help="Evict least recently used entries above this total size (default: SPECIFY_CACHE_MAX_MB or 512)"),
+    all_entries: bool = typer.Option(False, "--all", help="Remove every cached template"),
+):
+    """Evict cached templates by age and total size."""
+    cache = TemplateCache()
+    if all_entries:
+        removed = cache.clear()
+    else:
+        removed = cache.prune(
+            max_bytes=int(max_size_mb * 1024 * 1024) if max_size_mb is not None else None,
+            max_age_days=max_age_days,
+        )
+    for entry in removed:
+        console.print(f"[yellow]Removed[/yellow] {entry.key}")
+    console.print(f"[green]✓[/green] {len(removed)} cache entries removed")
+
+@cache_app.command("verify")
+def cache_verify():
+    """Re-hash cached templates and drop corrupt or missing archives."""
+    cache = TemplateCache()
+    ok, removed = cache.verify()
+    for entry in removed:
+        console.print(f"[red]Corrupt[/red] {entry.key} (removed)")
+    console.print(f"[green]✓[/green] {len(ok)} entries verified" + (f", [red]{len(removed)} removed[/red]" if removed else ""))
+    if removed:
+        raise typer.Exit(1)
+
+
+# Add the feature sub-app to main app
+app.add_typer(feature_app, name="feature")
+
+def _workflow_project(project_dir: str) -> Path:
+    project_path = Path(project_dir).resolve()
+    if not project_path.is_dir():
+        err_console.print(f"[red]Error:[/red] Directory {project_path} does not exist")
+        raise typer.Exit(1)
+    return project_path
+
+
+def _workflow_warning(warning: str | None) -> None:
+    if warning:
+        err_console.print(f"[yellow]\\[specify] Warning:[/yellow] {warning}")
+
+@feature_app.command("new")
+def feature_new(
+    feature_description: list[str] = typer.Argument(..., help="Description of the feature (e.g., 'photo albums with drag and drop')"),
+    project_dir: str = typer.Option(".", "--dir", help="Project directory (default: current directory)"),
+    as_json: bool = typer.Option(False, "--json", help="Print BRANCH_NAME, SPEC_FILE and FEATURE_NUM as JSON"),
+):
+    """Create a numbered feature branch and its spec.md (create-new-feature.sh)."""
+    from .workflow import WorkflowError, create_feature
+
+    project_path = _workflow_project(project_dir)
+    try:
+        created = create_feature(" ".join(feature_description), project_path)
+    except WorkflowError as e:
+        err_console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    _workflow_warning(created.warning)
+    if as_json:
+        typer.echo(json.dumps(created.to_dict()))
+        return
+    for key, value in created.to_dict().items():
+        typer.echo(f"{key}: {value}")
+
+@feature_app.command("plan")
+def feature_plan(
+    project_dir: str = typer.Option(".", "--dir", help="Project directory (default: current directory)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the plan paths as JSON"),
+):
+    """Copy the plan template into the current feature (setup-plan.sh)."""
+    from .workflow import PLAN_TEMPLATE, WorkflowError, setup_feature_plan
+
+    project_path = _workflow_project(project_dir)
+    try:
+        plan = setup_feature_plan(project_path)
+    except WorkflowError as e:
+        err_console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    _workflow_warning(plan.paths.warning)
+    if not plan.template_found:
+        _workflow_warning(f"Plan template not found at {PLAN_TEMPLATE}; created an empty plan")
+    if as_json:
+        typer.echo(json.dumps(plan.to_dict()))
+        return
+    for key, value in plan.to_dict().items():
+        typer.echo(f"{key}: {value}")
+
+@feature_app.command("check")
+def feature_check(
+    project_dir: str = typer.Option(".", "--dir", help="Project directory (default: current directory)"),
+    require_tasks: bool = typer.Option(False, "--require-tasks", help="Require tasks.md to exist (implementation phase)"),
+    include_tasks: bool = typer.Option(False, "--include-tasks", help="Include tasks.md in the available documents"),
+    as_json: bool = typer.Option(False, "--json", help="Print FEATURE_DIR and AVAILABLE_DOCS as JSON"),
+):
+    """Check the current feature's prerequisites (check-prerequisites.sh)."""
+    from .workflow import WorkflowError, check_feature_prerequisites
+
+    project_path = _workflow_project(project_dir)
+    try:
+        check = check_feature_prerequisites(project_path, require_tasks=require_tasks, include_tasks=include_tasks)
+    except WorkflowError as e:
+        err_console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    _workflow_warning(check.paths.warning)
+    if as_json:
+        typer.echo(json.dumps(check.to_dict()))
+        return
+    typer.echo(f"FEATURE_DIR:{check.paths.feature_dir}")
+    typer.echo("AVAILABLE_DOCS:")
+    for name, present in check.docs.items():
+        typer.echo(f"  {'✓' if present else '✗'} {name}")
+
+@feature_app.command("paths")
+def feature_paths_cmd(
+    project_dir: str = typer.Option(".", "--dir", help="Project directory (default: current directory)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the paths as JSON"),
+):
+    """Print the current feature's paths without validation (check-prerequisites.sh --paths-only)."""
+    from .workflow import WorkflowError, feature_paths
+
+    project_path = _workflow_project(project_dir)
+    try:
+        paths = feature_paths(project_path)
+    except WorkflowError as e:
+        err_console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    _workflow_warning(paths.warning)
+    if as_json:
+        typer.echo(json.dumps(paths.to_dict()))
+        return
+    for key, value in paths.to_dict().items():
+        typer.echo(f"{key}: {value}")
+
+
+app.add_typer(index_app, name="index")
+
+@index_app.command("rebuild")
+def index_rebuild(
+    project_dir: str = typer.Option(".", "--dir", help="Project directory (default: current directory)"),
+):
+    """Rebuild .specify/index.json from the specs/ and tests/ directories."""
+    from . import index as numbering
+    from .workflow import WorkflowError, resolve_repo
+
+    project_path = _workflow_project(project_dir)
+    try:
+        root = resolve_repo(project_path).root
+        kinds = numbering.rebuild(root)
+    except (WorkflowError, numbering.IndexLockTimeout) as e:
+        err_console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    console.print(f"[green]✓[/green] Rebuilt [cyan]{root / numbering.INDEX_PATH}[/cyan]")
+    for kind, entry in kinds.items():
+        console.print(f"  {kind}/: {len(entry['entries'])} entries, next number {entry['highest'] + 1:03d}")
+
+
 app.add_typer(unit_app, name="unit")
 
 @unit_app.command("init")
 def unit_init(
     test_description: str = typer.Argument(..., help="Description of what to test (e.g., 'test user authentication with validation')"),
     project_dir: str = typer.Option(".", "--dir", help="Project directory (default: current directory)"),
+    as_json: bool = typer.Option(False, "--json", help="Print BRANCH_NAME, TEST_SPEC_FILE and TEST_NUM as JSON"),
 ):
     """Initialize a new unit test specification using the specify-unit workflow."""
-    import subprocess
-    import os
-    from pathlib import Path
-    
-    project_path = Path(project_dir).resolve()
-    if not project_path.exists():
-        console.print(f"[red]Error:[/red] Directory {project_path} does not exist")
-        raise typer.Exit(1)
-    
-    # Change to project directory
-    original_dir = Path.cwd()
-    try:
-        os.chdir(project_path)
-        
+    from .workflow import WorkflowError, create_unit_test
+
+    project_path = _workflow_project(project_dir)
+    if not as_json:
         console.print("[cyan]Creating unit test specification...[/cyan]")
         console.print(f"[dim]Description: {test_description}[/dim]")
-        
-        # Check for script existence
-        script_path = project_path / "scripts" / "bash" / "create-unit-test.sh"
-        if not script_path.exists():
-            console.print(f"[red]Error:[/red] Unit test script not found at {script_path}")
-            console.print("[yellow]Make sure you're in a Specify project directory with unit testing support[/yellow]")
-            raise typer.Exit(1)
-        
-        # Run the create-unit-test script
-        cmd = [str(script_path), "--json"] + test_description.split()
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            console.print(f"[red]Error creating unit test:[/red] {result.stderr}")
-            raise typer.Exit(1)
-        
-        # Parse JSON output
-        import json
-        try:
-            output = json.loads(result.stdout)
-            branch_name = output["BRANCH_NAME"]
-            test_spec_file = output["TEST_SPEC_FILE"]
-            test_num = output["TEST_NUM"]
-            
-            console.print(f"[green]✓[/green] Unit test specification created:")
-            console.print(f"  Branch: [cyan]{branch_name}[/cyan]")
-            console.print(f"  Spec file: [dim]{test_spec_file}[/dim]")
-            console.print(f"  Test number: {test_num}")
-            
-            console.print("\n[bold]Next steps:[/bold]")
-            console.print("1. [cyan]/plan-unit[/cyan] - Plan the test implementation")
-            console.print("2. [cyan]/tasks-unit[/cyan] - Break down into tasks")
-            console.print("3. [cyan]/implement-unit[/cyan] - Execute the tests")
-            
-        except (json.JSONDecodeError, KeyError) as e:
-            console.print(f"[red]Error parsing output:[/red] {e}")
-            console.print(f"Raw output: {result.stdout}")
-            raise typer.Exit(1)
-            
-    finally:
-        os.chdir(original_dir)
+    try:
+        created = create_unit_test(test_description, project_path)
+    except WorkflowError as e:
+        err_console.print(f"[red]Error creating unit test:[/red] {e}")
+        raise typer.Exit(1)
+
+    if as_json:
+        typer.echo(json.dumps(created.to_dict()))
+        return
+    if created.warning:
+        console.print(f"[yellow]Warning:[/yellow] {created.warning}")
+    console.print(f"[green]✓[/green] Unit test specification created:")
+    console.print(f"  Branch: [cyan]{created.branch_name}[/cyan]")
+    console.print(f"  Spec file: [dim]{created.test_spec_file}[/dim]")
+    console.print(f"  Test number: {created.test_num}")
+
+    console.print("\n[bold]Next steps:[/bold]")
+    console.print("1. [cyan]/plan-unit[/cyan] - Plan the test implementation")
+    console.print("2. [cyan]/tasks-unit[/cyan] - Break down into tasks")
+    console.print("3. [cyan]/implement-unit[/cyan] - Execute the tests")
 
 @unit_app.command("plan")
 def unit_plan(
     project_dir: str = typer.Option(".", "--dir", help="Project directory (default: current directory)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the plan paths as JSON"),
 ):
     """Create a test implementation plan for the current unit test specification."""
-    import subprocess
-    import os
-    from pathlib import Path
-    
-    project_path = Path(project_dir).resolve()
-    original_dir = Path.cwd()
-    
-    try:
-        os.chdir(project_path)
-        
+    from .workflow import UNIT_PLAN_TEMPLATE, WorkflowError, setup_unit_plan
+
+    project_path = _workflow_project(project_dir)
+    if not as_json:
         console.print("[cyan]Creating unit test implementation plan...[/cyan]")
-        
-        script_path = project_path / "scripts" / "bash" / "setup-unit-plan.sh"
-        if not script_path.exists():
-            console.print(f"[red]Error:[/red] Unit plan script not found at {script_path}")
-            raise typer.Exit(1)
-        
-        result = subprocess.run([str(script_path), "--json"], capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            console.print(f"[red]Error creating unit plan:[/red] {result.stderr}")
-            raise typer.Exit(1)
-        
-        import json
-        try:
-            output = json.loads(result.stdout)
-            test_plan_file = output["TEST_PLAN"]
-            branch = output["BRANCH"]
-            
-            console.print(f"[green]✓[/green] Test implementation plan created:")
-            console.print(f"  Branch: [cyan]{branch}[/cyan]")
-            console.print(f"  Plan file: [dim]{test_plan_file}[/dim]")
-            
-        except (json.JSONDecodeError, KeyError) as e:
-            console.print(f"[red]Error parsing output:[/red] {e}")
-            raise typer.Exit(1)
-            
-    finally:
-        os.chdir(original_dir)
+    try:
+        plan = setup_unit_plan(project_path)
+    except WorkflowError as e:
+        err_console.print(f"[red]Error creating unit plan:[/red] {e}")
+        raise typer.Exit(1)
+
+    if as_json:
+        typer.echo(json.dumps(plan.to_dict()))
+        return
+    if not plan.template_found:
+        console.print(f"[yellow]Warning:[/yellow] Unit test plan template not found at {UNIT_PLAN_TEMPLATE}; created an empty plan")
+    console.print(f"[green]✓[/green] Test implementation plan created:")
+    console.print(f"  Branch: [cyan]{plan.branch}[/cyan]")
+    console.print(f"  Plan file: [dim]{plan.test_plan}[/dim]")
 
 @unit_app.command("check")
 def unit_check(
     project_dir: str = typer.Option(".", "--dir", help="Project directory (default: current directory)"),
     require_tasks: bool = typer.Option(False, "--require-tasks", help="Require test-tasks.md to exist"),
+    include_tasks: bool = typer.Option(False, "--include-tasks", help="Include test-tasks.md in the available documents"),
+    as_json: bool = typer.Option(False, "--json", help="Print TEST_DIR and AVAILABLE_DOCS as JSON"),
 ):
     """Check prerequisites for unit testing workflow."""
-    import subprocess
-    import os
-    from pathlib import Path
-    
-    project_path = Path(project_dir).resolve()
-    original_dir = Path.cwd()
-    
+    from .workflow import WorkflowError, check_unit_prerequisites
+
+    project_path = _workflow_project(project_dir)
     try:
-        os.chdir(project_path)
-        
-        console.print("[bold]Checking unit testing prerequisites...[/bold]\n")
-        
-        script_path = project_path / "scripts" / "bash" / "check-unit-prerequisites.sh"
-        if not script_path.exists():
-            console.print(f"[red]Error:[/red] Unit check script not found at {script_path}")
-            console.print("[yellow]Make sure you're in a Specify project directory with unit testing support[/yellow]")
-            raise typer.Exit(1)
-        
-        cmd = [str(script_path)]
-        if require_tasks:
-            cmd.append("--require-tasks")
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            console.print(f"[red]Prerequisites check failed:[/red]")
-            console.print(result.stderr)
-            raise typer.Exit(1)
-        
-        # Display the output
-        console.print(result.stdout)
-        console.print("\n[green]Unit testing prerequisites satisfied![/green]")
-        
-    finally:
-        os.chdir(original_dir)
+        check = check_unit_prerequisites(project_path, require_tasks=require_tasks, include_tasks=include_tasks)
+    except WorkflowError as e:
+        err_console.print(f"[red]Prerequisites check failed:[/red]")
+        err_console.print(str(e))
+        raise typer.Exit(1)
 
-@unit_app.command("status") 
+    if as_json:
+        typer.echo(json.dumps(check.to_dict()))
+        return
+    console.print("[bold]Checking unit testing prerequisites...[/bold]\n")
+    console.print(f"TEST_DIR:{check.test_dir}")
+    console.print("AVAILABLE_DOCS:")
+    for name, present in check.docs.items():
+        console.print(f"  {'✓' if present else '✗'} {name}")
+    console.print("\n[green]Unit testing prerequisites satisfied![/green]")
+
+@unit_app.command("status")
 def unit_status(
     project_dir: str = typer.Option(".", "--dir", help="Project directory (default: current directory)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the status of every unit test as JSON"),
 ):
-    """Show status of current unit testing workflow."""
-    from pathlib import Path
-    import subprocess
-    import os
-    
-    project_path = Path(project_dir).resolve()
-    
-    # Check if we're in a unit test branch
+    """Show the status of every unit test (tests/NNN-unit-* directories and branches)."""
+    from .workflow import UNIT_OPTIONAL_DOCS, UNIT_STAGE_DOCS, WorkflowError, unit_status as read_unit_status
+
+    project_path = _workflow_project(project_dir)
     try:
-        os.chdir(project_path)
-        result = subprocess.run(["git", "branch", "--show-current"], capture_output=True, text=True)
-        if result.returncode == 0:
-            current_branch = result.stdout.strip()
-            if current_branch.startswith(tuple(f"{i:03d}-unit-" for i in range(1000))):
-                console.print(f"[green]✓[/green] On unit test branch: [cyan]{current_branch}[/cyan]")
-                
-                # Check for test files
-                tests_dir = project_path / "tests" / current_branch
-                if tests_dir.exists():
-                    test_files = []
-                    if (tests_dir / "test-spec.md").exists():
-                        test_files.append("test-spec.md ✓")
-                    if (tests_dir / "test-plan.md").exists():
-                        test_files.append("test-plan.md ✓")
-                    if (tests_dir / "test-tasks.md").exists():
-                        test_files.append("test-tasks.md ✓")
-                    
-                    if test_files:
-                        console.print("\n[bold]Available test documents:[/bold]")
-                        for file in test_files:
-                            console.print(f"  - {file}")
-                    
-                    console.print(f"\n[dim]Test directory: {tests_dir}[/dim]")
-            else:
-                console.print(f"[yellow]Not on a unit test branch[/yellow] (current: {current_branch})")
-                console.print("[dim]Use 'specify unit init' to create a unit test specification[/dim]")
-        else:
-            console.print("[yellow]Not in a git repository[/yellow]")
-    except Exception as e:
-        console.print(f"[red]Error checking status:[/red] {e}")
+        status = read_unit_status(project_path)
+    except WorkflowError as e:
+        err_console.print(f"[red]Error checking status:[/red] {e}")
+        raise typer.Exit(1)
+
+    if as_json:
+        typer.echo(json.dumps(status.to_dict(), indent=2))
+        return
+
+    if not status.has_git:
+        console.print("[yellow]Not in a git repository[/yellow]")
+    elif status.on_unit_branch:
+        console.print(f"[green]✓[/green] On unit test branch: [cyan]{status.branch}[/cyan]")
+    else:
+        console.print(f"[yellow]Not on a unit test branch[/yellow] (current: {status.branch or 'detached HEAD'})")
+
+    if not status.units:
+        console.print("[dim]No unit tests yet. Use 'specify unit init' to create a unit test specification[/dim]")
+        return
+
+    from rich.table import Table
+
+    table = Table(show_header=True, header_style="bold", box=None, padding=(0, 1))
+    table.add_column("Unit test", no_wrap=True)
+    for stage, _ in UNIT_STAGE_DOCS:
+        table.add_column(stage.capitalize(), justify="center")
+    table.add_column("Optional", justify="right")
+    if status.has_git:
+        table.add_column("Branch", justify="center")
+
+    mark = {True: "[green]✓[/green]", False: "[dim]✗[/dim]"}
+    for unit in status.units:
+        name = f"[bold cyan]* {unit.name}[/bold cyan]" if unit.current else f"  {unit.name}"
+        optional = sum(unit.docs[doc] for doc in UNIT_OPTIONAL_DOCS)
+        row = [name, *(mark[unit.docs[doc]] for _, doc in UNIT_STAGE_DOCS), f"{optional}/{len(UNIT_OPTIONAL_DOCS)}"]
+        if status.has_git:
+            row.append(mark[unit.has_branch])
+        table.add_row(*row)
+    console.print()
+    console.print(table)
+
+    complete = sum(1 for unit in status.units if unit.complete)
+    console.print(f"\n[dim]{len(status.units)} unit test(s), {complete} with spec, plan and tasks; tests directory: {status.repo_root / 'tests'}[/dim]")
 
 def main():
     app()
@@ -0,0 +1,395 @@
+"""On-disk cache for downloaded template archives and release metadata.
+
+Archives are stored content-addressed by SHA-256 under the platformdirs user
+cache directory and indexed by (repo, release tag, asset name), so repeated
+``specify init`` runs can reuse a template without downloading it again.
+Release lookups are stored with their ETag/Last-Modified validators so the
+GitHub API can be queried conditionally (or skipped within a TTL).
+
+Every read-modify-write of the index and the release store happens under an
+exclusive lock on ``<root>/cache.lock``, re-reading the file once the lock is
+held, so parallel downloads (threads or processes) never lose each other's
+entries. Blobs that no entry references are only deleted by ``prune``,
+``verify`` and ``clear``, never by ``lookup`` or ``store``.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from platformdirs import user_cache_dir
+
+from .locking import exclusive
+
+# Defaults, overridable through SPECIFY_CACHE_MAX_MB / SPECIFY_CACHE_MAX_AGE_DAYS
+DEFAULT_MAX_MB = 512
+DEFAULT_MAX_AGE_DAYS = 30
+# Seconds a stored release lookup is trusted without asking GitHub (SPECIFY_RELEASE_TTL);
+# older lookups are revalidated with a conditional request
+DEFAULT_RELEASE_TTL = 600
+# Seconds to wait for another process to finish updating the cache
+LOCK_TIMEOUT = 30.0
+
+# Release fields kept in the metadata store; the rest of the payload is unused
+_RELEASE_FIELDS = ("tag_name", "name", "published_at")
+_ASSET_FIELDS = ("name", "size", "browser_download_url", "digest")
+
+
+def default_cache_dir() -> Path:
+    """Return the cache root (SPECIFY_CACHE_DIR wins over the platform default)."""
+    override = (os.getenv("SPECIFY_CACHE_DIR") or "").strip()
+    if override:
+        return Path(override).expanduser()
+    return Path(user_cache_dir("specify-cli", appauthor=False))
+
+
+def env_number(name: str, default: float) -> float:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Return the hex SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def asset_sha256(asset: dict) -> str | None:
+    """Return the SHA-256 published for a GitHub release asset, if any.
+
+    GitHub exposes it as ``"digest": "sha256:<hex>"`` on each asset.
+    """
+    digest = asset.get("digest") or ""
+    algo, _, value = digest.partition(":")
+    if algo.lower() == "sha256" and value:
+        return value.lower()
+    return None
+
+
+@dataclass
+class CacheEntry:
+    repo: str
+    tag: str
+    asset: str
+    sha256: str
+    size: int
+    created: float
+    last_used: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.repo}@{self.tag}/{self.asset}"
+
+
+@dataclass
+class ReleaseRecord:
+    url: str
+    data: dict
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+
+def _trim_release(data: dict) -> dict:
+    trimmed = {k: data[k] for k in _RELEASE_FIELDS if k in data}
+    trimmed["assets"] = [
+        {k: a[k] for k in _ASSET_FIELDS if k in a}
+        for a in data.get("assets", [])
+    ]
+    return trimmed
+
+
+class TemplateCache:
+    """Content-addressed store for template zips.
+
+    Layout::
+
+        <root>/templates/<sha[:2]>/<sha>.zip   archive blobs
+        <root>/templates.json                  (repo, tag, asset) -> blob index
+        <root>/releases.json                   release lookups + ETag/Last-Modified
+        <root>/partial/<key>-<asset>.part      interrupted downloads, resumed later
+        <root>/cache.lock                      held while the JSON files are updated
+    """
+
+    def __init__(self, root: Path | None = None, *, max_bytes: int | None = None, max_age_days: float | None = None, release_ttl: float | None = None):
+        self.root = root or default_cache_dir()
+        self.blob_dir = self.root / "templates"
+        self.index_path = self.root / "templates.json"
+        self.releases_path = self.root / "releases.json"
+        self.partial_dir = self.root / "partial"
+        self.lock_path = self.root / "cache.lock"
+        if max_bytes is None:
+            max_bytes = int(env_number("SPECIFY_CACHE_MAX_MB", DEFAULT_MAX_MB) * 1024 * 1024)
+        if max_age_days is None:
+            max_age_days = env_number("SPECIFY_CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS)
+        if release_ttl is None:
+            release_ttl = env_number("SPECIFY_RELEASE_TTL", DEFAULT_RELEASE_TTL)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.release_ttl = release_ttl
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.blob_dir / sha256[:2] / f"{sha256}.zip"
+
+    def partial_path(self, repo: str, tag: str, asset: str) -> Path:
+        """Where an in-progress download of (repo, tag, asset) is kept until it completes."""
+        key = hashlib.sha256(f"{repo}@{tag}/{asset}".encode("utf-8")).hexdigest()[:16]
+        return self.partial_dir / f"{key}-{asset}.part"
+
+    def _locked(self):
+        return exclusive(self.lock_path, LOCK_TIMEOUT)
+
+    def _load(self) -> dict[str, CacheEntry]:
+        try:
+            raw = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        entries = {}
+        for item in raw.get("entries", []):
+            try:
+                entry = CacheEntry(**item)
+            except TypeError:
+                continue
+            entries[entry.key] = entry
+        return entries
+
+    def _save(self, entries: dict[str, CacheEntry]) -> None:
+        payload = {"version": 1, "entries": [asdict(e) for e in entries.values()]}
+        self._write_json(self.index_path, payload)
+
+    def _write_json(self, path: Path, payload: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f".{path.stem}-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _load_releases(self) -> dict[str, dict]:
+        try:
+            return json.loads(self.releases_path.read_text(encoding="utf-8")).get("releases", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def get_release(self, url: str) -> ReleaseRecord | None:
+        """Return the stored release lookup for an API URL, if any."""
+        item = self._load_releases().get(url)
+        if not item:
+            return None
+        try:
+            return ReleaseRecord(url=url, **item)
+        except TypeError:
+            return None
+
+    def put_release(self, url: str, data: dict, etag: str | None = None, last_modified: str | None = None) -> ReleaseRecord:
+        """Store (or refresh) a release lookup together with its validators."""
+        record = ReleaseRecord(url=url, data=_trim_release(data), etag=etag, last_modified=last_modified, fetched_at=time.time())
+        item = asdict(record)
+        del item["url"]
+        with self._locked():
+            releases = self._load_releases()
+            releases[url] = item
+            self._write_json(self.releases_path, {"version": 1, "releases": releases})
+        return record
+
+    def release_is_fresh(self, record: ReleaseRecord) -> bool:
+        return self.release_ttl > 0 and time.time() - record.fetched_at < self.release_ttl
+
+    def entries(self) -> list[CacheEntry]:
+        return sorted(self._load().values(), key=lambda e: e.last_used, reverse=True)
+
+    def lookup(self, repo: str, tag: str, asset: str, sha256: str | None = None) -> Path | None:
+        """Return the cached archive for (repo, tag, asset) or None on a miss.
+
+        When ``sha256`` is given the entry must match it. The blob is re-hashed so
+        a truncated or corrupted archive is dropped (and re-downloaded) instead of
+        being handed to zipfile.
+        """
+        key = f"{repo}@{tag}/{asset}"
+        with self._locked():
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            path = self.blob_path(entry.sha256)
+            stale = (sha256 is not None and entry.sha256 != sha256.lower())
+            try:
+                stale = stale or path.stat().st_size != entry.size
+                if not stale and sha256_file(path) != entry.sha256:
+                    # Corrupt on disk; other keys sharing the blob will miss too
+                    path.unlink(missing_ok=True)
+                    stale = True
+            except OSError:
+                stale = True
+            if stale:
+                # The blob itself is left for prune; another key may still use it
+                del entries[key]
+                self._save(entries)
+                return None
+            entry.last_used = time.time()
+            self._save(entries)
+        return path
+
+    def store(self, src: Path, repo: str, tag: str, asset: str, sha256: str | None = None) -> CacheEntry:
+        """Move ``src`` into the cache and index it.
+
+        Raises ValueError if ``sha256`` is given and does not match the file.
+        """
+        actual = sha256_file(src)
+        if sha256 is not None and actual != sha256.lower():
+            raise ValueError(f"SHA-256 mismatch for {asset}: expected {sha256}, got {actual}")
+        dest = self.blob_path(actual)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+        shutil.move(str(src), str(tmp))
+        try:
+            with self._locked():
+                if dest.exists():
+                    os.unlink(tmp)
+                else:
+                    os.replace(tmp, dest)
+                return self._index(repo, tag, asset, actual, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def store_fileobj(self, fileobj: BinaryIO, repo: str, tag: str, asset: str, sha256: str | None = None) -> CacheEntry:
+        """Copy an open archive (e.g. an in-memory download) into the cache and index it.
+
+        Raises ValueError if ``sha256`` is given and does not match the content.
+        """
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self.blob_dir, prefix=".blob-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in iter(lambda: fileobj.read(1024 * 1024), b""):
+                    digest.update(chunk)
+                    out.write(chunk)
+            actual = digest.hexdigest()
+            if sha256 is not None and actual != sha256.lower():
+                raise ValueError(f"SHA-256 mismatch for {asset}: expected {sha256}, got {actual}")
+            dest = self.blob_path(actual)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            with self._locked():
+                os.replace(tmp, dest)
+                return self._index(repo, tag, asset, actual, dest)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _index(self, repo: str, tag: str, asset: str, sha256: str, blob: Path) -> CacheEntry:
+        """Add an entry for ``blob``; call with the lock held."""
+        now = time.time()
+        entry = CacheEntry(repo=repo, tag=tag, asset=asset, sha256=sha256, size=blob.stat().st_size, created=now, last_used=now)
+        entries = self._load()
+        entries[entry.key] = entry
+        self._save(entries)
+        return entry
+
+    def prune(self, *, max_bytes: int | None = None, max_age_days: float | None = None) -> list[CacheEntry]:
+        """Evict entries older than the age limit, then least-recently-used ones over the size limit.
+
+        Blobs no remaining entry references are deleted as well.
+        """
+        with self._locked():
+            return self._prune(self.max_bytes if max_bytes is None else max_bytes, self.max_age_days if max_age_days is None else max_age_days)
+
+    def _prune(self, max_bytes: int, max_age_days: float) -> list[CacheEntry]:
+        entries = self._load()
+        removed: list[CacheEntry] = []
+
+        cutoff = time.time() - max_age_days * 86400
+        for key, entry in list(entries.items()):
+            if entry.last_used < cutoff or not self.blob_path(entry.sha256).exists():
+                removed.append(entries.pop(key))
+
+        # Blobs may be shared between keys, so size is accounted per blob
+        def total_size() -> int:
+            return sum({e.sha256: e.size for e in entries.values()}.values())
+
+        for entry in sorted(entries.values(), key=lambda e: e.last_used):
+            if total_size() <= max_bytes:
+                break
+            removed.append(entries.pop(entry.key))
+
+        if removed:
+            self._save(entries)
+        self._remove_orphans(entries)
+        self._remove_partials(cutoff)
+        return removed
+
+    def verify(self) -> tuple[list[CacheEntry], list[CacheEntry]]:
+        """Re-hash every blob; drop entries whose archive is missing or corrupt.
+
+        Returns (ok, removed).
+        """
+        with self._locked():
+            return self._verify()
+
+    def _verify(self) -> tuple[list[CacheEntry], list[CacheEntry]]:
+        entries = self._load()
+        ok: list[CacheEntry] = []
+        removed: list[CacheEntry] = []
+        checked: dict[str, bool] = {}
+        for key, entry in list(entries.items()):
+            if entry.sha256 not in checked:
+                path = self.blob_path(entry.sha256)
+                try:
+                    checked[entry.sha256] = sha256_file(path) == entry.sha256
+                except OSError:
+                    checked[entry.sha256] = False
+                if not checked[entry.sha256]:
+                    path.unlink(missing_ok=True)
+            if checked[entry.sha256]:
+                ok.append(entry)
+            else:
+                removed.append(entries.pop(key))
+        if removed:
+            self._save(entries)
+        return ok, removed
+
+    def clear(self) -> list[CacheEntry]:
+        with self._locked():
+            removed = list(self._load().values())
+            self._save({})
+            self._remove_orphans({})
+            self._remove_partials(None)
+            self.releases_path.unlink(missing_ok=True)
+        return removed
+
+    def _remove_partials(self, cutoff: float | None) -> None:
+        """Delete interrupted downloads last written before ``cutoff`` (all when None)."""
+        if not self.partial_dir.is_dir():
+            return
+        for part in self.partial_dir.glob("*.part"):
+            try:
+                if cutoff is None or part.stat().st_mtime < cutoff:
+                    part.unlink()
+            except OSError:
+                pass
+
+    def _remove_orphans(self, entries: dict[str, CacheEntry]) -> None:
+        if not self.blob_dir.is_dir():
+            return
+        live = {e.sha256 for e in entries.values()}
+        for blob in self.blob_dir.glob("*/*.zip"):
+            if blob.stem not in live:
+                blob.unlink(missing_ok=True)
@@ -0,0 +1,123 @@
+"""Resumable, integrity-checked streaming downloads.
+
+An interrupted transfer is continued with an HTTP ``Range`` request from the
+bytes already written: within a run when the connection drops mid-stream, and
+across runs when the sink is a ``.part`` file left behind by a failed attempt.
+The finished download is checked against the size and SHA-256 published for
+the release asset.
+"""
+
+import hashlib
+import os
+import re
+from typing import BinaryIO, Callable
+
+import httpx
+
+# Mid-stream failures resumed within one call (SPECIFY_DOWNLOAD_RESUME_ATTEMPTS)
+DEFAULT_RESUME_ATTEMPTS = 3
+
+_RESUMABLE_ERRORS = (
+    httpx.ReadError,
+    httpx.ReadTimeout,
+    httpx.RemoteProtocolError,
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+)
+
+
+class DownloadError(RuntimeError):
+    pass
+
+
+class IntegrityError(DownloadError):
+    """The completed download does not match the published size or digest."""
+
+
+def content_range_start(value: str | None) -> int | None:
+    """Return the first byte position of a ``Content-Range: bytes a-b/n`` header."""
+    match = re.match(r"\s*bytes\s+(\d+)-\d+/(?:\d+|\*)\s*$", value or "")
+    return int(match.group(1)) if match else None
+
+
+def _rewind(sink: BinaryIO) -> None:
+    sink.seek(0)
+    sink.truncate()
+
+
+def fetch_resumable(client: httpx.Client, url: str, sink: BinaryIO, *, headers: dict | None = None, expected_size: int | None = None, chunk_size: int = 64 * 1024, attempts: int = DEFAULT_RESUME_ATTEMPTS, on_progress: Callable[[int, int | None], None] | None = None) -> tuple[str, int, int]:
+    """Download ``url`` into ``sink``, continuing after any bytes it already holds.
+
+    ``sink`` must be open for reading and writing. Existing content is re-hashed
+    and requested again only from its end (``Range: bytes=<n>-``); a server that
+    ignores the range (200) or rejects it (416) causes a restart from zero.
+    Dropped connections are resumed up to ``attempts`` times.
+
+    Returns (sha256 hex, total size, bytes that were already present).
+    """
+    digest = hashlib.sha256()
+    sink.seek(0, os.SEEK_END)
+    offset = sink.tell()
+    if expected_size is not None and offset > expected_size:
+        _rewind(sink)
+        offset = 0
+    if offset:
+        sink.seek(0)
+        remaining = offset
+        while remaining:
+            chunk = sink.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+        sink.seek(offset)
+    resumed_from = offset
+
+    failures = 0
+    while expected_size is None or offset < expected_size:
+        request_headers = dict(headers or {})
+        if offset:
+            request_headers["Range"] = f"bytes={offset}-"
+        try:
+            with client.stream("GET", url, headers=request_headers, follow_redirects=True) as response:
+                status = response.status_code
+                restart = offset and (
+                    status in (200, 416)
+                    or (status == 206 and content_range_start(response.headers.get("content-range")) != offset)
+                )
+                if restart:
+                    _rewind(sink)
+                    digest = hashlib.sha256()
+                    offset = resumed_from = 0
+                    if status != 200:
+                        continue
+                elif status not in (200, 206):
+                    body_sample = response.read()[:400].decode("utf-8", "replace")
+                    raise DownloadError(f"Download failed with {status}\nHeaders: {response.headers}\nBody (truncated): {body_sample}")
+
+                length = response.headers.get("content-length")
+                total = offset + int(length) if length and length.isdigit() else expected_size
+                if on_progress:
+                    on_progress(offset, total)
+                for chunk in response.iter_bytes(chunk_size=chunk_size):
+                    sink.write(chunk)
+                    digest.update(chunk)
+                    offset += len(chunk)
+                    if on_progress:
+                        on_progress(offset, total)
+            break
+        except _RESUMABLE_ERRORS:
+            failures += 1
+            if failures > attempts:
+                raise
+            sink.flush()
+    sink.flush()
+    return digest.hexdigest(), offset, resumed_from
+
+
+def check_integrity(name: str, size: int, sha256: str, *, expected_size: int | None = None, expected_sha256: str | None = None) -> None:
+    """Raise IntegrityError when a download differs from its published size/digest."""
+    if expected_size is not None and size != expected_size:
+        raise IntegrityError(f"Size mismatch for {name}: expected {expected_size:,} bytes, got {size:,}")
+    if expected_sha256 and sha256 != expected_sha256.lower():
+        raise IntegrityError(f"SHA-256 mismatch for {name}: expected {expected_sha256}, got {sha256}")
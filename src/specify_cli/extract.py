@@ -0,0 +1,227 @@
+"""Single-pass extraction of template archives.
+
+Members are streamed straight from the zip to their final path. A GitHub-style
+single root directory (``spec-kit-<ai>-<script>/...``) is stripped on the fly,
+so no temporary extraction directory or flatten step is needed.
+
+When merging into an existing directory, files that are already identical
+to the archive member are left untouched, so file watchers only see real
+changes. Archives built by packaging.py carry ``.specify/manifest.json`` with
+per-file SHA-256 values; without one, same-size files are compared byte by byte.
+"""
+
+import hashlib
+import json
+import os
+import stat
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from .packaging import MANIFEST_PATH
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass
+class ExtractResult:
+    files: int = 0
+    directories: int = 0
+    flattened: bool = False
+    top_level: list[str] = field(default_factory=list)
+    existing: list[str] = field(default_factory=list)  # top-level items that were merged/overwritten
+    created: int = 0    # files that did not exist before
+    updated: int = 0    # existing files whose content changed
+    unchanged: int = 0  # existing files left untouched because they already matched
+    hashes: dict[str, str] = field(default_factory=dict)  # relative path -> SHA-256 of the template file
+    executable: int = 0  # files given execute bits from the archive's Unix modes
+
+
+def archive_root(names: list[str]) -> str | None:
+    """Return the single root directory shared by every member, or None."""
+    root = None
+    nested = False
+    for name in names:
+        parts = PurePosixPath(name).parts
+        if not parts:
+            continue
+        if root is None:
+            root = parts[0]
+        elif parts[0] != root:
+            return None
+        if len(parts) > 1 or name.endswith("/"):
+            nested = True
+    return root if nested else None
+
+
+def member_path(name: str, strip: str | None) -> PurePosixPath | None:
+    """Map a member name to its relative destination, or None if it maps to the root.
+
+    Raises ValueError for absolute paths or ``..`` components.
+    """
+    path = PurePosixPath(name.replace("\\", "/"))
+    if path.is_absolute() or ".." in path.parts or (path.parts and ":" in path.parts[0]):
+        raise ValueError(f"Unsafe path in archive: {name}")
+    parts = path.parts
+    if strip is not None and parts and parts[0] == strip:
+        parts = parts[1:]
+    return PurePosixPath(*parts) if parts else None
+
+
+def read_manifest(zf: zipfile.ZipFile, strip: str | None = None) -> dict[str, dict] | None:
+    """Return the per-file entries of the archive's manifest, or None if it has none."""
+    name = f"{strip}/{MANIFEST_PATH}" if strip else MANIFEST_PATH
+    try:
+        files = json.loads(zf.read(name)).get("files")
+    except (KeyError, ValueError, AttributeError):
+        return None
+    return files if isinstance(files, dict) else None
+
+
+def matches_manifest(path: Path, entry: dict) -> bool:
+    """True if the file at ``path`` has the size and SHA-256 recorded in ``entry``."""
+    try:
+        if path.stat().st_size != entry.get("size"):
+            return False
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(COPY_BUFFER_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return False
+    return digest.hexdigest() == entry.get("sha256")
+
+
+def exec_bits(info: zipfile.ZipInfo) -> int:
+    """Execute bits recorded for a member by a Unix zip tool (0 if none or not Unix)."""
+    if info.create_system != 3 or os.name == "nt":
+        return 0
+    mode = info.external_attr >> 16
+    return mode & 0o111 if stat.S_ISREG(mode) else 0
+
+
+def add_exec_bits(mode: int, bits: int) -> int:
+    """``mode`` plus the requested execute bits wherever the matching read bit is set."""
+    return mode | (bits & ((mode & 0o444) >> 2)) | (bits & 0o100)
+
+
+def same_content(zf: zipfile.ZipFile, info: zipfile.ZipInfo, path: Path, digest=None) -> bool:
+    """True if the file at ``path`` is byte-identical to the archive member.
+
+    ``digest`` (a hashlib object) is fed the member bytes that were compared.
+    """
+    try:
+        with zf.open(info) as src, open(path, "rb") as existing:
+            while True:
+                a = src.read(COPY_BUFFER_SIZE)
+                if digest is not None:
+                    digest.update(a)
+                if a != existing.read(len(a)):
+                    return False
+                if not a:
+                    return existing.read(1) == b""
+    except OSError:
+        return False
+
+
+def extract_template(zf: zipfile.ZipFile, dest: Path, *, only: tuple[str, ...] | None = None, skip_unchanged: bool = True) -> ExtractResult:
+    """Stream every member of ``zf`` into ``dest`` in one pass.
+
+    Existing directories are merged and existing files overwritten, matching
+    the previous copytree/copy2 behaviour for ``--here``. With ``only``, members
+    outside those top-level names (after root stripping) are skipped. With
+    ``skip_unchanged``, an existing file of the same size is only rewritten if
+    its content differs (checked against the manifest when the archive has one).
+    Execute bits stored in the archive (Unix ``external_attr``) are applied to
+    the files as they are written, so scripts need no separate chmod pass. The
+    packaging manifest is only read from the archive, never written to ``dest``.
+    """
+    infos = zf.infolist()
+    strip = archive_root([i.filename for i in infos])
+    result = ExtractResult(flattened=strip is not None)
+    manifest = read_manifest(zf, strip) if skip_unchanged else None
+    seen_top: set[str] = set()
+    made_dirs: set[Path] = set()
+
+    def ensure_dir(path: Path) -> None:
+        if path not in made_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            made_dirs.add(path)
+
+    for info in infos:
+        rel = member_path(info.filename, strip)
+        if rel is None or rel.as_posix() == MANIFEST_PATH:
+            continue
+        top = rel.parts[0]
+        if only is not None and top not in only:
+            continue
+        if top not in seen_top:
+            seen_top.add(top)
+            result.top_level.append(top)
+            if (dest / top).exists():
+                result.existing.append(top)
+
+        target = dest.joinpath(*rel.parts)
+        if info.is_dir():
+            ensure_dir(target)
+            result.directories += 1
+            continue
+
+        bits = exec_bits(info)
+        existing_st = None
+        if top in result.existing:
+            try:
+                existing_st = os.stat(target)
+            except OSError:
+                pass
+            if existing_st is not None and skip_unchanged and existing_st.st_size == info.file_size:
+                entry = manifest.get(rel.as_posix()) if manifest is not None else None
+                if entry is not None:
+                    digest = None
+                    unchanged = matches_manifest(target, entry)
+                else:
+                    digest = hashlib.sha256()
+                    unchanged = same_content(zf, info, target, digest)
+                if unchanged:
+                    result.unchanged += 1
+                    result.hashes[rel.as_posix()] = entry["sha256"] if digest is None else digest.hexdigest()
+                    mode = add_exec_bits(existing_st.st_mode, bits)
+                    if mode != existing_st.st_mode:
+                        os.chmod(target, stat.S_IMODE(mode))
+                        result.executable += 1
+                    continue
+
+        ensure_dir(target.parent)
+        digest = hashlib.sha256()
+        with zf.open(info) as src, open(target, "wb") as out:
+            for chunk in iter(lambda: src.read(COPY_BUFFER_SIZE), b""):
+                digest.update(chunk)
+                out.write(chunk)
+            if bits:
+                st_mode = os.fstat(out.fileno()).st_mode
+                mode = add_exec_bits(st_mode, bits)
+                if mode != st_mode:
+                    os.fchmod(out.fileno(), stat.S_IMODE(mode))
+                    result.executable += 1
+        result.hashes[rel.as_posix()] = digest.hexdigest()
+        result.files += 1
+        if existing_st is not None:
+            result.updated += 1
+        else:
+            result.created += 1
+
+    return result
+
+
+def read_template(zf: zipfile.ZipFile, *, only: tuple[str, ...] | None = None) -> dict[str, bytes]:
+    """Return {relative path: bytes} for every file member, with the same root
+    stripping, ``only`` filtering and manifest exclusion as extract_template."""
+    infos = zf.infolist()
+    strip = archive_root([i.filename for i in infos])
+    files = {}
+    for info in infos:
+        rel = member_path(info.filename, strip)
+        if rel is None or info.is_dir() or rel.as_posix() == MANIFEST_PATH or (only is not None and rel.parts[0] not in only):
+            continue
+        files[rel.as_posix()] = zf.read(info)
+    return files
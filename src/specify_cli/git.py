@@ -0,0 +1,76 @@
+"""Git commands used while setting up a project.
+
+Every call runs ``git -C <path>``, so the process working directory is never
+changed and several projects can be set up from different threads. A single
+``rev-parse`` answers both "is git installed?" and "is this already a work
+tree?".
+"""
+
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+INITIAL_COMMIT_MESSAGE = "Initial commit from Specify template"
+
+
+class GitError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class GitProbe:
+    available: bool         # a git executable was found
+    inside_work_tree: bool  # path is inside an existing work tree
+    top_level: Path | None = None
+
+
+def _run(path: Path, *args: str, input: bytes | None = None, options: tuple[str, ...] = (), ok: tuple[int, ...] = (0,)) -> subprocess.CompletedProcess:
+    result = subprocess.run(["git", *options, "-C", str(path), *args], input=input, capture_output=True)
+    if result.returncode not in ok:
+        detail = result.stderr.decode("utf-8", "replace").strip() or f"exit status {result.returncode}"
+        raise GitError(f"git {args[0]} failed: {detail}")
+    return result
+
+
+def probe(path: Path) -> GitProbe:
+    """Check for git and an enclosing work tree with one process."""
+    if not Path(path).is_dir():
+        return GitProbe(available=True, inside_work_tree=False)
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(path), "rev-parse", "--is-inside-work-tree", "--show-toplevel"],
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        return GitProbe(available=False, inside_work_tree=False)
+    lines = result.stdout.splitlines()
+    if result.returncode != 0 or not lines or lines[0] != "true":
+        return GitProbe(available=True, inside_work_tree=False)
+    return GitProbe(available=True, inside_work_tree=True, top_level=Path(lines[1]) if len(lines) > 1 else None)
+
+
+def init_repo(path: Path, *, paths: Iterable[str] | None = None, message: str = INITIAL_COMMIT_MESSAGE) -> None:
+    """``git init`` plus an initial commit.
+
+    With ``paths`` only those files are staged; they are streamed to
+    ``git add --pathspec-from-file`` on stdin, so git does not hash the rest of
+    a large directory. They are literal paths: ``*``, ``?`` or ``[`` in a file
+    name never globs onto other files. Paths the project's ``.gitignore`` rules
+    exclude are left out, as ``git add -A`` would (naming them explicitly makes
+    ``git add`` fail). Otherwise everything is added (``git add -A``).
+    """
+    _run(path, "init", "-q")
+    if paths is None:
+        _run(path, "add", "-A")
+    else:
+        names = [p.encode("utf-8") for p in paths]
+        if names:
+            # exit status 1: none of the paths is ignored
+            ignored = set(_run(path, "check-ignore", "--stdin", "-z", input=b"\0".join(names) + b"\0", ok=(0, 1)).stdout.split(b"\0"))
+            names = [n for n in names if n not in ignored]
+        pathspec = b"".join(n + b"\0" for n in names)
+        if pathspec:
+            _run(path, "add", "--pathspec-from-file=-", "--pathspec-file-nul", "--", input=pathspec, options=("--literal-pathspecs",))
+    _run(path, "commit", "-q", "-m", message)
@@ -0,0 +1,212 @@
+"""Shared HTTP client with connection pooling and retry/backoff.
+
+Every network call in the CLI goes through one pooled ``httpx.Client`` per TLS
+mode (see get_http_client), so the GitHub API lookup and the template
+downloads reuse keep-alive connections. Transient failures (5xx, 429 and
+GitHub rate limiting) are retried with exponential backoff and full jitter,
+honoring ``Retry-After`` and ``X-RateLimit-Reset`` when the server sends them.
+
+Timeouts, pool limits, retries and HTTP/2 are configured through
+HttpSettings, which reads the ``SPECIFY_HTTP_*`` environment variables.
+"""
+
+import atexit
+import os
+import random
+import ssl
+import threading
+import time
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+
+import httpx
+import truststore
+
+from .cache import env_number
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+# Longest server-requested wait (Retry-After / rate-limit reset) we are willing to sleep
+DEFAULT_MAX_RETRY_WAIT = 60.0
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Only idempotent requests are replayed
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    raw = (os.getenv(name) or "").strip().lower()
+    if not raw:
+        return default
+    return raw in ("1", "true", "yes", "on")
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class HttpSettings:
+    timeout: float = DEFAULT_TIMEOUT
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    max_keepalive: int = DEFAULT_MAX_KEEPALIVE
+    retries: int = DEFAULT_RETRIES
+    backoff: float = DEFAULT_BACKOFF
+    max_backoff: float = DEFAULT_MAX_BACKOFF
+    max_retry_wait: float = DEFAULT_MAX_RETRY_WAIT
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls, **overrides) -> "HttpSettings":
+        """Build settings from SPECIFY_HTTP_* environment variables; keyword arguments win."""
+        settings = cls(
+            timeout=env_number("SPECIFY_HTTP_TIMEOUT", DEFAULT_TIMEOUT),
+            connect_timeout=env_number("SPECIFY_HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+            max_connections=int(env_number("SPECIFY_HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+            max_keepalive=int(env_number("SPECIFY_HTTP_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE)),
+            retries=max(0, int(env_number("SPECIFY_HTTP_RETRIES", DEFAULT_RETRIES))),
+            backoff=env_number("SPECIFY_HTTP_BACKOFF", DEFAULT_BACKOFF),
+            max_backoff=env_number("SPECIFY_HTTP_MAX_BACKOFF", DEFAULT_MAX_BACKOFF),
+            max_retry_wait=env_number("SPECIFY_HTTP_MAX_RETRY_WAIT", DEFAULT_MAX_RETRY_WAIT),
+            http2=_env_flag("SPECIFY_HTTP2"),
+        )
+        return replace(settings, **overrides) if overrides else settings
+
+
+def retry_after_seconds(response: httpx.Response, now: float | None = None) -> float | None:
+    """Return how long the server asked us to wait, or None if it did not say.
+
+    Looks at ``Retry-After`` (seconds or HTTP date) and, when GitHub reports an
+    exhausted rate limit (``X-RateLimit-Remaining: 0``), ``X-RateLimit-Reset``.
+    """
+    now = time.time() if now is None else now
+    headers = response.headers
+    retry_after = (headers.get("retry-after") or "").strip()
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+    if headers.get("x-ratelimit-remaining") == "0":
+        try:
+            return max(0.0, float(headers["x-ratelimit-reset"]) - now)
+        except (KeyError, ValueError):
+            pass
+    return None
+
+
+def is_retryable(response: httpx.Response) -> bool:
+    if response.status_code in RETRY_STATUSES:
+        return True
+    # GitHub signals primary/secondary rate limits with 403 as well
+    return response.status_code == 403 and (
+        "retry-after" in response.headers or response.headers.get("x-ratelimit-remaining") == "0"
+    )
+
+
+class RetryingClient(httpx.Client):
+    """httpx.Client that replays idempotent requests on transient failures.
+
+    Retrying in ``send`` (rather than in a transport) keeps httpx's own
+    transport setup, so proxy environment variables keep working.
+    """
+
+    def __init__(self, *args, settings: HttpSettings, sleep=time.sleep, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.settings = settings
+        self._sleep = sleep
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given (0-based) retry."""
+        cap = min(self.settings.max_backoff, self.settings.backoff * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        retries = self.settings.retries if request.method in RETRY_METHODS else 0
+        attempt = 0
+        while True:
+            try:
+                response = super().send(request, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadError, httpx.RemoteProtocolError):
+                if attempt >= retries:
+                    raise
+                self._sleep(self.backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            if attempt >= retries or not is_retryable(response):
+                return response
+            wait = retry_after_seconds(response)
+            if wait is None:
+                wait = self.backoff_delay(attempt)
+            elif wait > self.settings.max_retry_wait:
+                # e.g. a rate limit resetting in an hour: report it instead of hanging
+                return response
+            response.close()
+            self._sleep(wait)
+            attempt += 1
+
+
+_ssl_context = None
+
+
+def get_ssl_context() -> ssl.SSLContext:
+    """Return the shared truststore SSL context, creating it on first use."""
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    return _ssl_context
+
+
+def create_client(*, skip_tls: bool = False, settings: HttpSettings | None = None, transport: httpx.BaseTransport | None = None) -> RetryingClient:
+    """Create a pooled client with retries; the caller owns (and closes) it.
+
+    ``transport`` replaces the network transport (e.g. httpx.MockTransport).
+    HTTP/2 is only enabled when the ``h2`` package is installed.
+    """
+    settings = settings or HttpSettings.from_env()
+    return RetryingClient(
+        settings=settings,
+        verify=False if skip_tls else get_ssl_context(),
+        http2=settings.http2 and http2_available(),
+        limits=httpx.Limits(max_connections=settings.max_connections, max_keepalive_connections=settings.max_keepalive),
+        timeout=httpx.Timeout(settings.timeout, connect=settings.connect_timeout),
+        follow_redirects=True,
+        transport=transport,
+    )
+
+
+_shared: dict[bool, httpx.Client] = {}
+_shared_lock = threading.Lock()
+
+
+def get_http_client(skip_tls: bool = False) -> httpx.Client:
+    """Return the process-wide client for this TLS mode (closed at exit)."""
+    with _shared_lock:
+        client = _shared.get(skip_tls)
+        if client is None or client.is_closed:
+            client = _shared[skip_tls] = create_client(skip_tls=skip_tls)
+        return client
+
+
+def close_http_clients() -> None:
+    with _shared_lock:
+        for client in _shared.values():
+            client.close()
+        _shared.clear()
+
+
+atexit.register(close_http_clients)
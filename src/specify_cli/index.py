@@ -0,0 +1,198 @@
+"""Number allocation index for feature and unit-test directories.
+
+``.specify/index.json`` records, for each numbered directory (``specs`` and
+``tests``), the highest number handed out and a name -> path map of its
+entries. Allocating the next number reads this small file instead of listing
+the directory.
+
+Allocation holds an exclusive ``flock`` on ``.specify/index.lock`` (the bash
+scripts take the same lock with ``flock(1)``, or through perl or python3 where
+flock(1) is missing; the PowerShell scripts open the file exclusively), so
+parallel creators in one checkout are serialized; the kernel drops the lock if
+a process dies, so no stale lock is ever left behind. Under the lock the new
+directory is created with an exclusive ``mkdir``, which only guards its exact
+name: two directories with different names can still share a number if the
+index is stale, so the index has to stay accurate.
+
+The creation scripts hand the work to ``specify`` when it is installed. Without
+it they read a kind's entries from the index when it has them and the directory
+is not newer than ``index.json`` (``save`` only writes kinds that are current),
+but cannot write it: they delete it (under the lock) after creating a
+directory, and the next allocation rebuilds it from one scan.
+Otherwise the index is trusted while the directory's modification time
+matches the one recorded with it, which catches directories added or removed
+by hand or by a checkout (on filesystems with coarse timestamps, run
+``specify index rebuild`` after such changes).
+"""
+
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .locking import LockTimeout, exclusive
+
+INDEX_PATH = ".specify/index.json"
+LOCK_PATH = ".specify/index.lock"
+INDEX_VERSION = 1
+# Directories whose subdirectories are numbered NNN-name
+KINDS = ("specs", "tests")
+# Seconds to wait for another creator to release the lock
+LOCK_TIMEOUT = 10.0
+
+LEADING_NUMBER_RE = re.compile(r"^(\d+)")
+NUMBERED_NAME_RE = re.compile(r"^(\d{3})-")
+
+
+class IndexLockTimeout(LockTimeout):
+    pass
+
+
+def _mtime(path: Path) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def scan(directory: Path) -> dict:
+    """Index entry for ``directory`` built from one listing."""
+    highest = 0
+    entries: dict[str, str] = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                match = LEADING_NUMBER_RE.match(entry.name)
+                if match and entry.is_dir():
+                    highest = max(highest, int(match.group(1)))
+                    entries[entry.name] = f"{directory.name}/{entry.name}"
+    except FileNotFoundError:
+        pass
+    return {"highest": highest, "mtime_ns": _mtime(directory), "entries": dict(sorted(entries.items()))}
+
+
+def load(root: Path) -> dict:
+    try:
+        data = json.loads((root / INDEX_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION or not isinstance(data.get("kinds"), dict):
+        return {}
+    return data["kinds"]
+
+
+def save(root: Path, kinds: dict) -> None:
+    """Write the index, leaving out kinds whose directory changed since they were scanned.
+
+    Every kind in the file was accurate when it was written, so the scripts can
+    trust one whenever its directory is not newer than ``index.json``.
+    """
+    kinds = {kind: entry for kind, entry in kinds.items() if isinstance(entry, dict) and entry.get("mtime_ns") == _mtime(root / kind)}
+    path = root / INDEX_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ignore = path.parent / ".gitignore"
+    if not ignore.exists():
+        # The index describes this checkout only; keep it out of commits
+        ignore.write_text(f"{Path(INDEX_PATH).name}\n{Path(LOCK_PATH).name}\n", encoding="utf-8")
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".index-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "kinds": kinds}, f, indent=2)
+            f.write("\n")
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def locked(root: Path, timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """Hold the exclusive lock on ``.specify/index.lock`` for the duration of the block."""
+    lock = root / LOCK_PATH
+    message = f"Timed out after {timeout:g}s waiting for {lock}; another specify command is still creating a feature"
+    with exclusive(lock, timeout, IndexLockTimeout, message):
+        yield
+
+
+def _current(root: Path, kinds: dict, kind: str) -> dict:
+    """Entry for ``kind``, rescanned if the directory changed behind the index's back."""
+    entry = kinds.get(kind)
+    directory = root / kind
+    if (
+        isinstance(entry, dict)
+        and entry.get("mtime_ns") == _mtime(directory)
+        and type(entry.get("highest")) is int
+        and isinstance(entry.get("entries"), dict)
+    ):
+        return entry
+    return scan(directory)
+
+
+def reserve(root: Path, kind: str, name_for: Callable[[str], str]) -> tuple[str, Path]:
+    """Create the next numbered directory under ``root/kind``; call with the lock held.
+
+    ``name_for`` turns the zero-padded number into the directory name. Returns
+    (number, new directory).
+    """
+    directory = root / kind
+    directory.mkdir(parents=True, exist_ok=True)
+    kinds = load(root)
+    entry = _current(root, kinds, kind)
+    highest = entry["highest"]
+    while True:
+        number = f"{highest + 1:03d}"
+        name = name_for(number)
+        path = directory / name
+        try:
+            path.mkdir()
+            break
+        except FileExistsError:
+            highest += 1
+    entry["highest"] = int(number)
+    entry["entries"][name] = f"{kind}/{name}"
+    entry["mtime_ns"] = _mtime(directory)
+    kinds[kind] = entry
+    save(root, kinds)
+    return number, path
+
+
+def unreserve(root: Path, kind: str, name: str) -> None:
+    """Undo a reservation whose directory is still empty; call with the lock held."""
+    try:
+        (root / kind / name).rmdir()
+    except OSError:
+        pass
+    kinds = load(root)
+    entry = _current(root, kinds, kind)
+    entry["entries"].pop(name, None)
+    kinds[kind] = entry
+    save(root, kinds)
+
+
+def allocate(root: Path, kind: str, name_for: Callable[[str], str]) -> tuple[str, Path]:
+    """Lock, reserve the next numbered directory and unlock."""
+    with locked(root):
+        return reserve(root, kind, name_for)
+
+
+def latest(root: Path, kind: str) -> str | None:
+    """Name of the highest-numbered directory under ``root/kind`` (read-only, no lock)."""
+    entry = _current(root, load(root), kind)
+    best, best_num = None, -1
+    for name in entry["entries"]:
+        match = NUMBERED_NAME_RE.match(name)
+        if match and int(match.group(1)) > best_num:
+            best, best_num = name, int(match.group(1))
+    return best
+
+
+def rebuild(root: Path) -> dict:
+    """Rescan every numbered directory and rewrite the index; returns the new contents."""
+    with locked(root):
+        kinds = {kind: scan(root / kind) for kind in KINDS}
+        save(root, kinds)
+    return kinds
@@ -0,0 +1,75 @@
+"""Exclusive advisory file locks shared by the number index and the template cache.
+
+The lock is ``flock`` on POSIX and ``msvcrt.locking`` on Windows, taken on a
+dedicated lock file. Each holder opens its own descriptor, so the lock
+serializes threads of one process as well as separate processes, and the
+kernel drops it if the holder dies, so no stale lock is ever left behind.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class LockTimeout(RuntimeError):
+    pass
+
+
+@contextmanager
+def exclusive(lock: Path, timeout: float, error: type[LockTimeout] = LockTimeout, message: str | None = None) -> Iterator[None]:
+    """Hold an exclusive lock on the file ``lock`` for the duration of the block.
+
+    Raises ``error`` (with ``message``, or a generic one) after ``timeout`` seconds.
+    """
+    lock.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    fd = None
+    while True:
+        try:
+            if fd is None:
+                fd = os.open(lock, os.O_RDWR | os.O_CREAT, 0o644)
+            if _try_lock(fd):
+                break
+        except PermissionError:
+            pass  # held with exclusive sharing by a PowerShell script (Windows)
+        if time.monotonic() >= deadline:
+            if fd is not None:
+                os.close(fd)
+            raise error(message or f"Timed out after {timeout:g}s waiting for {lock}")
+        time.sleep(0.01)
+    try:
+        yield
+    finally:
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
@@ -0,0 +1,137 @@
+"""Deterministic zip writer for release packages.
+
+Identical staging trees always produce byte-identical archives: entries are
+written in sorted order with a fixed timestamp, Unix permissions are
+normalized to 0755/0644 and no host-specific extra fields are stored. Each
+archive embeds ``.specify/manifest.json`` with the size, mode and SHA-256 of
+every file, which ``specify init`` uses to skip files that already match.
+
+Standard library only, so the packaging script can run it from a checkout::
+
+    python3 src/specify_cli/packaging.py <staging-dir> <archive.zip> --epoch 1700000000
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import stat
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+MANIFEST_PATH = ".specify/manifest.json"
+MANIFEST_VERSION = 1
+# Zip timestamps cannot predate 1980-01-01
+ZIP_MIN_EPOCH = 315532800
+
+_DIR_MODE = stat.S_IFDIR | 0o755
+_EXEC_MODE = stat.S_IFREG | 0o755
+_FILE_MODE = stat.S_IFREG | 0o644
+
+
+def _date_time(epoch: int) -> tuple:
+    return time.gmtime(max(epoch, ZIP_MIN_EPOCH))[:6]
+
+
+def _zip_info(name: str, date_time: tuple, mode: int) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time)
+    info.create_system = 3  # Unix, so external_attr carries the mode
+    info.external_attr = mode << 16
+    if stat.S_ISDIR(mode):
+        info.external_attr |= 0x10  # MS-DOS directory flag
+    else:
+        info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+
+def _sorted_tree(src: Path) -> tuple[list[str], list[str]]:
+    """Return (directories, files) below ``src`` as sorted POSIX relative paths."""
+    dirs, files = [], []
+    for current, dirnames, filenames in os.walk(src):
+        dirnames.sort()
+        rel = Path(current).relative_to(src)
+        for d in dirnames:
+            dirs.append((rel / d).as_posix())
+        for f in sorted(filenames):
+            files.append((rel / f).as_posix())
+    return sorted(dirs), sorted(files)
+
+
+def build_manifest(src: Path, files: list[str], extra: dict | None = None) -> dict:
+    entries = {}
+    for rel in files:
+        path = src / rel
+        data = path.read_bytes()
+        entries[rel] = {
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "size": len(data),
+            "mode": "755" if os.stat(path).st_mode & 0o111 else "644",
+        }
+    manifest = dict(extra or {})
+    manifest["version"] = MANIFEST_VERSION
+    manifest["files"] = entries
+    return manifest
+
+
+def write_deterministic_zip(src: Path, dest: Path, *, root: str | None = None, epoch: int = ZIP_MIN_EPOCH, extra: dict | None = None) -> dict:
+    """Zip the tree at ``src`` into ``dest`` reproducibly and return the embedded manifest.
+
+    Members are stored under ``root/`` (default: the name of ``src``). Symlinks
+    are followed. Any existing manifest in ``src`` is replaced.
+    """
+    src = Path(src)
+    root = src.name if root is None else root
+    dirs, files = _sorted_tree(src)
+    files = [f for f in files if f != MANIFEST_PATH]
+    manifest = build_manifest(src, files, extra)
+    manifest_bytes = (json.dumps(manifest, indent=2, sort_keys=True, ensure_ascii=False) + "\n").encode("utf-8")
+
+    manifest_dir = MANIFEST_PATH.rsplit("/", 1)[0]
+    if manifest_dir not in dirs:
+        dirs = sorted(dirs + [manifest_dir])
+    members = [(d + "/", None) for d in dirs] + [(f, f) for f in files] + [(MANIFEST_PATH, None)]
+    members.sort(key=lambda m: m[0])
+
+    date_time = _date_time(epoch)
+    prefix = f"{root}/" if root else ""
+    tmp = dest.with_name(f".{dest.name}.tmp")
+    with zipfile.ZipFile(tmp, "w", compresslevel=9) as zf:
+        if root:
+            zf.writestr(_zip_info(prefix, date_time, _DIR_MODE), b"")
+        for name, rel in members:
+            if name.endswith("/"):
+                zf.writestr(_zip_info(prefix + name, date_time, _DIR_MODE), b"")
+            elif rel is None:
+                zf.writestr(_zip_info(prefix + name, date_time, _FILE_MODE), manifest_bytes)
+            else:
+                mode = _EXEC_MODE if manifest["files"][rel]["mode"] == "755" else _FILE_MODE
+                zf.writestr(_zip_info(prefix + name, date_time, mode), (src / rel).read_bytes())
+    os.replace(tmp, dest)
+    return manifest
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Write a reproducible release zip with an embedded manifest.")
+    parser.add_argument("src", type=Path, help="Staging directory to archive")
+    parser.add_argument("dest", type=Path, help="Zip file to write")
+    parser.add_argument("--root", help="Top-level directory name inside the archive (default: name of src)")
+    parser.add_argument("--epoch", type=int, default=int(os.getenv("SOURCE_DATE_EPOCH") or ZIP_MIN_EPOCH), help="Timestamp for every entry (default: SOURCE_DATE_EPOCH)")
+    parser.add_argument("--meta", action="append", default=[], metavar="KEY=VALUE", help="Extra manifest field (repeatable)")
+    args = parser.parse_args(argv)
+
+    extra = {}
+    for item in args.meta:
+        key, sep, value = item.partition("=")
+        if not sep or not key:
+            parser.error(f"--meta expects KEY=VALUE, got {item!r}")
+        extra[key] = value
+    if not args.src.is_dir():
+        parser.error(f"not a directory: {args.src}")
+    write_deterministic_zip(args.src, args.dest, root=args.root, epoch=args.epoch, extra=extra)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
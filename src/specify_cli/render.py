@@ -0,0 +1,187 @@
+"""Render agent command files from ``templates/commands/*.md``.
+
+Each command template is parsed once (front matter, including the per-script
+``scripts:`` commands, plus the body) and cached; the Markdown and TOML
+variants for every agent and script type are produced from that parsed form.
+Placeholders are replaced as plain text, so backslashes in templates survive
+as written (TOML output escapes them as the format requires).
+
+The module only needs the standard library so the release packaging script
+can run it straight from a checkout::
+
+    python3 src/specify_cli/render.py --templates templates/commands --out .genreleases/stage
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class AgentLayout:
+    label: str          # display name written into the agent rules file
+    commands_dir: str   # where command files live inside a project
+    format: str         # "md" or "toml"
+    rules_dir: str      # where specify-rules.md goes
+
+
+# Mirrors the per-agent layout in create-release-packages.sh
+AGENT_LAYOUTS = {
+    "claude": AgentLayout("Claude Code", ".claude/commands", "md", ".claude/rules"),
+    "gemini": AgentLayout("Gemini CLI", ".gemini/commands", "toml", ".gemini/rules"),
+    "copilot": AgentLayout("GitHub Copilot", ".github/prompts", "md", ".github/copilot"),
+    "cursor": AgentLayout("Cursor", ".cursor/commands", "md", ".cursor/rules"),
+    "qwen": AgentLayout("Qwen Code", ".qwen/commands", "toml", ".qwen/rules"),
+    "opencode": AgentLayout("opencode", ".opencode/command", "md", ".opencode/rules"),
+    "codex": AgentLayout("Codex CLI", ".codex/commands", "md", ".codex/rules"),
+    "windsurf": AgentLayout("Windsurf", ".windsurf/workflows", "md", ".windsurf/rules"),
+    "kilocode": AgentLayout("Kilo Code", ".kilocode/commands", "md", ".kilocode/rules"),
+    "auggie": AgentLayout("Auggie CLI", ".auggie/commands", "md", ".auggie/rules"),
+    "roo": AgentLayout("Roo Code", ".roo/commands", "md", ".roo/rules"),
+}
+SCRIPT_TYPES = ("sh", "ps")
+# What {ARGS} becomes in each output format
+ARG_PLACEHOLDERS = {"md": "$ARGUMENTS", "toml": "{{args}}"}
+
+
+@dataclass(frozen=True)
+class CommandTemplate:
+    name: str
+    description: str
+    scripts: dict[str, str]
+    front_matter: str   # front matter lines without the scripts: block
+    body: str           # everything after the closing ---
+
+
+def split_front_matter(text: str) -> tuple[list[str], str]:
+    """Return (front matter lines, body); no front matter gives ([], text)."""
+    lines = text.splitlines(keepends=True)
+    if not lines or lines[0].rstrip("\r\n") != "---":
+        return [], text
+    for i in range(1, len(lines)):
+        if lines[i].rstrip("\r\n") == "---":
+            return [l.rstrip("\r\n") for l in lines[1:i]], "".join(lines[i + 1:])
+    return [], text
+
+
+def _scalar(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def parse_command_template(text: str, name: str) -> CommandTemplate:
+    """Parse a command template: ``description``, the ``scripts:`` mapping and the body.
+
+    Only the flat ``key: value`` front matter these templates use is understood
+    (plus one nested mapping for ``scripts``).
+    """
+    fm_lines, body = split_front_matter(text)
+    description = ""
+    scripts: dict[str, str] = {}
+    kept: list[str] = []
+    in_scripts = False
+    for line in fm_lines:
+        indented = line[:1] in (" ", "\t")
+        if in_scripts and indented:
+            key, sep, value = line.strip().partition(":")
+            if sep:
+                scripts[key.strip()] = value.strip()
+            continue
+        in_scripts = False
+        key, sep, value = line.partition(":")
+        if sep and not indented and key.strip() == "scripts":
+            in_scripts = True
+            continue
+        if sep and not indented and key.strip() == "description":
+            description = _scalar(value)
+        kept.append(line)
+    return CommandTemplate(name=name, description=description, scripts=scripts, front_matter="\n".join(kept), body=body)
+
+
+@lru_cache(maxsize=None)
+def _load_template(path: str, mtime_ns: int, size: int) -> CommandTemplate:
+    p = Path(path)
+    return parse_command_template(p.read_text(encoding="utf-8"), p.stem)
+
+
+def load_command_templates(directory: Path) -> list[CommandTemplate]:
+    """Parse every ``*.md`` command template in ``directory`` (cached per file version)."""
+    templates = []
+    for path in sorted(Path(directory).glob("*.md")):
+        st = path.stat()
+        templates.append(_load_template(str(path.resolve()), st.st_mtime_ns, st.st_size))
+    return templates
+
+
+def _substitute(text: str, template: CommandTemplate, agent: str, script_type: str, fmt: str) -> str:
+    script = template.scripts.get(script_type)
+    if script is not None:
+        text = text.replace("{SCRIPT}", script)
+    text = text.replace("{ARGS}", ARG_PLACEHOLDERS[fmt])
+    if fmt == "toml":
+        text = text.replace("$ARGUMENTS", ARG_PLACEHOLDERS[fmt])
+    return text.replace("__AGENT__", agent)
+
+
+def _toml_basic(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _toml_multiline(value: str) -> str:
+    # Multi-line basic string: escape backslashes and break up any """ run
+    return value.replace("\\", "\\\\").replace('"""', '""\\"')
+
+
+def render_command(template: CommandTemplate, agent: str, script_type: str, fmt: str) -> str:
+    """Return the command file text for one agent, script type and format."""
+    body = _substitute(template.body, template, agent, script_type, fmt).strip("\n")
+    if fmt == "toml":
+        description = _substitute(template.description, template, agent, script_type, fmt)
+        return f'description = "{_toml_basic(description)}"\n\nprompt = """\n{_toml_multiline(body)}\n"""\n'
+    front_matter = _substitute(template.front_matter, template, agent, script_type, fmt)
+    if front_matter:
+        return f"---\n{front_matter}\n---\n\n{body}\n"
+    return f"{body}\n"
+
+
+def render_agent_commands(templates: list[CommandTemplate], agent: str, script_type: str, dest: Path) -> list[Path]:
+    """Write every command for ``agent``/``script_type`` under ``dest`` (the project root)."""
+    layout = AGENT_LAYOUTS[agent]
+    out_dir = Path(dest) / layout.commands_dir
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for template in templates:
+        path = out_dir / f"{template.name}.{layout.format}"
+        path.write_text(render_command(template, agent, script_type, layout.format), encoding="utf-8", newline="\n")
+        written.append(path)
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Render agent command files for release packages.")
+    parser.add_argument("--templates", type=Path, default=Path("templates/commands"), help="Directory of command templates")
+    parser.add_argument("--out", type=Path, required=True, help="Output root; each variant goes to spec-kit-<agent>-<script>/")
+    parser.add_argument("--agents", default=",".join(AGENT_LAYOUTS), help="Comma-separated agents (default: all)")
+    parser.add_argument("--scripts", default=",".join(SCRIPT_TYPES), help="Comma-separated script types (default: sh,ps)")
+    args = parser.parse_args(argv)
+
+    agents = [a for a in args.agents.split(",") if a]
+    unknown = [a for a in agents if a not in AGENT_LAYOUTS]
+    if unknown:
+        parser.error(f"unknown agent(s): {', '.join(unknown)}")
+    templates = load_command_templates(args.templates)
+    if not templates:
+        print(f"No command templates found in {args.templates}", file=sys.stderr)
+        return 1
+    for agent in agents:
+        for script_type in (s for s in args.scripts.split(",") if s):
+            render_agent_commands(templates, agent, script_type, args.out / f"spec-kit-{agent}-{script_type}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""Discovery of the command-line tools ``specify`` looks for.
+
+``PATH`` is listed once with ``os.scandir`` into a name index, so checking a
+dozen tools costs one pass over ``PATH`` instead of a full ``shutil.which``
+walk per tool. Known install locations outside ``PATH`` (Claude's
+``~/.claude/local/claude`` after ``claude migrate-installer``) are checked
+first. ``--version`` can be probed for every found tool in parallel.
+
+Results are cached in the user cache directory under a fingerprint of
+``PATH``: its value plus the modification time of each directory on it, so
+installing or removing a tool invalidates the cached answer.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from .cache import default_cache_dir, env_number
+
+# Special handling for Claude CLI after `claude migrate-installer`
+# See: https://github.com/github/spec-kit/issues/123
+# The migrate-installer command REMOVES the original executable from PATH
+# and creates an alias at ~/.claude/local/claude instead
+# This path should be prioritized over other claude executables in PATH
+CLAUDE_LOCAL_PATH = Path.home() / ".claude" / "local" / "claude"
+SPECIAL_LOCATIONS = {"claude": (CLAUDE_LOCAL_PATH,)}
+
+CACHE_FILE = "tools.json"
+CACHE_VERSION = 1
+# Seconds a single ``<tool> --version`` may take (SPECIFY_TOOL_PROBE_TIMEOUT)
+DEFAULT_PROBE_TIMEOUT = 5.0
+
+
+@dataclass
+class ToolInfo:
+    name: str
+    path: str | None = None
+    version: str | None = None
+
+    @property
+    def found(self) -> bool:
+        return self.path is not None
+
+
+def _path_dirs(path_env: str) -> list[str]:
+    return list(dict.fromkeys(d for d in path_env.split(os.pathsep) if d))
+
+
+def _pathext() -> list[str]:
+    if os.name != "nt":
+        return []
+    return [e.lower() for e in (os.getenv("PATHEXT") or ".COM;.EXE;.BAT;.CMD").split(os.pathsep) if e]
+
+
+class PathIndex:
+    """Executable names on ``PATH``, in ``PATH`` order, from one directory listing each."""
+
+    def __init__(self, path_env: str | None = None):
+        self.path_env = os.getenv("PATH", os.defpath) if path_env is None else path_env
+        self._names: dict[str, list[str]] = {}
+        exts = _pathext()
+        for directory in _path_dirs(self.path_env):
+            try:
+                with os.scandir(directory) as it:
+                    names = [entry.name for entry in it]
+            except OSError:
+                continue
+            for name in names:
+                key = name.lower() if exts else name
+                if exts:
+                    stem, ext = os.path.splitext(key)
+                    if ext in exts:
+                        self._names.setdefault(stem, []).append(os.path.join(directory, name))
+                self._names.setdefault(key, []).append(os.path.join(directory, name))
+
+    def which(self, name: str) -> str | None:
+        """First executable file called ``name`` on PATH, like shutil.which."""
+        for candidate in self._names.get(name.lower() if os.name == "nt" else name, ()):
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                return candidate
+        return None
+
+
+@lru_cache(maxsize=4)
+def path_index(path_env: str) -> PathIndex:
+    """Shared index for a PATH value, built on first use in this process."""
+    return PathIndex(path_env)
+
+
+def find_tool(name: str, index: PathIndex | None = None) -> str | None:
+    """Path of ``name`` from its special install locations or PATH, or None."""
+    for location in SPECIAL_LOCATIONS.get(name, ()):
+        if location.is_file():
+            return str(location)
+    return (index or path_index(os.getenv("PATH", os.defpath))).which(name)
+
+
+def path_fingerprint(path_env: str | None = None) -> str:
+    """Hash of PATH and the state of every directory on it (and the special locations)."""
+    path_env = os.getenv("PATH", os.defpath) if path_env is None else path_env
+    digest = hashlib.sha256(path_env.encode("utf-8", "surrogateescape"))
+    digest.update(";".join(_pathext()).encode())
+    locations = _path_dirs(path_env) + [str(p) for paths in SPECIAL_LOCATIONS.values() for p in paths]
+    for location in locations:
+        try:
+            stamp = os.stat(location).st_mtime_ns
+        except OSError:
+            stamp = -1
+        digest.update(f"\0{location}\0{stamp}".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
+
+def probe_version(path: str, timeout: float | None = None) -> str | None:
+    """First line printed by ``<path> --version``, or None if it fails."""
+    if timeout is None:
+        timeout = env_number("SPECIFY_TOOL_PROBE_TIMEOUT", DEFAULT_PROBE_TIMEOUT)
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=timeout, stdin=subprocess.DEVNULL)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    for line in (result.stdout or result.stderr).splitlines():
+        if line.strip():
+            return line.strip()
+    return None
+
+
+def _cache_path() -> Path:
+    return default_cache_dir() / CACHE_FILE
+
+
+def _load_cached(fingerprint: str) -> dict[str, ToolInfo]:
+    try:
+        data = json.loads(_cache_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION or data.get("fingerprint") != fingerprint:
+        return {}
+    tools = {}
+    for name, entry in (data.get("tools") or {}).items():
+        try:
+            tools[name] = ToolInfo(**entry)
+        except TypeError:
+            continue
+    return tools
+
+
+def _store_cached(fingerprint: str, tools: dict[str, ToolInfo]) -> None:
+    path = _cache_path()
+    payload = {"version": CACHE_VERSION, "fingerprint": fingerprint, "created": time.time(), "tools": {n: asdict(t) for n, t in sorted(tools.items())}}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tools-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def discover_tools(names: list[str], *, versions: bool = False, use_cache: bool = True, max_workers: int = 8) -> tuple[dict[str, ToolInfo], bool]:
+    """Locate ``names`` (and optionally their versions).
+
+    Returns ({name: ToolInfo}, served_from_cache). A cached answer is used only
+    when the PATH fingerprint still matches; tools missing from it (or missing a
+    version when ``versions`` is requested) are resolved and the cache updated.
+    """
+    fingerprint = path_fingerprint()
+    cached = _load_cached(fingerprint) if use_cache else {}
+    results: dict[str, ToolInfo] = {}
+    index = None
+    for name in names:
+        info = cached.get(name)
+        if info is None or (info.found and not os.path.exists(info.path)):
+            index = index or path_index(os.getenv("PATH", os.defpath))
+            info = ToolInfo(name, find_tool(name, index))
+        results[name] = info
+
+    to_probe = [info for info in results.values() if versions and info.found and info.version is None]
+    if to_probe:
+        if len(to_probe) == 1 or max_workers <= 1:
+            for info in to_probe:
+                info.version = probe_version(info.path)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(to_probe))) as pool:
+                for info, version in zip(to_probe, pool.map(lambda i: probe_version(i.path), to_probe)):
+                    info.version = version
+
+    from_cache = all(cached.get(n) is results[n] for n in names) and not to_probe
+    if use_cache and not from_cache:
+        _store_cached(fingerprint, {**cached, **results})
+    return results, from_cache
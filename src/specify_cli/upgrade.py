@@ -0,0 +1,224 @@
+"""In-place template upgrades for initialized projects.
+
+``specify init`` records what it installed in ``.specify/install-state.json``:
+where the template came from, the release, the agents and script type, and
+the SHA-256 of every file taken from the template. ``specify upgrade`` compares
+three versions of each file: the recorded one (base), the one on disk (local)
+and the one in the new release (new). It then touches only what needs it:
+
+- local file still matches base: replaced with the new version
+- edited locally, template unchanged: kept as is
+- edited on both sides: merged line by line; overlapping edits get conflict
+  markers (text) or the new version is written next to it as ``*.specify-new``
+
+The base contents are only fetched when a merge is actually needed.
+"""
+
+import difflib
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable
+
+STATE_PATH = ".specify/install-state.json"
+STATE_VERSION = 1
+NEW_SUFFIX = ".specify-new"
+
+
+@dataclass
+class InstallState:
+    release: str
+    ai: list[str]
+    script: str
+    files: dict[str, str]
+    repo: str | None = None     # "owner/name" for GitHub installs
+    source: str = "github"      # "github" or "local"
+    installed_at: str = ""
+
+
+def load_install_state(project: Path) -> InstallState | None:
+    try:
+        data = json.loads((project / STATE_PATH).read_text(encoding="utf-8"))
+        data.pop("version", None)
+        return InstallState(**data)
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def save_install_state(project: Path, state: InstallState) -> None:
+    path = project / STATE_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": STATE_VERSION, **asdict(state)}
+    payload["files"] = dict(sorted(state.files.items()))
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".install-state-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+            f.write("\n")
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def merge3(base: list[str], local: list[str], new: list[str], *, local_label: str = "local", new_label: str = "new") -> tuple[list[str], int]:
+    """Three-way merge of line lists; returns (merged lines, number of conflicts).
+
+    Regions changed on only one side take that side; regions changed
+    identically on both sides are taken once; anything else becomes a
+    ``<<<<<<< / ======= / >>>>>>>`` conflict block.
+    """
+    def blocks(other):
+        return [b for b in difflib.SequenceMatcher(None, base, other, autojunk=False).get_matching_blocks() if b.size]
+
+    # Regions where base, local and new all agree
+    sync = []
+    la, lb = blocks(local), blocks(new)
+    i = j = 0
+    while i < len(la) and j < len(lb):
+        a, b = la[i], lb[j]
+        start, end = max(a.a, b.a), min(a.a + a.size, b.a + b.size)
+        if start < end:
+            sync.append((start, end, a.b + start - a.a, b.b + start - b.a))
+        if a.a + a.size < b.a + b.size:
+            i += 1
+        else:
+            j += 1
+    sync.append((len(base), len(base), len(local), len(new)))
+
+    merged: list[str] = []
+    conflicts = 0
+    zb = zl = zn = 0
+    for start, end, lstart, nstart in sync:
+        base_part, local_part, new_part = base[zb:start], local[zl:lstart], new[zn:nstart]
+        if local_part == new_part or new_part == base_part:
+            merged.extend(local_part)
+        elif local_part == base_part:
+            merged.extend(new_part)
+        else:
+            conflicts += 1
+            merged.append(f"<<<<<<< {local_label}\n")
+            merged.extend(_terminated(local_part))
+            merged.append("=======\n")
+            merged.extend(_terminated(new_part))
+            merged.append(f">>>>>>> {new_label}\n")
+        size = end - start
+        merged.extend(base[start:end])
+        zb, zl, zn = end, lstart + size, nstart + size
+    return merged, conflicts
+
+
+def _terminated(lines: list[str]) -> list[str]:
+    # Keep conflict markers on their own line even if a side lacks a final newline
+    if lines and not lines[-1].endswith("\n"):
+        return lines[:-1] + [lines[-1] + "\n"]
+    return lines
+
+
+@dataclass
+class FileChange:
+    path: str
+    action: str                 # add, update, merge, conflict, keep, skip-deleted, remove, keep-removed
+    content: bytes | None = None
+    target: str | None = None   # where content goes if not ``path`` (``*.specify-new``)
+    conflicts: int = 0
+
+
+@dataclass
+class UpgradePlan:
+    changes: list[FileChange] = field(default_factory=list)
+    files: dict[str, str] = field(default_factory=dict)   # template hashes for the new install state
+    unchanged: int = 0
+
+    def count(self, action: str) -> int:
+        return sum(1 for c in self.changes if c.action == action)
+
+
+def _read(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+
+
+def plan_upgrade(project: Path, state: InstallState, new_files: dict[str, bytes], load_base: Callable[[], dict[str, bytes] | None], *, new_label: str = "new") -> UpgradePlan:
+    """Decide what to do with every template file; nothing is written.
+
+    ``load_base`` returns the previous release's files (or None if they are not
+    available) and is called at most once, only if some file needs a merge.
+    """
+    plan = UpgradePlan()
+    base_cache: list[dict[str, bytes] | None] = []
+
+    def base_of(rel: str) -> bytes | None:
+        if not base_cache:
+            base_cache.append(load_base())
+        data = (base_cache[0] or {}).get(rel)
+        # Only trust base content that matches what was recorded at install time
+        return data if data is not None and sha256_bytes(data) == state.files.get(rel) else None
+
+    for rel, new_data in sorted(new_files.items()):
+        new_hash = sha256_bytes(new_data)
+        plan.files[rel] = new_hash
+        base_hash = state.files.get(rel)
+        local = _read(project / rel)
+        local_hash = sha256_bytes(local) if local is not None else None
+
+        if local_hash == new_hash:
+            plan.unchanged += 1
+        elif local is None:
+            if base_hash is None:
+                plan.changes.append(FileChange(rel, "add", new_data))
+            else:
+                plan.changes.append(FileChange(rel, "skip-deleted"))
+        elif local_hash == base_hash:
+            plan.changes.append(FileChange(rel, "update", new_data))
+        elif new_hash == base_hash:
+            plan.changes.append(FileChange(rel, "keep"))
+        else:
+            plan.changes.append(_merge_change(rel, base_of(rel) if base_hash else None, local, new_data, new_label))
+
+    for rel, base_hash in sorted(state.files.items()):
+        if rel in new_files:
+            continue
+        local = _read(project / rel)
+        if local is None:
+            continue
+        if sha256_bytes(local) == base_hash:
+            plan.changes.append(FileChange(rel, "remove"))
+        else:
+            plan.changes.append(FileChange(rel, "keep-removed"))
+    return plan
+
+
+def _merge_change(rel: str, base: bytes | None, local: bytes, new: bytes, new_label: str) -> FileChange:
+    if base is not None:
+        try:
+            texts = [b.decode("utf-8") for b in (base, local, new)]
+        except UnicodeDecodeError:
+            texts = None
+        if texts is not None:
+            lines = [t.splitlines(keepends=True) for t in texts]
+            merged, conflicts = merge3(*lines, local_label="local", new_label=new_label)
+            content = "".join(merged).encode("utf-8")
+            return FileChange(rel, "conflict" if conflicts else "merge", content, conflicts=conflicts)
+    # No usable base (or binary): keep the local file, put the new one beside it
+    return FileChange(rel, "conflict", new, target=rel + NEW_SUFFIX, conflicts=1)
+
+
+def apply_upgrade(project: Path, plan: UpgradePlan) -> None:
+    for change in plan.changes:
+        path = project / (change.target or change.path)
+        if change.action == "remove":
+            path.unlink(missing_ok=True)
+        elif change.content is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(change.content)
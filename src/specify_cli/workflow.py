@@ -0,0 +1,569 @@
+"""In-process implementation of the workflow scripts.
+
+Equivalent to ``create-new-feature.sh``, ``setup-plan.sh`` and
+``check-prerequisites.sh`` (features under ``specs/``) and to
+``create-unit-test.sh``, ``setup-unit-plan.sh`` and
+``check-unit-prerequisites.sh`` (unit tests under ``tests/``), without bash:
+the repository root, git directory and current branch come from one
+``git rev-parse`` call (plus a read of ``HEAD``), numbers come from the
+``.specify/index.json`` allocator, and templates are copied directly.
+Results use the same keys as the scripts' ``--json`` output.
+
+``unit_status`` reports on every unit test at once and does not run git at
+all: HEAD and the branch refs are read from the git directory.
+
+Standard library only.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import index as numbering
+
+FEATURE_BRANCH_RE = re.compile(r"^(\d{3})-")
+UNIT_BRANCH_RE = re.compile(r"^(\d{3})-unit-")
+SPEC_TEMPLATE = ".specify/templates/spec-template.md"
+PLAN_TEMPLATE = ".specify/templates/plan-template.md"
+UNIT_TEST_TEMPLATE = ".specify/templates/unit-test-template.md"
+UNIT_PLAN_TEMPLATE = ".specify/templates/unit-test-plan-template.md"
+# Used for the branch when the project is not a git repository
+NO_GIT_BRANCH = "no-git-branch"
+# Overrides the current feature, like the scripts' SPECIFY_FEATURE
+FEATURE_ENV = "SPECIFY_FEATURE"
+
+
+class WorkflowError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class RepoContext:
+    root: Path
+    has_git: bool
+    git_dir: Path | None = None
+    branch: str | None = None  # None when detached or not a git repository
+
+
+def find_repo_root(start: Path) -> Path | None:
+    """Nearest directory at or above ``start`` containing ``.git`` or ``.specify``."""
+    start = Path(start).resolve()
+    for directory in (start, *start.parents):
+        if (directory / ".git").exists() or (directory / ".specify").is_dir():
+            return directory
+    return None
+
+
+def read_head_branch(git_dir: Path) -> str | None:
+    """Branch checked out according to ``<git_dir>/HEAD`` (None if detached)."""
+    try:
+        head = (Path(git_dir) / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    prefix = "ref: refs/heads/"
+    return head[len(prefix):] if head.startswith(prefix) else None
+
+
+def resolve_repo(start: Path | None = None) -> RepoContext:
+    """Repository root, git directory and branch with a single git call.
+
+    Falls back to the nearest ``.git``/``.specify`` directory when git is not
+    installed or ``start`` is not inside a work tree (projects made with --no-git).
+    """
+    start = Path(start or Path.cwd())
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(start), "rev-parse", "--show-toplevel", "--absolute-git-dir"],
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        result = None
+    if result is not None and result.returncode == 0:
+        lines = result.stdout.splitlines()
+        if len(lines) >= 2:
+            git_dir = Path(lines[1])
+            return RepoContext(root=Path(lines[0]), has_git=True, git_dir=git_dir, branch=read_head_branch(git_dir))
+    root = find_repo_root(start)
+    if root is None:
+        raise WorkflowError("Could not determine repository root. Please run this from within the repository.")
+    return RepoContext(root=root, has_git=False)
+
+
+def branch_words(description: str, count: int = 3) -> str:
+    """First ``count`` words of ``description`` as a lowercase, dash-separated slug."""
+    slug = re.sub(r"[^a-z0-9]", "-", description.lower())
+    return "-".join([w for w in slug.split("-") if w][:count])
+
+
+def copy_template(repo_root: Path, template: str, dest: Path) -> bool:
+    """Copy a project template to ``dest`` (an empty file if the template is missing)."""
+    source = repo_root / template
+    if source.is_file():
+        shutil.copyfile(source, dest)
+        return True
+    dest.touch()
+    return False
+
+
+def create_branch(ctx: RepoContext, name: str) -> None:
+    result = subprocess.run(["git", "-C", str(ctx.root), "checkout", "-q", "-b", name], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise WorkflowError(f"git checkout -b {name} failed: {result.stderr.strip()}")
+
+
+def _doc_present(directory: Path, name: str) -> bool:
+    """``name`` exists in ``directory``; names ending in ``/`` must be non-empty directories."""
+    if name.endswith("/"):
+        try:
+            with os.scandir(directory / name) as it:
+                return any(True for _ in it)
+        except OSError:
+            return False
+    return (directory / name).is_file()
+
+
+def current_feature(ctx: RepoContext) -> str:
+    """Feature the scripts would work on: $SPECIFY_FEATURE, the git branch, or the latest spec."""
+    override = os.environ.get(FEATURE_ENV)
+    if override:
+        return override
+    if ctx.has_git:
+        return ctx.branch or "HEAD"
+    return numbering.latest(ctx.root, "specs") or "main"
+
+
+def feature_branch(ctx: RepoContext) -> tuple[str, str | None]:
+    """(current feature, warning); raises WorkflowError when git is on a non-feature branch."""
+    branch = current_feature(ctx)
+    if not ctx.has_git:
+        return branch, "Git repository not detected; skipped branch validation"
+    if not FEATURE_BRANCH_RE.match(branch):
+        raise WorkflowError(f"Not on a feature branch. Current branch: {branch}\nFeature branches should be named like: 001-feature-name")
+    return branch, None
+
+
+@dataclass
+class FeatureCreated:
+    branch_name: str
+    spec_file: Path
+    feature_num: str
+    has_git: bool
+    warning: str | None = None
+
+    def to_dict(self) -> dict:
+        return {"BRANCH_NAME": self.branch_name, "SPEC_FILE": str(self.spec_file), "FEATURE_NUM": self.feature_num}
+
+
+def create_feature(description: str, start: Path | None = None) -> FeatureCreated:
+    """Number a new feature, create its branch and ``specs/<branch>/spec.md``."""
+    if not description.strip():
+        raise WorkflowError("A feature description is required")
+    ctx = resolve_repo(start)
+    words = branch_words(description)
+    feature_num, feature_dir, warning = _create_numbered(ctx, "specs", lambda num: f"{num}-{words}")
+    branch_name = feature_dir.name
+    spec_file = feature_dir / "spec.md"
+    copy_template(ctx.root, SPEC_TEMPLATE, spec_file)
+    return FeatureCreated(branch_name, spec_file, feature_num, ctx.has_git, warning)
+
+
+@dataclass
+class FeaturePaths:
+    repo_root: Path
+    branch: str
+    has_git: bool
+    feature_dir: Path
+    warning: str | None = None
+
+    @property
+    def feature_spec(self) -> Path:
+        return self.feature_dir / "spec.md"
+
+    @property
+    def impl_plan(self) -> Path:
+        return self.feature_dir / "plan.md"
+
+    @property
+    def tasks(self) -> Path:
+        return self.feature_dir / "tasks.md"
+
+    def to_dict(self) -> dict:
+        return {
+            "REPO_ROOT": str(self.repo_root),
+            "BRANCH": self.branch,
+            "FEATURE_DIR": str(self.feature_dir),
+            "FEATURE_SPEC": str(self.feature_spec),
+            "IMPL_PLAN": str(self.impl_plan),
+            "TASKS": str(self.tasks),
+        }
+
+
+def feature_paths(start: Path | None = None) -> FeaturePaths:
+    """Paths of the current feature (what ``check-prerequisites.sh --paths-only`` prints)."""
+    ctx = resolve_repo(start)
+    branch, warning = feature_branch(ctx)
+    return FeaturePaths(ctx.root, branch, ctx.has_git, ctx.root / "specs" / branch, warning)
+
+
+@dataclass
+class FeaturePlan:
+    paths: FeaturePaths
+    template_found: bool
+
+    def to_dict(self) -> dict:
+        return {
+            "FEATURE_SPEC": str(self.paths.feature_spec),
+            "IMPL_PLAN": str(self.paths.impl_plan),
+            "SPECS_DIR": str(self.paths.feature_dir),
+            "BRANCH": self.paths.branch,
+            "HAS_GIT": "true" if self.paths.has_git else "false",
+        }
+
+
+def setup_feature_plan(start: Path | None = None) -> FeaturePlan:
+    """Copy the plan template into the current feature's directory."""
+    paths = feature_paths(start)
+    paths.feature_dir.mkdir(parents=True, exist_ok=True)
+    found = copy_template(paths.repo_root, PLAN_TEMPLATE, paths.impl_plan)
+    return FeaturePlan(paths, found)
+
+
+# Optional documents reported by the prerequisite check, in display order
+FEATURE_OPTIONAL_DOCS = ("research.md", "data-model.md", "contracts/", "quickstart.md")
+
+
+@dataclass
+class FeatureCheck:
+    paths: FeaturePaths
+    docs: dict[str, bool]  # document -> present, in display order
+
+    @property
+    def available_docs(self) -> list[str]:
+        return [name for name, present in self.docs.items() if present]
+
+    def to_dict(self) -> dict:
+        return {"FEATURE_DIR": str(self.paths.feature_dir), "AVAILABLE_DOCS": self.available_docs}
+
+
+def check_feature_prerequisites(start: Path | None = None, *, require_tasks: bool = False, include_tasks: bool = False) -> FeatureCheck:
+    """Validate the current feature's documents and list the optional ones present."""
+    paths = feature_paths(start)
+    feature_dir = paths.feature_dir
+    if not feature_dir.is_dir():
+        raise WorkflowError(f"Feature directory not found: {feature_dir}\nRun /specify first to create the feature structure.")
+    if not paths.impl_plan.is_file():
+        raise WorkflowError(f"plan.md not found in {feature_dir}\nRun /plan first to create the implementation plan.")
+    if require_tasks and not paths.tasks.is_file():
+        raise WorkflowError(f"tasks.md not found in {feature_dir}\nRun /tasks first to create the task list.")
+    names = FEATURE_OPTIONAL_DOCS + (("tasks.md",) if include_tasks else ())
+    return FeatureCheck(paths, {name: _doc_present(feature_dir, name) for name in names})
+
+
+def _create_numbered(ctx: RepoContext, kind: str, name_for) -> tuple[str, Path, str | None]:
+    """Reserve the next ``kind/NNN-*`` directory and check out its branch.
+
+    Both happen under the index lock, so parallel creators in one checkout
+    neither share a number nor run ``git checkout -b`` at the same time.
+    Returns (number, directory, warning).
+    """
+    try:
+        with numbering.locked(ctx.root):
+            number, path = numbering.reserve(ctx.root, kind, name_for)
+            if not ctx.has_git:
+                return number, path, f"Git repository not detected; skipped branch creation for {path.name}"
+            try:
+                create_branch(ctx, path.name)
+            except WorkflowError:
+                numbering.unreserve(ctx.root, kind, path.name)
+                raise
+            return number, path, None
+    except numbering.IndexLockTimeout as e:
+        raise WorkflowError(str(e)) from e
+
+
+def unit_branch(ctx: RepoContext) -> str:
+    """Current unit-test branch; raises WorkflowError when on another branch."""
+    if not ctx.has_git:
+        return NO_GIT_BRANCH
+    if not ctx.branch:
+        raise WorkflowError("Not on a git branch")
+    if not UNIT_BRANCH_RE.match(ctx.branch):
+        raise WorkflowError(f"Not on a unit test branch (expected pattern: ###-unit-*)\nCurrent branch: {ctx.branch}")
+    return ctx.branch
+
+
+@dataclass
+class UnitTestCreated:
+    branch_name: str
+    test_spec_file: Path
+    test_num: str
+    has_git: bool
+    warning: str | None = None
+
+    def to_dict(self) -> dict:
+        return {"BRANCH_NAME": self.branch_name, "TEST_SPEC_FILE": str(self.test_spec_file), "TEST_NUM": self.test_num}
+
+
+def create_unit_test(description: str, start: Path | None = None) -> UnitTestCreated:
+    """Number a new unit test, create its branch and ``tests/<branch>/test-spec.md``."""
+    if not description.strip():
+        raise WorkflowError("A test description is required")
+    ctx = resolve_repo(start)
+    words = branch_words(description)
+    test_num, test_dir, warning = _create_numbered(ctx, "tests", lambda num: f"{num}-unit-{words}")
+    branch_name = test_dir.name
+    spec_file = test_dir / "test-spec.md"
+    copy_template(ctx.root, UNIT_TEST_TEMPLATE, spec_file)
+    return UnitTestCreated(branch_name, spec_file, test_num, ctx.has_git, warning)
+
+
+@dataclass
+class UnitPlan:
+    test_spec_file: Path
+    test_plan: Path
+    test_dir: Path
+    branch: str
+    has_git: bool
+    template_found: bool
+
+    def to_dict(self) -> dict:
+        return {
+            "TEST_SPEC_FILE": str(self.test_spec_file),
+            "TEST_PLAN": str(self.test_plan),
+            "TESTS_DIR": str(self.test_dir),
+            "BRANCH": self.branch,
+            "HAS_GIT": "true" if self.has_git else "false",
+        }
+
+
+def setup_unit_plan(start: Path | None = None) -> UnitPlan:
+    """Copy the unit test plan template next to the current branch's test spec."""
+    ctx = resolve_repo(start)
+    branch = unit_branch(ctx)
+    test_dir = ctx.root / "tests" / branch
+    spec_file = test_dir / "test-spec.md"
+    if not spec_file.is_file():
+        raise WorkflowError(f"Test specification not found at {spec_file}\nPlease run 'specify unit init' first to create the test specification")
+    test_dir.mkdir(parents=True, exist_ok=True)
+    plan = test_dir / "test-plan.md"
+    found = copy_template(ctx.root, UNIT_PLAN_TEMPLATE, plan)
+    return UnitPlan(spec_file, plan, test_dir, branch, ctx.has_git, found)
+
+
+# Optional documents reported by the prerequisite check, in display order
+UNIT_OPTIONAL_DOCS = ("test-strategy.md", "test-data.md", "test-setup.md", "mocks/")
+
+
+@dataclass
+class UnitCheck:
+    repo_root: Path
+    branch: str
+    test_dir: Path
+    docs: dict[str, bool]  # document -> present, in display order
+
+    @property
+    def available_docs(self) -> list[str]:
+        return [name for name, present in self.docs.items() if present]
+
+    def to_dict(self) -> dict:
+        return {"TEST_DIR": str(self.test_dir), "AVAILABLE_DOCS": self.available_docs}
+
+    def paths(self) -> dict:
+        return {
+            "REPO_ROOT": str(self.repo_root),
+            "BRANCH": self.branch,
+            "TEST_DIR": str(self.test_dir),
+            "TEST_SPEC_FILE": str(self.test_dir / "test-spec.md"),
+            "TEST_PLAN": str(self.test_dir / "test-plan.md"),
+            "TEST_TASKS": str(self.test_dir / "test-tasks.md"),
+        }
+
+
+def check_unit_prerequisites(start: Path | None = None, *, require_tasks: bool = False, include_tasks: bool = False, paths_only: bool = False) -> UnitCheck:
+    """Validate the current unit test's documents and list the optional ones present."""
+    ctx = resolve_repo(start)
+    branch = unit_branch(ctx)
+    test_dir = ctx.root / "tests" / branch
+    names = UNIT_OPTIONAL_DOCS + (("test-tasks.md",) if include_tasks else ())
+    if paths_only:
+        return UnitCheck(ctx.root, branch, test_dir, {})
+
+    if not test_dir.is_dir():
+        raise WorkflowError(f"Test directory not found: {test_dir}\nRun /specify-unit first to create the test structure.")
+    if not (test_dir / "test-plan.md").is_file():
+        raise WorkflowError(f"test-plan.md not found in {test_dir}\nRun /plan-unit first to create the test implementation plan.")
+    if require_tasks and not (test_dir / "test-tasks.md").is_file():
+        raise WorkflowError(f"test-tasks.md not found in {test_dir}\nRun /tasks-unit first to create the test task list.")
+    return UnitCheck(ctx.root, branch, test_dir, {name: _doc_present(test_dir, name) for name in names})
+
+
+def _git_dir_at(directory: Path) -> Path | None:
+    """Git directory for a work tree root: ``.git`` itself or the ``gitdir:`` a ``.git`` file points to."""
+    dot_git = directory / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        content = dot_git.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    return (directory / content[len("gitdir:"):].strip()).resolve()
+
+
+def _common_dir(git_dir: Path) -> Path:
+    """Directory holding refs (differs from ``git_dir`` in linked worktrees)."""
+    try:
+        return (git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()).resolve()
+    except OSError:
+        return git_dir
+
+
+def read_repo(start: Path | None = None) -> RepoContext:
+    """Like resolve_repo, but from the filesystem alone: finds ``.git`` and reads HEAD without running git.
+
+    An enclosing work tree wins over a nearer ``.specify`` directory (a
+    subproject of a monorepo), as with ``git rev-parse --show-toplevel``.
+    """
+    start = Path(start or Path.cwd()).resolve()
+    for directory in (start, *start.parents):
+        git_dir = _git_dir_at(directory)
+        if git_dir is not None and (git_dir / "HEAD").is_file():
+            return RepoContext(root=directory, has_git=True, git_dir=git_dir, branch=read_head_branch(git_dir))
+    root = find_repo_root(start)
+    if root is None:
+        raise WorkflowError("Could not determine repository root. Please run this from within the repository.")
+    return RepoContext(root=root, has_git=False)
+
+
+def local_branches(git_dir: Path, pattern: re.Pattern | None = None) -> set[str]:
+    """Local branch names from ``refs/heads`` and ``packed-refs``, optionally filtered by ``pattern``."""
+    common = _common_dir(git_dir)
+    names: set[str] = set()
+    heads = common / "refs" / "heads"
+    stack = [(heads, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((Path(entry.path), f"{prefix}{entry.name}/"))
+                    else:
+                        names.add(prefix + entry.name)
+        except OSError:
+            continue
+    try:
+        with open(common / "packed-refs", encoding="utf-8") as f:
+            for line in f:
+                ref = line.rstrip("\n").partition(" ")[2]
+                if ref.startswith("refs/heads/"):
+                    names.add(ref[len("refs/heads/"):])
+    except OSError:
+        pass
+    if pattern is not None:
+        names = {name for name in names if pattern.match(name)}
+    return names
+
+
+# Documents that mark the stages of a unit test: spec, then plan, then tasks
+UNIT_STAGE_DOCS = (("spec", "test-spec.md"), ("plan", "test-plan.md"), ("tasks", "test-tasks.md"))
+
+
+@dataclass
+class UnitEntry:
+    name: str
+    test_num: str
+    test_dir: Path | None    # None when only the branch exists in this checkout
+    docs: dict[str, bool]    # stage documents and optional documents -> present
+    has_branch: bool
+    current: bool
+
+    @property
+    def stage(self) -> str:
+        """Furthest stage whose document exists ("none" if not even the spec)."""
+        reached = "none"
+        for stage, doc in UNIT_STAGE_DOCS:
+            if not self.docs.get(doc):
+                break
+            reached = stage
+        return reached
+
+    @property
+    def complete(self) -> bool:
+        return all(self.docs.get(doc) for _, doc in UNIT_STAGE_DOCS)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "number": self.test_num,
+            "test_dir": str(self.test_dir) if self.test_dir else None,
+            "branch": self.has_branch,
+            "current": self.current,
+            "stage": self.stage,
+            "complete": self.complete,
+            "docs": self.docs,
+        }
+
+
+@dataclass
+class UnitStatus:
+    repo_root: Path
+    has_git: bool
+    branch: str | None
+    units: list[UnitEntry]
+
+    @property
+    def on_unit_branch(self) -> bool:
+        return bool(self.branch and UNIT_BRANCH_RE.match(self.branch))
+
+    def to_dict(self) -> dict:
+        return {
+            "repo_root": str(self.repo_root),
+            "has_git": self.has_git,
+            "branch": self.branch,
+            "on_unit_branch": self.on_unit_branch,
+            "units": [unit.to_dict() for unit in self.units],
+        }
+
+
+def _unit_docs(test_dir: Path) -> dict[str, bool]:
+    # One listing per test directory; only a present mocks/ needs a second look
+    try:
+        with os.scandir(test_dir) as it:
+            entries = {entry.name: entry.is_dir() for entry in it}
+    except OSError:
+        entries = {}
+    docs = {doc: entries.get(doc) is False for _, doc in UNIT_STAGE_DOCS}
+    for name in UNIT_OPTIONAL_DOCS:
+        if name.endswith("/"):
+            docs[name] = bool(entries.get(name[:-1])) and _doc_present(test_dir, name)
+        else:
+            docs[name] = entries.get(name) is False
+    return docs
+
+
+def unit_status(start: Path | None = None) -> UnitStatus:
+    """Every unit test in ``tests/`` and every ``NNN-unit-*`` branch, without running git."""
+    ctx = read_repo(start)
+    branches = local_branches(ctx.git_dir, UNIT_BRANCH_RE) if ctx.has_git else set()
+    current = ctx.branch if ctx.has_git else None
+
+    units: dict[str, UnitEntry] = {}
+    tests_dir = ctx.root / "tests"
+    try:
+        with os.scandir(tests_dir) as it:
+            dirs = [entry.name for entry in it if UNIT_BRANCH_RE.match(entry.name) and entry.is_dir()]
+    except OSError:
+        dirs = []
+    for name in dirs:
+        units[name] = UnitEntry(name, name[:3], tests_dir / name, _unit_docs(tests_dir / name), name in branches, name == current)
+    for name in branches - units.keys():
+        # Branch whose test directory is not in this checkout (e.g. not merged yet)
+        docs = {doc: False for _, doc in UNIT_STAGE_DOCS} | {doc: False for doc in UNIT_OPTIONAL_DOCS}
+        units[name] = UnitEntry(name, name[:3], None, docs, True, name == current)
+    return UnitStatus(ctx.root, ctx.has_git, current, sorted(units.values(), key=lambda u: (u.test_num, u.name)))
@@ -0,0 +1,108 @@
+import hashlib
+import io
+import os
+import threading
+import time
+
+import pytest
+
+from specify_cli.cache import TemplateCache
+
+
+def make_zip(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TemplateCache(tmp_path / "cache", max_bytes=1 << 30, max_age_days=30, release_ttl=0)
+
+
+def test_lookup_misses_then_hits_after_store(cache, tmp_path):
+    content = b"PK template"
+    assert cache.lookup("o/r", "v1", "t.zip") is None
+
+    entry = cache.store(make_zip(tmp_path, "t.zip", content), "o/r", "v1", "t.zip")
+    path = cache.lookup("o/r", "v1", "t.zip", hashlib.sha256(content).hexdigest())
+
+    assert path == cache.blob_path(entry.sha256)
+    assert path.read_bytes() == content
+    assert cache.lookup("o/r", "v2", "t.zip") is None
+
+
+def test_lookup_misses_on_digest_mismatch_or_corrupt_blob(cache, tmp_path):
+    entry = cache.store(make_zip(tmp_path, "t.zip", b"original"), "o/r", "v1", "t.zip")
+    assert cache.lookup("o/r", "v1", "t.zip", "0" * 64) is None
+
+    cache.store(make_zip(tmp_path, "t.zip", b"original"), "o/r", "v1", "t.zip")
+    cache.blob_path(entry.sha256).write_bytes(b"corrupt!")
+    assert cache.lookup("o/r", "v1", "t.zip") is None
+    assert cache.entries() == []
+
+
+def test_store_rejects_wrong_digest(cache, tmp_path):
+    with pytest.raises(ValueError, match="SHA-256 mismatch"):
+        cache.store_fileobj(io.BytesIO(b"data"), "o/r", "v1", "t.zip", "0" * 64)
+    assert cache.entries() == []
+
+
+def test_lookup_and_store_never_delete_unindexed_blobs(cache, tmp_path):
+    orphan = cache.blob_path("ab" * 32)
+    orphan.parent.mkdir(parents=True)
+    orphan.write_bytes(b"orphan")
+
+    cache.store(make_zip(tmp_path, "t.zip", b"a"), "o/r", "v1", "t.zip")
+    cache.lookup("o/r", "v1", "t.zip", "0" * 64)
+    assert orphan.exists()
+
+    cache.prune()
+    assert not orphan.exists()
+
+
+def test_prune_evicts_old_and_least_recently_used_entries(cache, tmp_path):
+    for i, tag in enumerate(("v1", "v2", "v3")):
+        cache.store(make_zip(tmp_path, "t.zip", bytes([i]) * 100), "o/r", tag, "t.zip")
+    entries = cache._load()
+    entries["o/r@v1/t.zip"].last_used = time.time() - 40 * 86400
+    entries["o/r@v2/t.zip"].last_used = time.time() - 60
+    cache._save(entries)
+
+    removed = cache.prune(max_bytes=100)
+
+    assert sorted(e.tag for e in removed) == ["v1", "v2"]
+    assert [e.tag for e in cache.entries()] == ["v3"]
+    assert len(list(cache.blob_dir.glob("*/*.zip"))) == 1
+
+
+def test_concurrent_stores_keep_every_entry_and_blob(cache, tmp_path):
+    workers, rounds = 6, 10
+    barrier = threading.Barrier(workers, timeout=30)
+    errors = []
+
+    def worker(n):
+        try:
+            for r in range(rounds):
+                src = make_zip(tmp_path, f"{n}-{r}.zip", f"{n}-{r}".encode() * 50)
+                barrier.wait()
+                entry = cache.store(src, "o/r", f"v{r}", f"{n}.zip")
+                assert cache.blob_path(entry.sha256).exists()
+                if r % 2:
+                    cache.prune()
+        except Exception as e:  # surfaced through ``errors``
+            errors.append(e)
+            barrier.abort()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    entries = cache.entries()
+    assert len(entries) == workers * rounds
+    assert all(cache.blob_path(e.sha256).exists() for e in entries)
+    assert not [p for p in cache.blob_dir.glob("*/.*.tmp")]
+    assert sorted(os.listdir(cache.root)) == ["cache.lock", "templates", "templates.json"]
@@ -0,0 +1,127 @@
+import hashlib
+import io
+
+import httpx
+import pytest
+
+from specify_cli import TemplateError, download_template_from_github
+from specify_cli.cache import TemplateCache
+from specify_cli.download import DownloadError, fetch_resumable
+
+PAYLOAD = bytes(range(256)) * 40
+
+
+def make_client(handler):
+    requests = []
+
+    def record(request):
+        requests.append(request.headers.get("range"))
+        return handler(request)
+
+    return httpx.Client(transport=httpx.MockTransport(record)), requests
+
+
+def test_fetch_resumable_continues_from_partial_sink():
+    def handler(request):
+        start = int(request.headers["range"].removeprefix("bytes=").rstrip("-"))
+        return httpx.Response(206, headers={"content-range": f"bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}"}, content=PAYLOAD[start:])
+
+    client, requests = make_client(handler)
+    sink = io.BytesIO(PAYLOAD[:1000])
+
+    sha, size, resumed = fetch_resumable(client, "https://example.test/t.zip", sink, expected_size=len(PAYLOAD))
+
+    assert requests == ["bytes=1000-"]
+    assert (sha, size, resumed) == (hashlib.sha256(PAYLOAD).hexdigest(), len(PAYLOAD), 1000)
+    assert sink.getvalue() == PAYLOAD
+
+
+def test_fetch_resumable_restarts_when_server_ignores_range():
+    client, requests = make_client(lambda request: httpx.Response(200, content=PAYLOAD))
+    sink = io.BytesIO(b"stale partial bytes")
+
+    sha, size, resumed = fetch_resumable(client, "https://example.test/t.zip", sink, expected_size=len(PAYLOAD))
+
+    assert requests == ["bytes=19-"]
+    assert (sha, size, resumed) == (hashlib.sha256(PAYLOAD).hexdigest(), len(PAYLOAD), 0)
+    assert sink.getvalue() == PAYLOAD
+
+
+def test_fetch_resumable_restarts_from_zero_after_416():
+    def handler(request):
+        if request.headers.get("range"):
+            return httpx.Response(416)
+        return httpx.Response(200, content=PAYLOAD)
+
+    client, requests = make_client(handler)
+    sink = io.BytesIO(b"partial from an older release")
+
+    sha, size, resumed = fetch_resumable(client, "https://example.test/t.zip", sink, expected_size=len(PAYLOAD))
+
+    assert requests == ["bytes=29-", None]
+    assert (sha, size, resumed) == (hashlib.sha256(PAYLOAD).hexdigest(), len(PAYLOAD), 0)
+    assert sink.getvalue() == PAYLOAD
+
+
+def test_fetch_resumable_discards_sink_larger_than_expected():
+    client, requests = make_client(lambda request: httpx.Response(200, content=PAYLOAD))
+    sink = io.BytesIO(PAYLOAD + b"trailing garbage")
+
+    _, size, resumed = fetch_resumable(client, "https://example.test/t.zip", sink, expected_size=len(PAYLOAD))
+
+    assert requests == [None]
+    assert (size, resumed) == (len(PAYLOAD), 0)
+    assert sink.getvalue() == PAYLOAD
+
+
+def test_fetch_resumable_raises_on_error_status():
+    client, _ = make_client(lambda request: httpx.Response(404, content=b"not found"))
+
+    with pytest.raises(DownloadError, match="404"):
+        fetch_resumable(client, "https://example.test/t.zip", io.BytesIO())
+
+
+def github_release(payload, digest=None):
+    asset = {"name": "spec-kit-template-claude-sh-v1.0.0.zip", "size": len(payload), "browser_download_url": "https://example.test/t.zip"}
+    asset["digest"] = f"sha256:{digest or hashlib.sha256(payload).hexdigest()}"
+    client, _ = make_client(lambda request: httpx.Response(200, content=payload))
+    return client, {"tag_name": "v1.0.0", "assets": [asset]}
+
+
+def download_in_memory(client, release, **kwargs):
+    return download_template_from_github(
+        "claude", None, verbose=False, show_progress=False, client=client, repo_owner="o", repo_name="r",
+        in_memory=True, release_data=release, **kwargs,
+    )
+
+
+@pytest.mark.parametrize("spool_max_size, on_disk", [(len(PAYLOAD), False), (1024, True)])
+def test_in_memory_download_returns_an_open_buffer(tmp_path, monkeypatch, spool_max_size, on_disk):
+    monkeypatch.chdir(tmp_path)
+    client, release = github_release(PAYLOAD)
+
+    buffer, metadata = download_in_memory(client, release, spool_max_size=spool_max_size)
+
+    with buffer:
+        assert metadata["in_memory"] and not metadata["cached"]
+        assert buffer._rolled is on_disk  # spilled to an anonymous temp file above the limit
+        assert buffer.read() == PAYLOAD
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_in_memory_download_goes_into_the_cache(tmp_path):
+    client, release = github_release(PAYLOAD)
+    cache = TemplateCache(tmp_path / "cache")
+
+    path, metadata = download_in_memory(client, release, cache=cache)
+
+    assert metadata["cached"] and "in_memory" not in metadata
+    assert path == cache.blob_path(hashlib.sha256(PAYLOAD).hexdigest())
+    assert not list(cache.partial_dir.iterdir())
+
+
+def test_in_memory_download_rejects_a_digest_mismatch():
+    client, release = github_release(PAYLOAD, digest="0" * 64)
+
+    with pytest.raises(TemplateError):
+        download_in_memory(client, release)
@@ -0,0 +1,100 @@
+import hashlib
+import io
+import json
+import os
+import stat
+import zipfile
+
+import pytest
+
+from specify_cli.extract import extract_template, member_path
+from specify_cli.packaging import MANIFEST_PATH
+
+
+def make_zip(members, manifest=None):
+    """Zip of {name: (bytes, mode)} members, optionally with a packaging manifest."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, (data, mode) in members.items():
+            info = zipfile.ZipInfo(name)
+            info.create_system = 3
+            info.external_attr = (stat.S_IFREG | mode) << 16
+            zf.writestr(info, data)
+        if manifest is not None:
+            zf.writestr(f"root/{MANIFEST_PATH}", json.dumps({"version": 1, "files": manifest}))
+    return zipfile.ZipFile(buf)
+
+
+@pytest.mark.parametrize("name", ["../evil.sh", "root/../../evil.sh", "/etc/passwd", "..\\evil.sh", "C:/evil.sh", "C:evil.sh"])
+def test_member_path_rejects_unsafe_names(name):
+    with pytest.raises(ValueError, match="Unsafe path"):
+        member_path(name, "root")
+
+
+def test_member_path_strips_the_archive_root():
+    assert member_path("root/.specify/a.md", "root").as_posix() == ".specify/a.md"
+    assert member_path("root/", "root") is None
+    assert member_path("other/a.md", "root").as_posix() == "other/a.md"
+
+
+def test_extract_refuses_archive_escaping_the_destination(tmp_path):
+    zf = make_zip({"root/ok.md": (b"ok", 0o644), "root/../../escaped.md": (b"x", 0o644)})
+
+    with pytest.raises(ValueError):
+        extract_template(zf, tmp_path / "project")
+
+    assert not (tmp_path / "escaped.md").exists()
+
+
+def test_unchanged_files_are_left_untouched(tmp_path):
+    dest = tmp_path / "project"
+    (dest / "memory").mkdir(parents=True)
+    same, edited = dest / "memory" / "same.md", dest / "memory" / "edited.md"
+    same.write_bytes(b"same")
+    edited.write_bytes(b"MINE")
+    os.utime(same, ns=(0, 0))
+    zf = make_zip({"root/memory/same.md": (b"same", 0o644), "root/memory/edited.md": (b"upst", 0o644)})
+
+    result = extract_template(zf, dest)
+
+    assert (result.unchanged, result.updated, result.created) == (1, 1, 0)
+    assert os.stat(same).st_mtime_ns == 0
+    assert edited.read_bytes() == b"upst"
+
+
+def test_manifest_decides_which_files_are_unchanged(tmp_path):
+    dest = tmp_path / "project"
+    (dest / "memory").mkdir(parents=True)
+    existing = dest / "memory" / "a.md"
+    existing.write_bytes(b"kept")
+    # The manifest records the existing content, so the member is not compared byte by byte
+    manifest = {"memory/a.md": {"size": 4, "sha256": hashlib.sha256(b"kept").hexdigest()}}
+    zf = make_zip({"root/memory/a.md": (b"diff", 0o644)}, manifest)
+
+    result = extract_template(zf, dest)
+
+    assert result.unchanged == 1
+    assert existing.read_bytes() == b"kept"
+    assert result.hashes == {"memory/a.md": manifest["memory/a.md"]["sha256"]}
+    assert not (dest / MANIFEST_PATH).exists()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="no Unix modes on Windows")
+def test_exec_bits_are_applied_to_new_and_unchanged_files(tmp_path):
+    dest = tmp_path / "project"
+    (dest / "scripts").mkdir(parents=True)
+    old = dest / "scripts" / "old.sh"
+    old.write_bytes(b"#!/bin/sh\n")
+    old.chmod(0o644)
+    zf = make_zip({
+        "root/scripts/old.sh": (b"#!/bin/sh\n", 0o755),
+        "root/scripts/new.sh": (b"#!/bin/sh\n", 0o755),
+        "root/scripts/plain.md": (b"text", 0o644),
+    })
+
+    result = extract_template(zf, dest)
+
+    assert result.executable == 2
+    assert stat.S_IMODE(os.stat(old).st_mode) == 0o755
+    assert os.stat(dest / "scripts" / "new.sh").st_mode & 0o100
+    assert not os.stat(dest / "scripts" / "plain.md").st_mode & 0o111
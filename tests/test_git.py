@@ -0,0 +1,33 @@
+import shutil
+import subprocess
+
+import pytest
+
+from specify_cli.git import init_repo
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+@pytest.fixture(autouse=True)
+def git_identity(monkeypatch):
+    for var in ("GIT_AUTHOR", "GIT_COMMITTER"):
+        monkeypatch.setenv(f"{var}_NAME", "Specify")
+        monkeypatch.setenv(f"{var}_EMAIL", "specify@example.test")
+
+
+def committed(path):
+    out = subprocess.run(["git", "-C", str(path), "ls-files"], capture_output=True, text=True, check=True).stdout
+    return out.splitlines()
+
+
+def test_init_repo_with_paths_skips_ignored_files_like_add_all(tmp_path):
+    files = [".gitignore", ".claude/commands/specify.md", ".specify/templates/spec-template.md", "notes/[draft].md", "debug.log"]
+    for rel in files:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(rel)
+    (tmp_path / ".gitignore").write_text(".claude/\n*.log\n")
+    (tmp_path / "untracked.md").write_text("not a template file")
+
+    init_repo(tmp_path, paths=files)
+
+    assert committed(tmp_path) == [".gitignore", ".specify/templates/spec-template.md", "notes/[draft].md"]
@@ -0,0 +1,74 @@
+import httpx
+import pytest
+
+from specify_cli.http_client import HttpSettings, create_client, retry_after_seconds
+
+URL = "https://api.example.test/releases/latest"
+
+
+def make_client(responses, **settings):
+    """Client whose transport answers with ``responses`` in order; records sleeps and methods."""
+    sleeps, methods = [], []
+    replies = iter(responses)
+
+    def handler(request):
+        methods.append(request.method)
+        return next(replies)
+
+    client = create_client(settings=HttpSettings(**{"retries": 3, "backoff": 0.5, **settings}), transport=httpx.MockTransport(handler))
+    client._sleep = sleeps.append
+    return client, sleeps, methods
+
+
+def test_retry_after_seconds_is_honoured():
+    client, sleeps, _ = make_client([httpx.Response(503, headers={"Retry-After": "7"}), httpx.Response(200, text="ok")])
+
+    assert client.get(URL).text == "ok"
+    assert sleeps == [7.0]
+
+
+def test_rate_limit_reset_is_honoured_for_403():
+    reset = httpx.Response(403, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1002"})
+
+    assert retry_after_seconds(reset, now=1000.0) == 2.0
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "Thu, 01 Jan 1970 00:16:50 GMT"}), now=1000.0) == 10.0
+    assert retry_after_seconds(httpx.Response(403)) is None
+
+
+def test_backoff_is_capped_and_gives_up_after_the_retries():
+    client, sleeps, methods = make_client([httpx.Response(502)] * 4, max_backoff=0.75)
+
+    assert client.get(URL).status_code == 502
+    assert len(methods) == 4
+    assert len(sleeps) == 3 and all(0 <= s <= cap for s, cap in zip(sleeps, (0.5, 0.75, 0.75)))
+
+
+def test_long_server_wait_is_reported_instead_of_slept():
+    client, sleeps, _ = make_client([httpx.Response(429, headers={"Retry-After": "3600"})], max_retry_wait=60)
+
+    assert client.get(URL).status_code == 429
+    assert sleeps == []
+
+
+@pytest.mark.parametrize("method, status, calls", [("POST", 503, 1), ("GET", 404, 1), ("GET", 403, 1)])
+def test_no_retry_for_non_idempotent_or_permanent_failures(method, status, calls):
+    client, sleeps, methods = make_client([httpx.Response(status)] * 4)
+
+    assert client.request(method, URL).status_code == status
+    assert (len(methods), sleeps) == (calls, [])
+
+
+def test_connection_errors_are_retried():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200)
+
+    client = create_client(settings=HttpSettings(retries=2, backoff=0), transport=httpx.MockTransport(handler))
+    client._sleep = lambda seconds: None
+
+    assert client.get(URL).status_code == 200
+    assert len(attempts) == 2
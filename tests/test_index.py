@@ -0,0 +1,108 @@
+import json
+import os
+import stat
+
+import pytest
+
+from specify_cli import index as numbering
+
+
+def named(slug):
+    return lambda number: f"{number}-{slug}"
+
+
+def test_reserve_numbers_after_existing_directories(tmp_path):
+    (tmp_path / "specs" / "007-old").mkdir(parents=True)
+
+    number, path = numbering.allocate(tmp_path, "specs", named("login"))
+
+    assert (number, path) == ("008", tmp_path / "specs" / "008-login")
+    assert path.is_dir()
+    kinds = numbering.load(tmp_path)
+    assert kinds["specs"]["highest"] == 8
+    assert kinds["specs"]["entries"] == {"007-old": "specs/007-old", "008-login": "specs/008-login"}
+    assert stat.S_IMODE(os.stat(tmp_path / numbering.INDEX_PATH).st_mode) == 0o644
+    assert (tmp_path / ".specify" / ".gitignore").read_text().split() == ["index.json", "index.lock"]
+
+
+def test_reserve_rescans_when_directory_changed_behind_index(tmp_path):
+    numbering.allocate(tmp_path, "specs", named("first"))
+    (tmp_path / "specs" / "002-by-hand").mkdir()
+    os.utime(tmp_path / "specs", ns=(0, 1))  # make sure the recorded mtime no longer matches
+
+    number, _ = numbering.allocate(tmp_path, "specs", named("next"))
+
+    assert number == "003"
+
+
+def test_reserve_bumps_past_existing_name_when_index_is_stale(tmp_path):
+    specs = tmp_path / "specs"
+    (specs / "001-same").mkdir(parents=True)
+    # A stale index that still matches the directory's mtime but misses 001-same
+    numbering.save(tmp_path, {"specs": {"highest": 0, "mtime_ns": os.stat(specs).st_mtime_ns, "entries": {}}})
+
+    number, path = numbering.allocate(tmp_path, "specs", named("same"))
+
+    assert (number, path) == ("002", specs / "002-same")
+    assert numbering.load(tmp_path)["specs"]["highest"] == 2
+
+
+@pytest.mark.parametrize("content", ["not json", json.dumps({"version": 99, "kinds": {}}), json.dumps([1, 2])])
+def test_reserve_rebuilds_unreadable_index(tmp_path, content):
+    (tmp_path / "tests" / "004-unit-api").mkdir(parents=True)
+    (tmp_path / ".specify").mkdir()
+    (tmp_path / numbering.INDEX_PATH).write_text(content)
+
+    number, _ = numbering.allocate(tmp_path, "tests", named("unit-db"))
+
+    assert number == "005"
+
+
+def test_unreserve_frees_the_number(tmp_path):
+    with numbering.locked(tmp_path):
+        number, path = numbering.reserve(tmp_path, "tests", named("unit-x"))
+        numbering.unreserve(tmp_path, "tests", path.name)
+
+    assert not path.exists()
+    assert numbering.latest(tmp_path, "tests") is None
+    assert numbering.allocate(tmp_path, "tests", named("unit-y"))[0] == number
+
+
+def test_latest_and_rebuild(tmp_path):
+    for name in ("001-a", "010-b", "002-c", "notes"):
+        (tmp_path / "specs" / name).mkdir(parents=True)
+
+    assert numbering.latest(tmp_path, "specs") == "010-b"
+    kinds = numbering.rebuild(tmp_path)
+    assert kinds["specs"]["highest"] == 10
+    assert kinds["tests"]["entries"] == {}
+    assert numbering.load(tmp_path) == kinds
+
+
+def test_locked_times_out_while_held(tmp_path):
+    with numbering.locked(tmp_path):
+        with pytest.raises(numbering.IndexLockTimeout):
+            with numbering.locked(tmp_path, timeout=0.05):
+                pass
+
+
+@pytest.mark.parametrize("highest", [None, "3", 2.0, True])
+def test_reserve_rescans_index_without_integer_highest(tmp_path, highest):
+    specs = tmp_path / "specs"
+    (specs / "002-old").mkdir(parents=True)
+    entry = {"mtime_ns": os.stat(specs).st_mtime_ns, "entries": {"002-old": "specs/002-old"}}
+    if highest is not None:
+        entry["highest"] = highest
+    numbering.save(tmp_path, {"specs": entry})
+
+    assert numbering.allocate(tmp_path, "specs", named("new"))[0] == "003"
+
+
+def test_save_drops_kinds_whose_directory_changed(tmp_path):
+    numbering.allocate(tmp_path, "tests", named("unit-a"))
+    (tmp_path / "tests" / "002-unit-by-script").mkdir()
+    os.utime(tmp_path / "tests", ns=(0, 1))
+
+    numbering.allocate(tmp_path, "specs", named("feature"))
+
+    assert list(numbering.load(tmp_path)) == ["specs"]
@@ -0,0 +1,182 @@
+import hashlib
+import io
+import json
+import zipfile
+
+import httpx
+import pytest
+
+import specify_cli
+from specify_cli import TemplateError, download_and_extract_templates, fetch_release_data, resolve_local_template
+from specify_cli.cache import DEFAULT_RELEASE_TTL, TemplateCache
+
+AGENTS = ["claude", "gemini", "copilot", "cursor", "qwen", "windsurf"]
+AGENT_DIRS = {"claude": ".claude", "gemini": ".gemini", "copilot": ".github", "cursor": ".cursor", "qwen": ".qwen", "windsurf": ".windsurf"}
+API_URL = "https://api.github.com/repos/o/r/releases/latest"
+
+
+def template_zip(ai):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr(f"spec-kit-{ai}-sh/.specify/templates/spec-template.md", "# spec\n")
+        zf.writestr(f"spec-kit-{ai}-sh/{AGENT_DIRS[ai]}/commands/specify.md", f"# specify for {ai}\n")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def github():
+    archives = {f"spec-kit-template-{ai}-sh-v1.0.0.zip": template_zip(ai) for ai in AGENTS}
+    release = {
+        "tag_name": "v1.0.0",
+        "assets": [
+            {"name": name, "size": len(data), "browser_download_url": f"https://example.test/{name}", "digest": f"sha256:{hashlib.sha256(data).hexdigest()}"}
+            for name, data in archives.items()
+        ],
+    }
+    requests = []
+
+    def handler(request):
+        requests.append(str(request.url))
+        if str(request.url) == API_URL:
+            return httpx.Response(200, json=release)
+        return httpx.Response(200, content=archives[request.url.path.lstrip("/")])
+
+    return httpx.Client(transport=httpx.MockTransport(handler)), requests
+
+
+@pytest.mark.parametrize("agents", [AGENTS[:3], AGENTS])
+def test_multi_agent_init_with_fresh_cache(tmp_path, github, agents):
+    client, requests = github
+    for run in range(5):
+        cache = TemplateCache(tmp_path / f"cache-{run}")
+        project = tmp_path / f"project-{run}"
+
+        download_and_extract_templates(project, agents, "sh", verbose=False, client=client, repo_owner="o", repo_name="r", cache=cache)
+
+        assert (project / ".specify" / "templates" / "spec-template.md").exists()
+        for ai in agents:
+            assert (project / AGENT_DIRS[ai] / "commands" / "specify.md").read_text() == f"# specify for {ai}\n"
+        assert len(cache.entries()) == len(agents)
+    assert requests.count(API_URL) == 5
+
+
+def test_multi_agent_init_reuses_cached_archives(tmp_path, github):
+    client, requests = github
+    cache = TemplateCache(tmp_path / "cache")
+    download_and_extract_templates(tmp_path / "first", AGENTS, "sh", verbose=False, client=client, repo_owner="o", repo_name="r", cache=cache)
+    requests.clear()
+
+    download_and_extract_templates(tmp_path / "second", AGENTS, "sh", verbose=False, client=client, repo_owner="o", repo_name="r", cache=cache)
+
+    assert all(url == API_URL for url in requests)
+    assert (tmp_path / "second" / ".windsurf" / "commands" / "specify.md").exists()
+
+
+def release_server(release):
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == f'"{release["tag_name"]}"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=release, headers={"ETag": f'"{release["tag_name"]}"'})
+
+    return httpx.Client(transport=httpx.MockTransport(handler)), seen
+
+
+def test_release_lookup_is_revalidated_once_the_ttl_expires(tmp_path):
+    release = {"tag_name": "v1.0.0", "assets": []}
+    client, seen = release_server(release)
+    cache = TemplateCache(tmp_path / "cache", release_ttl=0)
+
+    assert fetch_release_data(client, API_URL, cache=cache) == (release, "network")
+    assert fetch_release_data(client, API_URL, cache=cache)[1] == "not modified"
+    release["tag_name"] = "v1.1.0"
+    assert fetch_release_data(client, API_URL, cache=cache) == (release, "network")
+
+    assert seen == [None, '"v1.0.0"', '"v1.0.0"']
+    assert cache.get_release(API_URL).etag == '"v1.1.0"'
+
+
+def test_release_lookup_within_the_ttl_sends_no_request(tmp_path, monkeypatch):
+    monkeypatch.delenv("SPECIFY_RELEASE_TTL", raising=False)
+    client, seen = release_server({"tag_name": "v1.0.0", "assets": []})
+    cache = TemplateCache(tmp_path / "cache")
+
+    fetch_release_data(client, API_URL, cache=cache)
+    data, source = fetch_release_data(client, API_URL, cache=cache)
+
+    assert cache.release_ttl == DEFAULT_RELEASE_TTL > 0
+    assert (data["tag_name"], source) == ("v1.0.0", "cached")
+    assert seen == [None]
+
+    monkeypatch.setenv("SPECIFY_RELEASE_TTL", "0")
+    assert fetch_release_data(client, API_URL, cache=TemplateCache(tmp_path / "cache"))[1] == "not modified"
+
+
+def write_manifest(tmp_path, agents):
+    manifest = tmp_path / "projects.json"
+    manifest.write_text(json.dumps({"defaults": {"script": "sh", "repo": "o/r"}, "projects": [{"name": f"p-{ai}", "path": str(tmp_path / f"p-{ai}"), "ai": ai} for ai in agents]}))
+    return manifest
+
+
+def run_batch(manifest, cache, template_source=None):
+    specify_cli._init_batch(
+        manifest, jobs=len(AGENTS), default_ai=None, default_script=None, default_repo=(None, None),
+        ignore_agent_tools=True, no_git=True, commit_template_only=False, force=False, skip_tls=False,
+        debug=False, github_token=None, cache=cache, template_source=template_source,
+    )
+
+
+def test_batch_init_with_fresh_cache(tmp_path, github, monkeypatch):
+    client, _ = github
+    monkeypatch.setattr(specify_cli, "get_http_client", lambda skip_tls=False: client)
+    for run in range(3):
+        root = tmp_path / f"run-{run}"
+        root.mkdir()
+        cache = TemplateCache(root / "cache")
+
+        run_batch(write_manifest(root, AGENTS), cache)
+
+        for ai in AGENTS:
+            assert (root / f"p-{ai}" / AGENT_DIRS[ai] / "commands" / "specify.md").exists()
+        assert len(cache.entries()) == len(AGENTS)
+
+
+def test_batch_init_from_local_templates_builds_no_client(tmp_path, monkeypatch):
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    for ai in AGENTS[:2]:
+        (mirror / f"spec-kit-template-{ai}-sh-v1.0.0.zip").write_bytes(template_zip(ai))
+
+    def no_network(skip_tls=False):
+        raise AssertionError("HTTP client built for local templates")
+
+    monkeypatch.setattr(specify_cli, "get_http_client", no_network)
+    run_batch(write_manifest(tmp_path, AGENTS[:2]), None, template_source=mirror)
+
+    assert (tmp_path / "p-gemini" / ".gemini" / "commands" / "specify.md").exists()
+
+
+def test_local_mirror_resolves_the_newest_matching_archive(tmp_path):
+    for name in ("spec-kit-template-claude-sh-v1.0.9.zip", "spec-kit-template-claude-sh-v1.0.10.zip", "spec-kit-template-claude-ps-v2.0.0.zip"):
+        (tmp_path / name).write_bytes(template_zip("claude"))
+
+    path, metadata = resolve_local_template(tmp_path, "claude", verbose=False)
+
+    assert path == tmp_path / "spec-kit-template-claude-sh-v1.0.10.zip"
+    assert (metadata["release"], metadata["release_source"]) == ("v1.0.10", "local")
+    assert resolve_local_template(path, "gemini", verbose=False)[0] == path  # an explicit zip is used as is
+
+
+@pytest.mark.parametrize("layout", ["empty mirror", "not a zip", "missing"])
+def test_local_template_errors(tmp_path, layout):
+    source = tmp_path / "mirror"
+    if layout != "missing":
+        source.mkdir()
+    if layout == "not a zip":
+        source = source / "spec-kit-template-claude-sh-v1.0.0.zip"
+        source.write_text("not a zip")
+
+    with pytest.raises(TemplateError):
+        resolve_local_template(source, "claude", verbose=False)
@@ -0,0 +1,56 @@
+import os
+import zipfile
+
+import pytest
+
+from specify_cli.extract import extract_template, read_template
+from specify_cli.packaging import MANIFEST_PATH, write_deterministic_zip
+
+
+@pytest.fixture
+def staging(tmp_path):
+    src = tmp_path / "spec-kit-claude-sh"
+    (src / ".specify" / "scripts" / "bash").mkdir(parents=True)
+    (src / ".specify" / "templates").mkdir()
+    (src / ".specify" / "templates" / "spec-template.md").write_text("# spec\n")
+    script = src / ".specify" / "scripts" / "bash" / "common.sh"
+    script.write_text("#!/usr/bin/env bash\n")
+    script.chmod(0o700)
+    (src / "memory").mkdir()
+    (src / "memory" / "constitution.md").write_text("# constitution\n")
+    return src
+
+
+def test_write_deterministic_zip_is_reproducible(staging, tmp_path):
+    first = tmp_path / "a.zip"
+    write_deterministic_zip(staging, first, epoch=1700000000)
+    os.utime(staging / "memory" / "constitution.md", (0, 0))
+    second = tmp_path / "b.zip"
+    write_deterministic_zip(staging, second, epoch=1700000000)
+
+    assert first.read_bytes() == second.read_bytes()
+    with zipfile.ZipFile(first) as zf:
+        names = zf.namelist()
+        modes = {i.filename: (i.external_attr >> 16) & 0o777 for i in zf.infolist()}
+    assert names == sorted(names)
+    assert modes["spec-kit-claude-sh/.specify/scripts/bash/common.sh"] == 0o755
+    assert modes["spec-kit-claude-sh/memory/constitution.md"] == 0o644
+
+
+def test_extract_skips_unchanged_files_and_never_writes_manifest(staging, tmp_path):
+    archive = tmp_path / "t.zip"
+    manifest = write_deterministic_zip(staging, archive)
+    dest = tmp_path / "project"
+
+    with zipfile.ZipFile(archive) as zf:
+        first = extract_template(zf, dest)
+        (dest / "memory" / "constitution.md").write_text("# CONSTITUTION\n")  # same size, different content
+        second = extract_template(zf, dest)
+        files = read_template(zf)
+
+    assert not (dest / MANIFEST_PATH).exists()
+    assert MANIFEST_PATH not in files and MANIFEST_PATH not in first.hashes
+    assert first.created == 3
+    assert (second.unchanged, second.updated) == (2, 1)
+    assert second.hashes == {rel: entry["sha256"] for rel, entry in manifest["files"].items()}
+    assert os.stat(dest / ".specify" / "scripts" / "bash" / "common.sh").st_mode & 0o111
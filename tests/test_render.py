@@ -0,0 +1,59 @@
+import tomllib
+
+from specify_cli.render import load_command_templates, parse_command_template, render_agent_commands, render_command
+
+TEMPLATE = """---
+description: "Plan the \\"feature\\" for __AGENT__"
+scripts:
+  sh: scripts/bash/setup-plan.sh --json
+  ps: scripts/powershell/setup-plan.ps1 -Json
+---
+
+Run `{SCRIPT}` with {ARGS}.
+Keep C:\\temp\\new and "quotes" intact; $ARGUMENTS stays for Markdown.
+"""
+
+
+def test_parse_command_template_splits_scripts_from_front_matter():
+    template = parse_command_template(TEMPLATE, "plan")
+
+    assert template.description == 'Plan the \\"feature\\" for __AGENT__'
+    assert template.scripts == {"sh": "scripts/bash/setup-plan.sh --json", "ps": "scripts/powershell/setup-plan.ps1 -Json"}
+    assert "scripts" not in template.front_matter
+
+
+def test_render_markdown_keeps_backslashes_as_written():
+    text = render_command(parse_command_template(TEMPLATE, "plan"), "claude", "sh", "md")
+
+    assert text.startswith('---\ndescription: "Plan the \\"feature\\" for claude"\n---\n\n')
+    assert "Run `scripts/bash/setup-plan.sh --json` with $ARGUMENTS." in text
+    assert "C:\\temp\\new" in text
+
+
+def test_render_toml_round_trips_through_a_toml_parser():
+    text = render_command(parse_command_template(TEMPLATE, "plan"), "gemini", "ps", "toml")
+    data = tomllib.loads(text)
+
+    assert data["description"] == 'Plan the \\"feature\\" for gemini'
+    assert "Run `scripts/powershell/setup-plan.ps1 -Json` with {{args}}." in data["prompt"]
+    assert 'C:\\temp\\new and "quotes" intact; {{args}} stays' in data["prompt"]
+
+
+def test_load_command_templates_reuses_parse_until_file_changes(tmp_path):
+    path = tmp_path / "plan.md"
+    path.write_text(TEMPLATE, encoding="utf-8")
+
+    first = load_command_templates(tmp_path)
+    assert load_command_templates(tmp_path)[0] is first[0]
+
+    path.write_text(TEMPLATE.replace("Plan the", "Draft the"), encoding="utf-8")
+    assert load_command_templates(tmp_path)[0].description.startswith("Draft the")
+
+
+def test_render_agent_commands_writes_into_agent_layout(tmp_path):
+    templates = [parse_command_template(TEMPLATE, "plan")]
+
+    written = render_agent_commands(templates, "qwen", "sh", tmp_path)
+
+    assert written == [tmp_path / ".qwen" / "commands" / "plan.toml"]
+    assert tomllib.loads(written[0].read_text(encoding="utf-8"))["description"].endswith("for qwen")
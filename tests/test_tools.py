@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from specify_cli import tools
+from specify_cli.tools import PathIndex, discover_tools
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="uses POSIX executables")
+
+
+def make_tool(directory, name, version="1.0", executable=True):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_text(f"#!/bin/sh\necho '{name} {version}'\n")
+    path.chmod(0o755 if executable else 0o644)
+    return str(path)
+
+
+@pytest.fixture
+def path_env(tmp_path, monkeypatch):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    monkeypatch.setenv("PATH", os.pathsep.join([str(first), str(second)]))
+    monkeypatch.setenv("SPECIFY_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(tools, "SPECIAL_LOCATIONS", {})
+    tools.path_index.cache_clear()
+    yield first, second
+    tools.path_index.cache_clear()
+
+
+def test_path_index_follows_path_order_and_skips_non_executables(path_env):
+    first, second = path_env
+    make_tool(first, "git", executable=False)
+    git = make_tool(second, "git")
+    make_tool(first, "code")
+    shadowed = make_tool(second, "code")
+
+    index = PathIndex()
+
+    assert index.which("git") == git
+    assert index.which("code") == str(first / "code") != shadowed
+    assert index.which("missing") is None
+
+
+def test_discover_tools_caches_until_path_changes(path_env):
+    first, second = path_env
+    make_tool(first, "git", "2.40")
+
+    found, from_cache = discover_tools(["git", "claude"], versions=True)
+    assert not from_cache
+    assert found["git"].version == "git 2.40" and not found["claude"].found
+
+    found, from_cache = discover_tools(["git", "claude"], versions=True)
+    assert from_cache and found["git"].version == "git 2.40"
+
+    make_tool(second, "claude")  # changes the directory's mtime and so the PATH fingerprint
+    tools.path_index.cache_clear()
+    found, from_cache = discover_tools(["git", "claude"])
+    assert not from_cache
+    assert found["claude"].path == str(second / "claude")
@@ -0,0 +1,125 @@
+import os
+import stat
+
+from specify_cli.upgrade import (
+    NEW_SUFFIX,
+    InstallState,
+    apply_upgrade,
+    load_install_state,
+    merge3,
+    plan_upgrade,
+    save_install_state,
+    sha256_bytes,
+)
+
+
+def lines(text):
+    return text.splitlines(keepends=True)
+
+
+def test_merge3_takes_changes_from_both_sides():
+    base = lines("a\nb\nc\nd\ne\n")
+    local = lines("a\nB\nc\nd\ne\n")
+    new = lines("a\nb\nc\nd\nE\n")
+
+    merged, conflicts = merge3(base, local, new)
+
+    assert conflicts == 0
+    assert "".join(merged) == "a\nB\nc\nd\nE\n"
+
+
+def test_merge3_takes_identical_changes_once():
+    base = lines("a\nb\nc\n")
+    both = lines("a\nX\nc\n")
+
+    merged, conflicts = merge3(base, both, both)
+
+    assert conflicts == 0
+    assert merged == both
+
+
+def test_merge3_marks_overlapping_changes_as_conflicts():
+    base = lines("a\nb\nc\nd\ne\n")
+    local = lines("a\nlocal\nc\nd\nlocal end")
+    new = lines("a\nnew\nc\nd\nnew end\n")
+
+    merged, conflicts = merge3(base, local, new, local_label="mine", new_label="v1.1.0")
+
+    assert conflicts == 2
+    assert "".join(merged) == (
+        "a\n"
+        "<<<<<<< mine\nlocal\n=======\nnew\n>>>>>>> v1.1.0\n"
+        "c\nd\n"
+        "<<<<<<< mine\nlocal end\n=======\nnew end\n>>>>>>> v1.1.0\n"
+    )
+
+
+def install(project, files):
+    for rel, data in files.items():
+        (project / rel).parent.mkdir(parents=True, exist_ok=True)
+        (project / rel).write_bytes(data)
+    return InstallState(release="v1.0.0", ai=["claude"], script="sh", files={rel: sha256_bytes(d) for rel, d in files.items()})
+
+
+def test_plan_upgrade_classifies_every_file(tmp_path):
+    base = {
+        "same.md": b"same\n",
+        "pristine.md": b"old\n",
+        "edited.md": b"one\ntwo\nthree\n",
+        "clash.md": b"x\n",
+        "gone.md": b"gone\n",
+        "dropped.md": b"drop\n",
+    }
+    state = install(tmp_path, base)
+    (tmp_path / "edited.md").write_bytes(b"ONE\ntwo\nthree\n")
+    (tmp_path / "clash.md").write_bytes(b"local\n")
+    (tmp_path / "gone.md").unlink()
+    new_files = {
+        "same.md": b"same\n",
+        "pristine.md": b"new\n",
+        "edited.md": b"one\ntwo\nTHREE\n",
+        "clash.md": b"upstream\n",
+        "gone.md": b"gone v2\n",
+        "added.md": b"added\n",
+    }
+    loads = []
+
+    plan = plan_upgrade(tmp_path, state, new_files, lambda: loads.append(1) or base, new_label="v1.1.0")
+    actions = {c.path: c.action for c in plan.changes}
+
+    assert actions == {
+        "added.md": "add",
+        "clash.md": "conflict",
+        "edited.md": "merge",
+        "gone.md": "skip-deleted",
+        "pristine.md": "update",
+        "dropped.md": "remove",
+    }
+    assert plan.unchanged == 1 and loads == [1]
+
+    apply_upgrade(tmp_path, plan)
+    assert (tmp_path / "edited.md").read_bytes() == b"ONE\ntwo\nTHREE\n"
+    assert (tmp_path / "clash.md").read_bytes() == b"<<<<<<< local\nlocal\n=======\nupstream\n>>>>>>> v1.1.0\n"
+    assert not (tmp_path / "dropped.md").exists()
+    assert not (tmp_path / "gone.md").exists()
+
+
+def test_plan_upgrade_without_base_writes_new_file_beside_local(tmp_path):
+    state = install(tmp_path, {"t.md": b"old\n"})
+    (tmp_path / "t.md").write_bytes(b"mine\n")
+
+    plan = plan_upgrade(tmp_path, state, {"t.md": b"new\n"}, lambda: None)
+    apply_upgrade(tmp_path, plan)
+
+    assert [(c.action, c.target) for c in plan.changes] == [("conflict", "t.md" + NEW_SUFFIX)]
+    assert (tmp_path / "t.md").read_bytes() == b"mine\n"
+    assert (tmp_path / ("t.md" + NEW_SUFFIX)).read_bytes() == b"new\n"
+
+
+def test_install_state_round_trips_with_readable_mode(tmp_path):
+    state = InstallState(release="v1.0.0", ai=["claude"], script="sh", files={"b": "2", "a": "1"}, repo="github/spec-kit")
+
+    save_install_state(tmp_path, state)
+
+    assert load_install_state(tmp_path) == state
+    assert stat.S_IMODE(os.stat(tmp_path / ".specify" / "install-state.json").st_mode) == 0o644
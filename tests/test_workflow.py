@@ -0,0 +1,67 @@
+import shutil
+import subprocess
+
+import pytest
+
+from specify_cli.workflow import read_repo, resolve_repo, unit_status
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def make_git_dir(root, branch="main"):
+    git_dir = root / ".git"
+    (git_dir / "refs" / "heads").mkdir(parents=True)
+    (git_dir / "HEAD").write_text(f"ref: refs/heads/{branch}\n")
+    return git_dir
+
+
+def test_read_repo_prefers_enclosing_work_tree_over_nearer_specify(tmp_path):
+    make_git_dir(tmp_path, "002-unit-login")
+    sub = tmp_path / "services" / "api"
+    (sub / ".specify").mkdir(parents=True)
+
+    ctx = read_repo(sub)
+
+    assert ctx.root == tmp_path
+    assert ctx.has_git
+    assert ctx.branch == "002-unit-login"
+
+
+def test_read_repo_falls_back_to_nearest_specify_without_git(tmp_path):
+    sub = tmp_path / "project"
+    (sub / ".specify").mkdir(parents=True)
+    (sub / "src").mkdir()
+
+    ctx = read_repo(sub / "src")
+
+    assert ctx.root == sub
+    assert not ctx.has_git
+
+
+@requires_git
+def test_read_repo_agrees_with_resolve_repo_in_subproject(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    sub = tmp_path / "packages" / "web"
+    (sub / ".specify").mkdir(parents=True)
+
+    assert read_repo(sub).root == resolve_repo(sub).root == tmp_path.resolve()
+
+
+def test_unit_status_in_subproject_uses_the_work_tree(tmp_path):
+    git_dir = make_git_dir(tmp_path, "001-unit-login")
+    (git_dir / "refs" / "heads" / "001-unit-login").write_text("0" * 40 + "\n")
+    (git_dir / "packed-refs").write_text(f"{'1' * 40} refs/heads/003-unit-cache\n")
+    test_dir = tmp_path / "tests" / "001-unit-login"
+    test_dir.mkdir(parents=True)
+    (test_dir / "test-spec.md").write_text("# spec\n")
+    (test_dir / "test-plan.md").write_text("# plan\n")
+    sub = tmp_path / "sub"
+    (sub / ".specify").mkdir(parents=True)
+
+    status = unit_status(sub)
+
+    assert status.has_git and status.on_unit_branch
+    assert [u.name for u in status.units] == ["001-unit-login", "003-unit-cache"]
+    login, cache = status.units
+    assert login.current and login.stage == "plan" and not login.complete
+    assert cache.test_dir is None and cache.has_branch